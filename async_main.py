@@ -0,0 +1,86 @@
+# async_main.py - Asenkron sürüm için ana program
+import asyncio
+import argparse
+import logging
+from config import CONFIG
+from logger import Logger
+from async_scraper import AsyncPetlebiScraper
+from checkpoint import open_checkpoint
+from metrics import start_metrics, finish_metrics
+
+async def main_async():
+    # Argümanları işle
+    parser = argparse.ArgumentParser(description="Petlebi Asenkron Veri Kazıma Aracı")
+    parser.add_argument("--pages", type=int, default=CONFIG['scraping']['max_pages'], help="Sayfalamada taranacak en fazla sayfa (varsayılan: ilk boş sayfaya kadar)")
+    parser.add_argument("--discovery", choices=["auto", "sitemap", "pagination"], default=CONFIG['scraping']['discovery'], help="Ürün URL'lerinin bulunması (auto: sitemap, yoksa sayfalama)")
+    parser.add_argument("--sitemap-url", type=str, default=CONFIG['scraping']['sitemap_url'], help="Kök sitemap adresi")
+    parser.add_argument("--output", type=str, default=None, help="Çıktı dosyası (varsayılan petlebi_products_async.json; parquet için petlebi_products_async_parquet dizini)")
+    parser.add_argument("--format", choices=["json", "jsonl", "msgpack", "parquet"], default=CONFIG['output']['format'], help="Çıktı biçimi (jsonl: satır başına bir ürün, msgpack: ikili, parquet: --output dizinine bölümlenmiş veri kümesi)")
+    parser.add_argument("--serializer", choices=["auto", "json", "orjson"], default=CONFIG['output']['serializer'], help="JSON kodlayıcı/çözücü (auto: orjson kuruluysa orjson)")
+    parser.add_argument("--compression", choices=["auto", "none", "gzip", "zstd"], default=CONFIG['output']['compression'] or "auto", help="Çıktı sıkıştırması (auto: dosya uzantısından, .gz/.zst; parquet için CONFIG kodeki)")
+    parser.add_argument("--partition-by", choices=["category", "date", "none"], default=CONFIG['parquet']['partition_by'], help="Parquet veri kümesinin bölümlenmesi (date: kazıma günü)")
+    parser.add_argument("--resume", action="store_true", help="Yarım kalan taramaya kaldığı yerden devam et ve çıktıya ekle")
+    parser.add_argument("--checkpoint", type=str, default=None, help="Kaldığı yer kaydının dosyası (varsayılan: <output>.checkpoint)")
+    parser.add_argument("--concurrency", type=int, default=5, help="Eşzamanlı istek sayısı")
+    parser.add_argument("--parser", choices=["lxml", "soup"], default=CONFIG['scraping']['parser'], help="HTML ayrıştırıcı")
+    parser.add_argument("--parse-workers", type=int, default=None, help="HTML ayrıştırma havuzundaki işçi sayısı (varsayılan: çekirdek sayısı, 0: olay döngüsünde)")
+    parser.add_argument("--parse-executor", choices=["auto", "process", "thread"], default=CONFIG['scraping']['parse_executor'], help="Ayrıştırma havuzu türü")
+    parser.add_argument("--metrics-file", type=str, default=CONFIG['metrics']['file'], help="Aşama ölçümlerinin yazılacağı dosya (.json: JSON, diğerleri: Prometheus metni)")
+    parser.add_argument("--metrics-port", type=int, default=CONFIG['metrics']['port'], help="Çalışma boyunca ölçümlerin /metrics adresinde sunulacağı port")
+    parser.add_argument("--log-format", choices=["text", "json"], default="json" if CONFIG['logging']['json'] else "text", help="Log biçimi (json: satır başına bir JSON nesnesi)")
+    parser.add_argument("--debug", action="store_true", help="Debug modu")
+    args = parser.parse_args()
+    if args.output is None:
+        # Parquet çıktısı bir dizindir; .json adı taşımasın
+        args.output = "petlebi_products_async_parquet" if args.format == "parquet" else "petlebi_products_async.json"
+    
+    # Logger'ı başlat
+    logger = Logger(log_level=logging.DEBUG if args.debug else logging.INFO, json_format=args.log_format == "json")
+    logger.info(f"Asenkron veri çekme işlemi başlatılıyor: keşif {args.discovery}, en fazla {args.pages or 'sınırsız'} sayfa, "
+                f"{args.concurrency} eşzamanlı istek")
+    
+    try:
+        base_url = CONFIG['scraping']['base_url']
+        checkpoint_path = args.checkpoint or f"{args.output}.checkpoint"
+        checkpoint, resumed = open_checkpoint(checkpoint_path, base_url, args.resume)
+        if resumed:
+            logger.info(f"Kaldığı yerden devam ediliyor: {len(checkpoint.completed_pages)} sayfa, "
+                        f"{len(checkpoint.completed_urls)} ürün tamamlanmış")
+        elif args.resume:
+            logger.warning(f"Kaldığı yer kaydı bulunamadı ({checkpoint_path}), tarama baştan başlıyor")
+        
+        # Asenkron scraper'ı oluştur ve çalıştır
+        metrics = start_metrics(args.metrics_port, logger)
+        scraper = AsyncPetlebiScraper(
+            base_url=base_url,
+            max_pages=args.pages,
+            concurrency_limit=args.concurrency,
+            parser=args.parser,
+            parse_workers=args.parse_workers,
+            parse_executor=args.parse_executor,
+            keep_products=False,  # Ürünler kazındıkça dosyaya yazılır, bellekte tutulmaz
+            checkpoint=checkpoint,
+            discovery=args.discovery,
+            sitemap_url=args.sitemap_url,
+            metrics=metrics
+        )
+        
+        try:
+            options = {"serializer": args.serializer, "compression": args.compression}
+            if args.format == "parquet":
+                options["partition_by"] = args.partition_by
+            await scraper.run_and_save(args.output, args.format, append=resumed, **options)
+        finally:
+            finish_metrics(metrics, args.metrics_file, logger)
+        logger.info(f"Asenkron veri çekme işlemi tamamlandı, çıktı: {args.output}")
+        
+    except KeyboardInterrupt:
+        logger.warning("İşlem kullanıcı tarafından iptal edildi.")
+    except Exception as e:
+        logger.critical(f"Beklenmeyen hata: {e}")
+        if args.debug:
+            import traceback
+            logger.debug(traceback.format_exc())
+
+if __name__ == "__main__":
+    asyncio.run(main_async())
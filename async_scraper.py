@@ -1,68 +1,324 @@
 # async_scraper.py - Asenkron veri kazıma
 import asyncio
 import aiohttp
-from bs4 import BeautifulSoup
+import itertools
 import json
+import logging
+import os
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from config import CONFIG
+from logger import Logger
+from error_handler import ErrorHandler
+from rate_limiter import AdaptiveRateLimiter
+from retry import RetryPolicy
+from http_cache import HttpCache
+from extractors import get_extractor, parse_listing, parse_detail, parse_product_page
+from product_io import open_writer
+from discovery import aiter_sitemap_urls
+from dedup import SeenIndex
+from metrics import Metrics
+from product import Product
+from product_stats import StatisticsAggregator
+
+class LoopLagMonitor:
+    """Olay döngüsünün ne kadar geciktiğini ölçer
+    
+    Belirli aralıklarla uyuyan bir görev, uyanması gereken zamanla gerçekten
+    uyandığı zaman arasındaki farkı kaydeder. Döngüyü bloklayan her iş (ör.
+    senkron HTML ayrıştırma) bu farkı büyütür.
+    """
+    
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.samples = []
+        self._task = None
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - start - self.interval))
+    
+    def start(self):
+        """Ölçümü başlatır (çalışan bir olay döngüsü içinde çağrılmalı)"""
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        """Ölçümü durdurur"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    def get_stats(self):
+        """Gecikme özetini milisaniye cinsinden döndürür"""
+        if not self.samples:
+            return {"samples": 0}
+        ordered = sorted(self.samples)
+        return {
+            "samples": len(ordered),
+            "mean_ms": round(1000 * sum(ordered) / len(ordered), 2),
+            "p99_ms": round(1000 * ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))], 2),
+            "max_ms": round(1000 * ordered[-1], 2)
+        }
 
 class AsyncPetlebiScraper:
-    def __init__(self, base_url=None, max_pages=None, concurrency_limit=5):
+    def __init__(self, base_url=None, max_pages=None, concurrency_limit=5, rate_limiter=None, http_cache=None,
+                 previous_index=None, parser=None, parse_workers=None, parse_executor=None, keep_products=True,
+                 checkpoint=None, discovery=None, sitemap_url=None, metrics=None):
         self.base_url = base_url or CONFIG['scraping']['base_url']
-        self.max_pages = max_pages or CONFIG['scraping']['max_pages']
+        self.max_pages = max_pages or CONFIG['scraping']['max_pages']  # None: ilk boş sayfaya kadar
+        self.max_failed_pages = CONFIG['scraping']['max_failed_pages']
+        self.discovery = discovery or CONFIG['scraping']['discovery']  # "sitemap", "pagination" veya "auto"
+        self.sitemap_url = sitemap_url or CONFIG['scraping']['sitemap_url']
         self.concurrency_limit = concurrency_limit  # Aynı anda çalışacak istek sayısını sınırla
+        self.queue_size = CONFIG['scraping']['queue_size']  # Liste ve detay aşamaları arasındaki kuyruk kapasitesi
         self.products = []
+        self.keep_products = keep_products  # False ise ürünler yalnızca sink'lere yazılır
+        self.product_count = 0
+        # Her ürünün kazındığı anda yazıldığı hedefler (ör. JsonLinesWriter); ilki ürünler akarken
+        # güncellenen istatistiklerdir, get_statistics ürünleri yeniden taramaz
+        self.statistics = StatisticsAggregator()
+        self.sinks = [self.statistics]
+        self._sink_error = None  # Bir sink yazamazsa tarama durdurulur
         self.semaphore = None  # Asenkron işlemleri kontrol etmek için semaphore
+        self.logger = Logger()
+        self.metrics = metrics or Metrics()  # Aşama bazında süre, boyut ve hata ölçümleri
+        self.error_handler = ErrorHandler(self.logger)
+        # Sunucunun tepkisine göre hızı ayarlayan, sync scraper ile paylaşılabilen sınırlayıcı
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter(max_concurrency=concurrency_limit, logger=self.logger)
+        self.retry_policy = RetryPolicy(self.error_handler, logger=self.logger, metrics=self.metrics)
+        # Detay sayfaları için koşullu HTTP önbelleği (False ile kapatılır)
+        if http_cache is None and CONFIG['http_cache']['enabled']:
+            http_cache = HttpCache()
+        self.http_cache = http_cache or None
+        self.previous_index = previous_index  # Artımlı tarama için önceki çalışmanın indeksi
+        self.checkpoint = checkpoint  # Tamamlanan sayfa/URL kaydı (devam ederken bunlar atlanır)
+        # Tekrar eden ürünlerin detayı bir kez indirilir (tek olay döngüsü: kilit gerekmez)
+        self.seen = SeenIndex(thread_safe=False)
+        self.failed_detail_urls = []
+        self.extractor = get_extractor(parser)  # "lxml" (hızlı yol) veya "soup"
+        # HTML ayrıştırma olay döngüsünü bloklamasın diye havuzda yapılır (0 = döngü içinde)
+        self.parse_workers = parse_workers if parse_workers is not None else (os.cpu_count() or 1)
+        self.parse_executor_type = parse_executor or CONFIG['scraping']['parse_executor']
+        self._parse_executor = None
+        self.loop_monitor = LoopLagMonitor()
         
+    def add_sink(self, sink):
+        """Tamamlanan ürünlerin yazılacağı bir hedef ekler (write(product) metodu olmalı)"""
+        self.sinks.append(sink)
+    
+    async def _emit(self, product):
+        """Tamamlanan ürünü sink'lere yazar (write_async'i olan sink'ler döngüyü bloklamadan bekletir)"""
+        self.product_count += 1
+        if self.keep_products:
+            self.products.append(product)
+        if not self.sinks:
+            return
+        with self.metrics.timer("sink_write_seconds"):
+            for sink in self.sinks:
+                write_async = getattr(sink, 'write_async', None)
+                if write_async:
+                    await write_async(product)
+                else:
+                    sink.write(product)
+    
+    def _record_progress(self, page, url, success):
+        """Ürünün işlendiğini checkpoint'e bildirir, zamanı geldiyse kaydeder"""
+        self.checkpoint.item_done(page, url, success)
+        if self.checkpoint.save_due() and self._sink_error is None:
+            self._save_checkpoint()
+    
+    def _flush_sinks(self):
+        """Tamponlu sink'leri (ör. dosya yazıcıları) boşaltır"""
+        for sink in self.sinks:
+            flush = getattr(sink, 'flush', None)
+            if flush:
+                flush()
+    
+    def _save_checkpoint(self):
+        """Sink tamponlarını boşaltıp checkpoint'i yazar (kayıttaki her ürün dosyada da bulunur)"""
+        self._flush_sinks()
+        self.checkpoint.save()
+    
     async def fetch(self, session, url):
-        """URL'den veri almak için asenkron istek yapar"""
+        """URL'den veri almak için asenkron istek yapar; geçici hatalarda yeniden dener"""
+        result = await self.fetch_response(session, url)
+        if result and result[0] == 200:
+            return result[1]
+        return None
+    
+    async def fetch_response(self, session, url, headers=None, binary=False):
+        """İstek yapar ve (durum kodu, html, başlıklar) döndürür; başarısızlıkta None
+        
+        binary True ise gövde çözülmeden bytes olarak döndürülür (ör. gzip sitemap).
+        """
         try:
-            async with self.semaphore:  # İstek limitini kontrol et
-                print(f"İstek gönderiliyor: {url}")
-                async with session.get(url) as response:
+            return await self.retry_policy.run_async(
+                lambda: self._fetch_once(session, url, headers, binary), url,
+                retry_exceptions=(aiohttp.ClientError, asyncio.TimeoutError)
+            )
+        except Exception as e:
+            self.logger.rate_limited("request_error", f"İstek hatası: {e}", url=url)
+            return None
+    
+    async def _fetch_once(self, session, url, headers=None, binary=False):
+        """Tek bir istek gönderir ve (sonuç, hata türü, Retry-After) döndürür"""
+        async with self.semaphore:  # İstek limitini kontrol et
+            wait_start = time.perf_counter()
+            await self.rate_limiter.acquire_async()
+            self.metrics.observe("rate_limit_wait_seconds", time.perf_counter() - wait_start)
+            error_type = None
+            retry_after = None
+            try:
+                self.logger.debug("İstek gönderiliyor", url=url)
+                request_start = time.perf_counter()
+                async with session.get(url, headers=headers) as response:
+                    body = await response.read() if response.status == 200 else b""
+                    self.metrics.observe("http_request_seconds", time.perf_counter() - request_start)
+                    self.metrics.observe("response_bytes", len(body))
+                    self.metrics.inc("http_responses", status=response.status)
                     if response.status == 200:
-                        return await response.text()
+                        if binary:
+                            return (200, body, response.headers), None, None
+                        # Gövde okunduğu için text() yalnızca çözümleme yapar
+                        return (200, await response.text(), response.headers), None, None
+                    elif response.status == 304:
+                        return (304, "", response.headers), None, None
                     else:
-                        print(f"Hata: {url} için {response.status} kodu alındı")
-                        return None
-        except Exception as e:
-            print(f"İstek hatası {url}: {e}")
+                        error_type = self.error_handler.classify_request_error(response)
+                        retry_after = self.error_handler.get_retry_after(response)
+                        self.logger.rate_limited(f"http_{response.status}", f"Hata: {response.status} kodu alındı", url=url)
+                        return None, error_type, retry_after
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                error_type = "connection_error"
+                self.metrics.inc("http_responses", status="error")
+                raise
+            finally:
+                self.rate_limiter.release(error_type, retry_after)
+    
+    async def fetch_product_details(self, session, url):
+        """Detay sayfasını (önbellekte varsa koşullu olarak) indirir ve detay sözlüğünü döndürür
+        
+        Sunucu 304 döndürürse önbellekteki detaylar sayfa ayrıştırılmadan kullanılır.
+        """
+        headers = self.http_cache.conditional_headers(url) if self.http_cache else None
+        with self.metrics.timer("fetch_seconds", stage="detail"):
+            result = await self.fetch_response(session, url, headers)
+        
+        if result and result[0] == 304:
+            details = self.http_cache.get_details(url)
+            if details is not None:
+                return details
+            # Kayıt bu arada silindiyse sayfayı koşulsuz yeniden indir
+            with self.metrics.timer("fetch_seconds", stage="detail"):
+                result = await self.fetch_response(session, url)
+        
+        if not result or result[0] != 200:
+            return None
+        
+        details = await self.extract_product_details(result[1])
+        if details is not None and self.http_cache:
+            self.http_cache.store(url, result[2], result[1], details)
+        return details
+    
+    async def fetch_product_page(self, session, url):
+        """Liste verisi olmayan (sitemap'ten bulunan) ürünün tüm alanlarını detay sayfasından çıkarır
+        
+        Temel alanlar sayfadaki JSON-LD verisinden okunur. Sunucu 304 döndürürse
+        önbellekteki sayfa gövdesi yeniden ayrıştırılır. Başarısızlıkta None döndürür.
+        """
+        headers = self.http_cache.conditional_headers(url) if self.http_cache else None
+        with self.metrics.timer("fetch_seconds", stage="product_page"):
+            result = await self.fetch_response(session, url, headers)
+        
+        if result and result[0] == 304:
+            body = self.http_cache.get_body(url)
+            if body is not None:
+                result = (200, body, None)
+            else:
+                # Kayıt bu arada silindiyse sayfayı koşulsuz yeniden indir
+                with self.metrics.timer("fetch_seconds", stage="product_page"):
+                    result = await self.fetch_response(session, url)
+        
+        if not result or result[0] != 200:
             return None
+        
+        with self.metrics.timer("parse_seconds", stage="product_page"):
+            basic_data, details = await self._run_parser(parse_product_page, result[1])
+        if basic_data is None:
+            self.metrics.inc("validation_failures", stage="product_page")
+            self.logger.rate_limited("missing_jsonld", "Sayfada ürün verisi (JSON-LD) bulunamadı", url=url)
+            return None
+        if self.http_cache and result[2] is not None:
+            self.http_cache.store(url, result[2], result[1], details)
+        
+        product_data = Product(url=url, **basic_data)
+        product_data.update(details)
+        return product_data
+    
+    def _create_parse_executor(self):
+        """Ayrıştırma havuzunu oluşturur
+        
+        "process" BeautifulSoup gibi GIL'i tutan ayrıştırıcılar için tüm çekirdekleri
+        kullanır; "thread" ise ayrıştırma sırasında GIL'i bırakan lxml için yeterlidir
+        ve HTML'in süreçler arasında kopyalanmasını önler. "auto" ayrıştırıcıya göre seçer.
+        """
+        if self.parse_workers <= 0:
+            return None
+        executor_type = self.parse_executor_type
+        if executor_type == "auto":
+            executor_type = "thread" if self.extractor.name == "lxml" else "process"
+        if executor_type == "process":
+            return ProcessPoolExecutor(max_workers=self.parse_workers)
+        return ThreadPoolExecutor(max_workers=self.parse_workers, thread_name_prefix="ayristirici")
+    
+    async def _run_parser(self, func, html):
+        """Ayrıştırma fonksiyonunu havuzda (yoksa döngü içinde) çalıştırır"""
+        if self._parse_executor is None:
+            return func(html, self.extractor.name)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._parse_executor, func, html, self.extractor.name)
     
     async def parse_product_list(self, html, page_num):
         """Ürün listesi HTML'ini işler ve detay URL'lerini çıkarır"""
         if not html:
             return []
             
-        soup = BeautifulSoup(html, 'lxml')
-        products = soup.find_all('div', class_='col-lg-4 col-md-4 col-sm-6 search-product-box')
+        with self.metrics.timer("parse_seconds", stage="listing"):
+            cards = await self._run_parser(parse_listing, html)
         product_urls = []
         
-        print(f"Sayfa {page_num}: {len(products)} ürün bulundu")
+        self.logger.info(f"Sayfa {page_num}: {len(cards)} ürün bulundu")
         
-        for product in products:
+        for product_url, gtm_json in cards:
             try:
-                more_info = product.find('div', class_='card-body pb-0 pt-2 pl-3 pr-3')
-                if more_info and more_info.a:
-                    product_url = more_info.a['href']
-                    product_dictionary = json.loads(more_info.a['data-gtm-product'])
-                    
-                    # Temel ürün bilgilerini kaydet
-                    product_data = {
-                        "url": product_url,
-                        "name": product_dictionary["name"],
-                        "price": product_dictionary["price"],
-                        "stock": product_dictionary["dimension2"],
-                        "category": product_dictionary["category"].split('>')[-1],
-                        "id": product_dictionary["id"],
-                        "brand": product_dictionary["brand"],
-                        "sku": ""
-                    }
-                    
-                    # Detay URL'sini ürün verisiyle birlikte tut
-                    product_urls.append((product_url, product_data))
+                if product_url is None:
+                    raise KeyError('href')
+                product_dictionary = json.loads(gtm_json)
+                
+                # Temel ürün bilgilerini kaydet (fiyat float'a çevrilir)
+                product_data = Product(
+                    url=product_url,
+                    name=product_dictionary["name"],
+                    price=product_dictionary["price"],
+                    stock=product_dictionary["dimension2"],
+                    category=product_dictionary["category"].split('>')[-1],
+                    id=product_dictionary["id"],
+                    brand=product_dictionary["brand"],
+                    sku=""
+                )
+                
+                # Detay URL'sini ürün verisiyle birlikte tut
+                product_urls.append((product_url, product_data))
             except Exception as e:
-                print(f"Ürün veri çıkarma hatası: {e}")
+                self.metrics.inc("validation_failures", stage="listing")
+                self.logger.rate_limited("listing_card", f"Ürün veri çıkarma hatası: {e}", page=page_num)
         
         return product_urls
     
@@ -70,125 +326,279 @@ class AsyncPetlebiScraper:
         """Ürün detay sayfasından ek bilgileri çıkarır"""
         if not html:
             return basic_product_data
-            
-        try:
-            soup = BeautifulSoup(html, 'lxml')
-            
-            # Barkod ve açıklama
-            barcode = ""
-            description = ""
-            
-            info = soup.find_all('div', class_='tab-pane active show read-more-box', id="hakkinda")
-            for div in info:
-                barcode_divs = div.find_all('div', class_='row mb-2')
-                for barcode_div in barcode_divs:
-                    barcode_label = barcode_div.find('div', class_='col-2 pd-d-t')
-                    if barcode_label and barcode_label.string == "BARKOD":
-                        barcode_value = barcode_div.find('div', class_='col-10 pd-d-v')
-                        barcode = barcode_value.text.strip() if barcode_value else ""
-                
-                spans = div.find('span', id='productDescription')
-                if spans:
-                    for i, span in enumerate(spans):
-                        if i == 1:
-                            description = span.text.strip().replace('\n', ' ')
-            
-            # Resim URL'si
-            image = ""
-            info2 = soup.find('div', class_='col-md-6 col-sm-5')
-            if info2 and info2.a and 'href' in info2.a.attrs:
-                image = info2.a['href']
-            
+        
+        details = await self.extract_product_details(html)
+        if details is not None:
             # Temel ürün bilgilerine ek detayları ekle
-            basic_product_data.update({
-                "barcode": barcode,
-                "description": description,
-                "image": image
-            })
-            
-            return basic_product_data
+            basic_product_data.update(details)
+        return basic_product_data
+    
+    async def extract_product_details(self, html):
+        """Detay sayfası HTML'inden barkod, açıklama ve resmi çıkarır; hata olursa None döndürür"""
+        try:
+            with self.metrics.timer("parse_seconds", stage="detail"):
+                return await self._run_parser(parse_detail, html)
         except Exception as e:
-            print(f"Ürün detay işleme hatası: {e}")
-            return basic_product_data
+            self.logger.rate_limited("detail_parse", f"Ürün detay işleme hatası: {e}", level=logging.ERROR)
+            return None
             
-    async def process_page(self, session, page_num):
-        """Sayfayı işler ve ürün detaylarını alır"""
+    async def process_page(self, session, page_num, work_queue):
+        """Sayfanın ürün listesini çıkarır ve detay kuyruğuna aktarır
+        
+        Returns:
+            Sayfadaki ürün sayısı (0: katalogun sonu); sayfa alınamazsa None
+        """
+        
         if page_num == 1:
             url = self.base_url
         else:
             url = f"{self.base_url}?page={page_num}"
             
         # Sayfadaki ürün listesini al
-        page_html = await self.fetch(session, url)
+        with self.metrics.timer("fetch_seconds", stage="listing"):
+            page_html = await self.fetch(session, url)
         if not page_html:
-            return
+            return None
             
         # Sayfa içindeki ürünlerin detay URL'lerini çıkar
         product_urls = await self.parse_product_list(page_html, page_num)
+        found = len(product_urls)
+        if not found:
+            return 0
+        # Önceki sayfalarda görülen ürünler (liste kaydıysa) yeniden indirilmez
+        product_urls = [item for item in product_urls if self.seen.add(item[0], item[1].get('id'))]
+        if self.checkpoint:
+            # Yarım kalan sayfada yalnızca çıktıya yazılmamış ürünler işlenir
+            product_urls = [item for item in product_urls if not self.checkpoint.is_url_done(item[0])]
+            self.checkpoint.page_started(page_num, len(product_urls))
         
-        # Her ürün için detay sayfasını işle
-        product_detail_tasks = []
+        # Ürünleri detay işçilerine aktar (kuyruk doluysa bekler)
         for product_url, product_data in product_urls:
-            task = asyncio.create_task(self.process_product(session, product_url, product_data))
-            product_detail_tasks.append(task)
-            
-        # Tüm ürün detaylarının tamamlanmasını bekle
-        await asyncio.gather(*product_detail_tasks)
+            self.metrics.observe("queue_depth", work_queue.qsize(), queue="detail")
+            await work_queue.put((product_url, product_data, page_num))
+        return found
     
-    async def process_product(self, session, url, basic_product_data):
-        """Ürün detay bilgilerini alır ve kaydeder"""
+    async def discover_from_sitemap(self, session, work_queue):
+        """Sitemap'teki ürün URL'lerini detay kuyruğuna aktarır
+        
+        Returns:
+            Bulunan ürün sayısı; sitemap alınamadıysa ya da ürün içermiyorsa None
+        """
+        found = 0
+        skipped = 0
         try:
-            # Ürün detay sayfasını al
-            detail_html = await self.fetch(session, url)
+            async def fetch_sitemap(url):
+                with self.metrics.timer("fetch_seconds", stage="sitemap"):
+                    result = await self.fetch_response(session, url, binary=True)
+                if not result or result[0] != 200:
+                    raise ValueError(f"sitemap alınamadı: {url}")
+                return result[1]
             
-            # Detay bilgilerini çıkar ve ürün verilerine ekle
-            complete_product = await self.parse_product_detail(detail_html, basic_product_data)
+            async for product_url in aiter_sitemap_urls(fetch_sitemap, self.sitemap_url, self.logger):
+                if self._sink_error is not None:
+                    break
+                found += 1
+                if not self.seen.add(product_url):
+                    continue
+                if self.checkpoint and self.checkpoint.is_url_done(product_url):
+                    skipped += 1
+                    continue
+                # Liste verisi yoktur; temel alanlar detay sayfasından çıkarılır
+                self.metrics.observe("queue_depth", work_queue.qsize(), queue="detail")
+                await work_queue.put((product_url, None, None))
+        except Exception as e:
+            if not found:
+                self.logger.warning(f"Sitemap alınamadı ({self.sitemap_url}): {e}")
+                return None
+            self.logger.error(f"Sitemap okunurken hata, {found} üründen sonra duruldu: {e}")
+        
+        if not found:
+            self.logger.warning(f"Sitemap'te ürün bulunamadı: {self.sitemap_url}")
+            return None
+        self.logger.info(f"Sitemap'ten {found} ürün bulundu" + (f", {skipped} ürün önceki çalışmada tamamlanmış" if skipped else ""))
+        return found
+    
+    async def discover_from_pages(self, session, work_queue):
+        """Liste sayfalarını sırayla kuyruğa aktarır; ilk boş sayfada ya da max_pages'te durur"""
+        pages = range(1, self.max_pages + 1) if self.max_pages else itertools.count(1)
+        failed_in_row = 0
+        for page in pages:
+            if self._sink_error is not None:
+                break
+            # Önceki çalışmada tamamlanan sayfalar atlanır
+            if self.checkpoint and self.checkpoint.is_page_done(page):
+                self._last_page = page
+                continue
+            
+            found = await self.process_page(session, page, work_queue)
+            if found == 0:
+                self.logger.info(f"Sayfa {page} boş, katalogun sonuna ulaşıldı")
+                break
+            self._last_page = page
+            if found is None:
+                failed_in_row += 1
+                if failed_in_row >= self.max_failed_pages:
+                    self.logger.error(f"Art arda {failed_in_row} sayfa alınamadı, sayfalama durduruluyor")
+                    break
+                continue
+            failed_in_row = 0
             
-            # Ürünü listeye ekle
-            self.products.append(complete_product)
-            print(f"Ürün eklendi: {complete_product['name']}")
+            # İstek hızı sabit beklemeler yerine rate_limiter tarafından ayarlanır
+            if page % 10 == 0:
+                self.logger.info(f"İlk {page} sayfanın ürünleri kuyruğa aktarıldı")
+    
+    async def detail_worker(self, session, work_queue):
+        """Kuyruktaki ürünlerin detay sayfalarını sürekli işler"""
+        while True:
+            item = await work_queue.get()
+            try:
+                if item is None:
+                    break
+                product_url, product_data, page_num = item
+                await self.process_product(session, product_url, product_data, page_num)
+            finally:
+                work_queue.task_done()
+    
+    async def process_product(self, session, url, basic_product_data, page_num=None):
+        """Ürün detay bilgilerini alır ve kaydeder
+        
+        basic_product_data None ise (sitemap'ten bulunan ürün) tüm alanlar detay sayfasından alınır.
+        """
+        success = False
+        try:
+            if basic_product_data is None:
+                # Sitemap'ten bulunan ürün: tüm alanlar detay sayfasından alınır
+                complete_product = await self.fetch_product_page(session, url)
+                if complete_product is None:
+                    self.failed_detail_urls.append(url)
+                    raise ValueError("ürün sayfası alınamadı")
+            else:
+                # Artımlı taramada değişmeyen ürünlerin önceki detaylarını kullan
+                details = self.previous_index.lookup(basic_product_data) if self.previous_index else None
+                if details is None:
+                    # Ürün detaylarını al (önbellek isabetinde sayfa ayrıştırılmaz)
+                    details = await self.fetch_product_details(session, url)
+                if details is None:
+                    # Detaysız ürün yazılmaz; checkpoint'te tamamlanmış sayılmadığından --resume yeniden dener
+                    self.failed_detail_urls.append(url)
+                    raise ValueError("ürün detayları alınamadı")
+                
+                # Detay bilgilerini ürün verilerine ekle
+                complete_product = basic_product_data
+                complete_product.update(details)
         except Exception as e:
-            print(f"Ürün işleme hatası {url}: {e}")
+            self.logger.rate_limited("product_error", f"Ürün işleme hatası: {e}", level=logging.ERROR, url=url)
+        else:
+            # Ürünü listeye ve sink'lere ekle
+            try:
+                await self._emit(complete_product)
+                success = True
+                self.logger.sampled("product_added", f"Ürün eklendi: {complete_product.name}")
+            except Exception as e:
+                self.logger.error(f"Ürün kaydedilemedi, tarama durduruluyor: {e}")
+                self._sink_error = e
+        finally:
+            if self.checkpoint:
+                self._record_progress(page_num, url, success)
     
     async def scrape_all(self):
-        """Tüm sayfaları asenkron olarak tarar"""
+        """Ürün URL'lerini bulup detaylarını liste/detay hattı (pipeline) üzerinden asenkron olarak tarar
+        
+        Keşif aşaması ürünleri sınırlı bir kuyruğa yazar; detay işçileri kuyruğu
+        sürekli boşaltır. Sitemap varsa URL'ler akış halinde okunur ve işçilerin
+        hepsi hemen çalışır; yoksa liste sayfaları sırayla işlenir ve ilk boş
+        sayfada durulur. Sayfa grupları arasında bariyer olmadığı için yavaş bir
+        sayfa sonraki sayfaları bekletmez.
+        """
         start_time = time.time()
+        self._last_page = 0
         self.semaphore = asyncio.Semaphore(self.concurrency_limit)
+        work_queue = asyncio.Queue(maxsize=self.queue_size)
+        self._parse_executor = self._create_parse_executor()
+        self.loop_monitor.start()
         
-        async with aiohttp.ClientSession() as session:
-            # Tüm sayfaları işlemek için görevler oluştur
-            page_tasks = []
-            for page in range(1, self.max_pages + 1):
-                task = asyncio.create_task(self.process_page(session, page))
-                page_tasks.append(task)
+        try:
+            async with aiohttp.ClientSession() as session:
+                # Detay işçilerini başlat
+                workers = [
+                    asyncio.create_task(self.detail_worker(session, work_queue))
+                    for _ in range(self.concurrency_limit)
+                ]
                 
-                # Her 10 sayfa için bir bekletme (opsiyonel)
-                if page % 10 == 0:
-                    print(f"İlk {page} sayfa için görevler oluşturuldu. Bekleniyor...")
-                    await asyncio.gather(*page_tasks)
-                    page_tasks = []  # Görev listesini temizle
-                    await asyncio.sleep(1)  # Rate limiting
-            
-            # Kalan görevleri tamamla
-            if page_tasks:
-                await asyncio.gather(*page_tasks)
+                try:
+                    # Keşif aşaması: önce sitemap, yoksa liste sayfaları
+                    discovered = None
+                    if self.discovery in ("auto", "sitemap"):
+                        discovered = await self.discover_from_sitemap(session, work_queue)
+                    if discovered is None and self.discovery in ("auto", "pagination"):
+                        await self.discover_from_pages(session, work_queue)
+                except BaseException:
+                    # İptal ya da hata: kaldığı yeri kaydet
+                    if self.checkpoint and self._sink_error is None:
+                        self._save_checkpoint()
+                        self.logger.info(f"Kaldığı yer kaydedildi: {self.checkpoint.path} (--resume ile devam edilebilir)")
+                    raise
+                finally:
+                    # İşçilere bitiş sinyali gönder ve kalan işleri tamamla
+                    for _ in workers:
+                        await work_queue.put(None)
+                    await asyncio.gather(*workers, return_exceptions=True)
+        finally:
+            # Hata ya da iptalde de izleme görevi ve ayrıştırma havuzu kapatılır
+            await self.loop_monitor.stop()
+            if self._parse_executor is not None:
+                self._parse_executor.shutdown(wait=True)
+                self._parse_executor = None
+        
+        if self.checkpoint and self._sink_error is None:
+            self._flush_sinks()
+            missing = self.checkpoint.finish(self._last_page)
+            if missing:
+                self.logger.warning(f"{len(missing)} sayfa tamamlanamadı, --resume ile yeniden denenebilir: {missing[:10]}")
+            if self.checkpoint.failed_urls:
+                self.logger.warning(f"{len(self.checkpoint.failed_urls)} ürün alınamadı, --resume ile yeniden denenebilir")
         
         end_time = time.time()
-        print(f"Toplam süre: {end_time - start_time:.2f} saniye")
-        print(f"Toplanan ürün sayısı: {len(self.products)}")
+        self.logger.info(f"Toplam süre: {end_time - start_time:.2f} saniye")
+        self.logger.info(f"Toplanan ürün sayısı: {self.product_count}")
+        self.logger.info(f"Hız sınırlayıcı son durumu: {self.rate_limiter.get_state()}")
+        self.logger.info(f"Olay döngüsü gecikmesi: {self.loop_monitor.get_stats()}")
+        self.logger.info(f"Yeniden denemeler: {self.retry_policy.get_stats()}")
+        if self.http_cache:
+            self.logger.info(f"HTTP önbelleği: {self.http_cache.get_stats()}")
+        if self.previous_index:
+            self.logger.info(f"Artımlı tarama: {self.previous_index.get_stats()}")
+        if self.seen.duplicates:
+            self.logger.info(f"Tekrar eden ürünler atlandı, önlenen detay isteği: {self.seen.duplicates}")
+        if self.failed_detail_urls:
+            self.logger.warning(f"Detayları alınamayan ürün sayısı: {len(self.failed_detail_urls)}")
+        if CONFIG['metrics']['summary']:
+            self.logger.info(f"Aşama ölçümleri:\n{self.metrics.summary_table()}")
         return self.products
     
-    async def run_and_save(self, filename):
-        """Scraper'ı çalıştırır ve sonuçları kaydeder"""
-        products = await self.scrape_all()
+    async def run_and_save(self, filename, output_format=None, append=False, **writer_options):
+        """Scraper'ı çalıştırır; ürünler kazındıkça dosyaya yazılır (append: devam ederken sona ekle)
+        
+        writer_options (serializer, compression; parquet için partition_by) open_writer'a iletilir.
+        """
         try:
-            with open(filename, "w", encoding="utf-8") as json_file:
-                json.dump(products, json_file, ensure_ascii=False, indent=2)
-            print(f"{len(products)} ürün {filename} dosyasına kaydedildi")
-            return True
+            writer = open_writer(filename, output_format, append=append, **writer_options)
         except Exception as e:
-            print(f"JSON kaydetme hatası: {e}")
+            self.logger.error(f"JSON kaydetme hatası: {e}")
             return False
+        
+        self.add_sink(writer)
+        try:
+            await self.scrape_all()
+        finally:
+            self.sinks.remove(writer)
+            writer.close()
+        self.logger.info(f"{writer.count} ürün {filename} dosyasına kaydedildi")
+        return True
+
+    def get_statistics(self):
+        """Toplanan veri hakkında istatistikler sağlar (sink'ten güncellenen özetin anlık kopyası)"""
+        return self.statistics.snapshot(include_price_summary=False)
 
 # Kullanım örneği
 async def main():
@@ -0,0 +1 @@
+# benchmarks - Scraper, ayrıştırıcı ve içe aktarma performans ölçümleri
@@ -0,0 +1,81 @@
+# benchmarks/bench_formats.py - Çıktı biçimi / kodlayıcı / sıkıştırma kombinasyonlarının ölçümü
+"""Ürünleri her biçim, kodlayıcı ve sıkıştırma kombinasyonuyla yazıp geri okur
+
+Sentetik ürünler Product kaydına çevrilir, open_writer ile geçici bir dosyaya
+yazılır ve iter_products ile okunur. Ürün başına yazma/okuma süresi
+(mikrosaniye) ve ürün başına dosya boyutu raporlanır. Kurulu olmayan
+opsiyonel paketlere (orjson, msgpack, zstandard) bağlı kombinasyonlar atlanır.
+
+Kullanım (repo kökünden):
+    python -m benchmarks.bench_formats --products 50000 --output results/formats.json
+"""
+import argparse
+import os
+import tempfile
+from benchmarks.bench_import import make_products
+from benchmarks.bench_parsers import measure
+from benchmarks.common import write_results, compare_results
+from product import Product
+from product_io import SERIALIZERS, COMPRESSIONS, open_writer, iter_products, zstandard
+
+# (biçim, kodlayıcı) çiftleri; msgpack biçimi her zaman msgpack kodlayıcısını kullanır
+COMBINATIONS = (("json", "json"), ("json", "orjson"), ("jsonl", "json"), ("jsonl", "orjson"), ("msgpack", "msgpack"))
+
+# Dosya adı uzantısı (yalnızca okunabilirlik için; sıkıştırma açıkça verilir)
+SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+def available(serializer, compression):
+    """Kombinasyonun gerektirdiği opsiyonel paketler kurulu mu"""
+    if not SERIALIZERS[serializer][1]():
+        return False
+    return compression != "zstd" or zstandard is not None
+
+def main():
+    parser = argparse.ArgumentParser(description="Çıktı biçimi / kodlayıcı / sıkıştırma ölçümü")
+    parser.add_argument("--products", type=int, default=50000, help="Sentetik ürün sayısı")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Her ölçümün en kısa süresi (saniye)")
+    parser.add_argument("--repeat", type=int, default=3, help="Ölçüm tekrarı (en iyisi raporlanır)")
+    parser.add_argument("--output", type=str, default="benchmark_formats.json", help="Sonuç JSON dosyası")
+    parser.add_argument("--compare", type=str, default=None, help="Karşılaştırılacak önceki sonuç dosyası")
+    args = parser.parse_args()
+
+    products = [Product.from_dict(product) for product in make_products(args.products)]
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for output_format, serializer in COMBINATIONS:
+            for compression in COMPRESSIONS:
+                name = f"{output_format}/{serializer}/{compression}"
+                if not available(serializer, compression):
+                    print(f"{name:<24} atlandı (paket kurulu değil)")
+                    continue
+                filename = os.path.join(directory, f"products.{output_format}{SUFFIXES[compression]}")
+
+                def write():
+                    with open_writer(filename, output_format, serializer=serializer, compression=compression) as writer:
+                        for product in products:
+                            writer.write(product)
+
+                def read():
+                    for _ in iter_products(filename, serializer=serializer):
+                        pass
+
+                write_seconds = measure(write, args.min_time, args.repeat)
+                read_seconds = measure(read, args.min_time, args.repeat)
+                result = {
+                    "name": name,
+                    "products": args.products,
+                    "write_us_per_product": round(write_seconds * 1e6 / args.products, 2),
+                    "read_us_per_product": round(read_seconds * 1e6 / args.products, 2),
+                    "bytes_per_product": round(os.path.getsize(filename) / args.products, 1)
+                }
+                results.append(result)
+                print(f"{name:<24} yazma {result['write_us_per_product']:>6.2f} µs/ürün  "
+                      f"okuma {result['read_us_per_product']:>6.2f} µs/ürün  {result['bytes_per_product']:>7.1f} bayt/ürün")
+
+    settings = {key: getattr(args, key) for key in ("products", "min_time", "repeat")}
+    report = write_results(args.output, "formats", settings, results)
+    if args.compare:
+        compare_results(args.compare, report)
+
+if __name__ == "__main__":
+    main()
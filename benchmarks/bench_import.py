@@ -0,0 +1,188 @@
+# benchmarks/bench_import.py - Database.import_products ölçümü (SQLite ikamesi veya yerel MySQL)
+"""Toplu içe aktarmayı sentetik ürünlerle ölçer
+
+Varsayılan olarak MySQL sunucusu gerektirmeyen SQLite ikamesi kullanılır:
+Database'in gruplama, içerik özeti ve upsert mantığı aynen çalışır, yalnızca
+MySQL'e özgü sorgular SQLite karşılıklarıyla değiştirilir. --mysql ile
+ölçüm, ayrı bir veritabanında (varsayılan petlebi_bench) gerçek sunucuya
+karşı yapılır.
+
+Kullanım (repo kökünden):
+    python -m benchmarks.bench_import --products 20000 --output results/import.json
+    python -m benchmarks.bench_import --mysql --user root --password secret --import-workers 4
+"""
+import argparse
+import contextlib
+import io
+import os
+import sqlite3
+import tempfile
+import time
+from benchmarks.common import cpu_seconds, peak_rss_mb, write_results, compare_results
+from config import CONFIG
+from database import PRODUCT_COLUMNS, Database, DatabaseManager
+from product_io import open_writer
+
+# MySQL ölçümünde oluşturulan tablo (README'deki şema)
+MYSQL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS petlebi (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    product_url VARCHAR(255), name VARCHAR(255), barcode VARCHAR(255), price DECIMAL(10,2),
+    stock VARCHAR(255), image VARCHAR(255), description TEXT, sku VARCHAR(255),
+    category VARCHAR(255), brand VARCHAR(255)
+)
+"""
+
+class SqliteDatabase(Database):
+    """MySQL yerine SQLite'a yazan Database ikamesi (yalnızca ölçüm için)"""
+
+    INSERT_PRODUCT_QUERY = Database.INSERT_PRODUCT_QUERY.replace("%s", "?")
+
+    UPSERT_PRODUCT_QUERY = f"""
+    INSERT INTO petlebi ({', '.join(PRODUCT_COLUMNS)}, content_hash)
+    VALUES ({', '.join(['?'] * (len(PRODUCT_COLUMNS) + 1))})
+    ON CONFLICT(product_url) DO UPDATE SET {', '.join(f'{column} = excluded.{column}' for column in PRODUCT_COLUMNS[1:])},
+        content_hash = excluded.content_hash
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS petlebi (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        product_url VARCHAR(255) UNIQUE, name VARCHAR(255), barcode VARCHAR(255), price DECIMAL(10,2),
+        stock VARCHAR(255), image VARCHAR(255), description TEXT, sku VARCHAR(255),
+        category VARCHAR(255), brand VARCHAR(255), content_hash CHAR(32)
+    )
+    """
+
+    def connect(self, path=":memory:"):
+        """SQLite veritabanını açar ve petlebi tablosunu oluşturur"""
+        self.connection = sqlite3.connect(path)
+        self.cursor = self.connection.cursor()
+        self.cursor.execute(self.SCHEMA)
+        return True
+
+    def ensure_upsert_schema(self):
+        # content_hash ve product_url benzersiz anahtarı SCHEMA'da tanımlıdır
+        return True
+
+    def truncate(self):
+        self.cursor.execute("DELETE FROM petlebi")
+        self.connection.commit()
+
+def make_products(count, changed_every=0):
+    """Belirlenimci sentetik ürünler üretir (changed_every > 0 ise her N. ürünün fiyatı farklıdır)"""
+    for index in range(count):
+        price = 50 + index % 950
+        if changed_every and index % changed_every == 0:
+            price += 1
+        yield {
+            "url": f"https://www.petlebi.com/kedi-mamasi/test-mama-{index}.html",
+            "name": f"Test Mama {index} Tavuklu 2 kg",
+            "price": f"{price}.90",
+            "stock": "Stokta" if index % 7 else "Tükendi",
+            "category": "Kedi Maması",
+            "id": str(index),
+            "brand": ("Royal Canin", "Pro Plan", "Hills", "Acana")[index % 4],
+            "sku": "",
+            "barcode": f"869{index:010d}",
+            "description": f"Yetişkin kediler için tam ve dengeli bir mama. Ürün {index}, hassas sindirim sistemine uygundur.",
+            "image": f"https://cdn.petlebi.com/img/{index}.jpg"
+        }
+
+def open_mysql(args):
+    """Ölçüm veritabanını hazırlayıp DatabaseManager döndürür"""
+    database = DatabaseManager(pool_size=max(args.import_workers, 1) + 1)
+    if not database.connect(host=args.host, port=args.port, user=args.user, password=args.password):
+        raise SystemExit("MySQL bağlantısı kurulamadı")
+    if not database.create_database(args.db_name):
+        raise SystemExit(f"Veritabanı oluşturulamadı: {args.db_name}")
+    database.cursor.execute(MYSQL_SCHEMA)
+    database.truncate = lambda: (database.cursor.execute("TRUNCATE TABLE petlebi"), database.connection.commit())
+    return database
+
+def run_case(name, database, products, rows, **options):
+    """Tek bir içe aktarma senaryosunu ölçer (Database'in ilerleme çıktısı gizlenir)"""
+    cpu_start = cpu_seconds()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        succeeded = products(database, **options)
+    elapsed = time.perf_counter() - start
+    return {
+        "name": name,
+        "rows": rows,
+        "succeeded": bool(succeeded),
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(rows / max(elapsed, 1e-9), 1),
+        "cpu_seconds": round(cpu_seconds() - cpu_start, 3),
+        "peak_rss_mb": peak_rss_mb()
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Database.import_products ölçümü")
+    parser.add_argument("--products", type=int, default=20000, help="Sentetik ürün sayısı")
+    parser.add_argument("--batch-size", type=int, default=CONFIG['database']['batch_size'], help="Grup başına satır sayısı")
+    parser.add_argument("--changed-every", type=int, default=10, help="Değişen ürün senaryosunda her N. ürünün fiyatı değişir")
+    parser.add_argument("--sqlite-path", type=str, default=":memory:", help="SQLite dosyası (varsayılan: bellekte)")
+    parser.add_argument("--mysql", action="store_true", help="SQLite yerine gerçek MySQL sunucusuna karşı ölç")
+    parser.add_argument("--import-workers", type=int, default=1, help="MySQL'de paralel yazıcı bağlantısı sayısı")
+    parser.add_argument("--db-name", type=str, default="petlebi_bench", help="MySQL ölçüm veritabanı (tablosu boşaltılır)")
+    parser.add_argument("--host", type=str, default=CONFIG['database']['host'], help="MySQL sunucusu")
+    parser.add_argument("--port", type=str, default=CONFIG['database']['port'], help="MySQL portu")
+    parser.add_argument("--user", type=str, default=CONFIG['database']['user'], help="MySQL kullanıcısı")
+    parser.add_argument("--password", type=str, default=CONFIG['database']['password'], help="MySQL şifresi")
+    parser.add_argument("--output", type=str, default="benchmark_import.json", help="Sonuç JSON dosyası")
+    parser.add_argument("--compare", type=str, default=None, help="Karşılaştırılacak önceki sonuç dosyası")
+    args = parser.parse_args()
+
+    if args.mysql:
+        database = open_mysql(args)
+        import_options = {"workers": args.import_workers}
+    else:
+        database = SqliteDatabase()
+        database.connect(args.sqlite_path)
+        import_options = {}
+    count = args.products
+
+    def import_generated(changed_every=0, upsert=True):
+        return lambda db, **options: db.import_products(
+            make_products(count, changed_every), batch_size=args.batch_size, upsert=upsert, **options)
+
+    # Senaryolar sırayla çalışır: upsert senaryoları bir öncekinin bıraktığı tabloyu kullanır
+    results = []
+    database.truncate()
+    results.append(run_case("insert", database, import_generated(upsert=False), count, **import_options))
+    database.truncate()
+    results.append(run_case("upsert-new", database, import_generated(), count, **import_options))
+    results.append(run_case("upsert-unchanged", database, import_generated(), count, **import_options))
+    results.append(run_case("upsert-changed", database, import_generated(args.changed_every), count, **import_options))
+
+    # JSON Lines dosyasından akış halinde okuma + yazma
+    fd, jsonl_path = tempfile.mkstemp(suffix=".jsonl")
+    os.close(fd)
+    try:
+        with open_writer(jsonl_path, "jsonl") as writer:
+            for product in make_products(count):
+                writer.write(product)
+        database.truncate()
+        results.append(run_case(
+            "upsert-from-jsonl", database,
+            lambda db, **options: db.import_products_from_json(jsonl_path, batch_size=args.batch_size, **options),
+            count, **import_options
+        ))
+    finally:
+        os.remove(jsonl_path)
+
+    for result in results:
+        print(f"{result['name']:<20} {result['rows']:>8} satır  {result['seconds']:>8.2f} sn  "
+              f"{result['rows_per_second']:>10.1f} satır/sn  CPU {result['cpu_seconds']:.2f} sn"
+              + ("" if result["succeeded"] else "  (BAŞARISIZ)"))
+    database.commit_and_close()
+
+    settings = {key: getattr(args, key) for key in ("products", "batch_size", "changed_every", "mysql", "import_workers")}
+    settings["backend"] = "mysql" if args.mysql else "sqlite"
+    report = write_results(args.output, "import", settings, results)
+    if args.compare:
+        compare_results(args.compare, report)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# benchmarks/bench_parsers.py - HTML ayrıştırıcılarının mikro ölçümü
+"""Liste ve detay sayfası ayrıştırıcılarını fikstür HTML'i üzerinde ölçer
+
+Her (ayrıştırıcı, sayfa türü) çifti için çağrı başına süre ve saniyedeki
+çağrı sayısı raporlanır. Ölçüm timeit ile en az --min-time saniye sürecek
+kadar tekrarlanır; --repeat ölçümün en iyisi alınır (gürültüye en az
+maruz kalan değer).
+
+Kullanım (repo kökünden):
+    python -m benchmarks.bench_parsers --output results/parsers.json
+"""
+import argparse
+import timeit
+from benchmarks.common import write_results, compare_results
+from benchmarks.mock_server import MockPetlebiServer
+from extractors import EXTRACTORS, get_extractor
+
+def measure(func, min_time, repeat):
+    """func'ı en az min_time saniye sürecek sayıda çağırıp en iyi çağrı başına süreyi döndürür"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML ayrıştırıcılarını fikstürler üzerinde ölçer")
+    parser.add_argument("--parsers", nargs="+", choices=sorted(EXTRACTORS), default=sorted(EXTRACTORS), help="Ölçülecek ayrıştırıcılar")
+    parser.add_argument("--per-page", type=int, default=24, help="Liste sayfasındaki ürün kartı sayısı")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Her ölçümün en kısa süresi (saniye)")
+    parser.add_argument("--repeat", type=int, default=5, help="Ölçüm tekrarı (en iyisi raporlanır)")
+    parser.add_argument("--output", type=str, default="benchmark_parsers.json", help="Sonuç JSON dosyası")
+    parser.add_argument("--compare", type=str, default=None, help="Karşılaştırılacak önceki sonuç dosyası")
+    args = parser.parse_args()
+
+    # Sunucu başlatılmadan yalnızca sayfa üreticisi kullanılır
+    pages = MockPetlebiServer(pages=1, per_page=args.per_page)
+    listing_html = pages.listing_page(1)
+    detail_html = pages.detail_page(1000)
+
+    results = []
+    for name in args.parsers:
+        extractor = get_extractor(name)
+        cases = (
+            ("listing", lambda: extractor.parse_listing(listing_html), len(listing_html)),
+            ("detail", lambda: extractor.parse_detail(detail_html), len(detail_html)),
+            ("product_page", lambda: extractor.parse_product_page(detail_html), len(detail_html))
+        )
+        for page_type, func, size in cases:
+            seconds = measure(func, args.min_time, args.repeat)
+            result = {
+                "name": f"{name}-{page_type}",
+                "parser": name,
+                "page": page_type,
+                "html_bytes": size,
+                "us_per_call": round(seconds * 1e6, 1),
+                "calls_per_second": round(1 / seconds, 1)
+            }
+            results.append(result)
+            print(f"{result['name']:<20} {result['us_per_call']:>10.1f} µs/çağrı  {result['calls_per_second']:>10.1f} çağrı/sn")
+
+    settings = {key: getattr(args, key) for key in ("per_page", "min_time", "repeat")}
+    report = write_results(args.output, "parsers", settings, results)
+    if args.compare:
+        compare_results(args.compare, report)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# benchmarks/bench_records.py - Ürün sözlüğü ile Product kaydının bellek ve kodlama ölçümü
+"""Ürünlerin bellekte tutulma maliyetini ve JSON'a yazılma süresini ölçer
+
+Sentetik ürünler önce JSON satırlarına çevrilir ve her temsil bu satırlardan
+yeniden oluşturulur; böylece kazıma sırasında olduğu gibi her ürünün
+metinleri ayrı nesnelerdir. Bellek tracemalloc ile (ürün başına ayrılan
+bayt), kodlama süresi JSON Lines ve indent=2 dizi biçimleri için ürün
+başına mikrosaniye olarak raporlanır.
+
+Kullanım (repo kökünden):
+    python -m benchmarks.bench_records --products 50000 --output results/records.json
+"""
+import argparse
+import json
+import tracemalloc
+from benchmarks.bench_import import make_products
+from benchmarks.bench_parsers import measure
+from benchmarks.common import write_results, compare_results
+from product import Product
+from product_io import _encode
+
+# Her temsilin JSON satırından nasıl oluşturulduğu
+REPRESENTATIONS = {
+    "dict": json.loads,
+    "product": lambda line: Product.from_dict(json.loads(line))
+}
+
+def retained_bytes(build, lines):
+    """Satırlardan oluşturulan kayıt listesinin bellekte kapladığı bayt sayısı"""
+    tracemalloc.start()
+    try:
+        records = [build(line) for line in lines]
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return current, records
+
+def main():
+    parser = argparse.ArgumentParser(description="Ürün sözlüğü ve Product kaydının bellek/kodlama ölçümü")
+    parser.add_argument("--products", type=int, default=50000, help="Sentetik ürün sayısı")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Her kodlama ölçümünün en kısa süresi (saniye)")
+    parser.add_argument("--repeat", type=int, default=5, help="Ölçüm tekrarı (en iyisi raporlanır)")
+    parser.add_argument("--output", type=str, default="benchmark_records.json", help="Sonuç JSON dosyası")
+    parser.add_argument("--compare", type=str, default=None, help="Karşılaştırılacak önceki sonuç dosyası")
+    args = parser.parse_args()
+
+    lines = [json.dumps(product, ensure_ascii=False) for product in make_products(args.products)]
+    sample = lines[:1000]  # Kodlama ölçümü için yeterli, tekrarlar kısa kalır
+
+    results = []
+    for name, build in REPRESENTATIONS.items():
+        size, _ = retained_bytes(build, lines)
+        records = [build(line) for line in sample]
+        result = {
+            "name": name,
+            "products": args.products,
+            "bytes_per_product": round(size / args.products, 1)
+        }
+        for output_format, indent in (("jsonl", None), ("json", 2)):
+            seconds = measure(lambda: [_encode(record, indent) for record in records], args.min_time, args.repeat)
+            result[f"{output_format}_us_per_product"] = round(seconds * 1e6 / len(records), 2)
+        results.append(result)
+        print(f"{name:<10} {result['bytes_per_product']:>8.1f} bayt/ürün  "
+              f"jsonl {result['jsonl_us_per_product']:>6.2f} µs/ürün  json {result['json_us_per_product']:>6.2f} µs/ürün")
+
+    settings = {key: getattr(args, key) for key in ("products", "min_time", "repeat")}
+    report = write_results(args.output, "records", settings, results)
+    if args.compare:
+        compare_results(args.compare, report)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# benchmarks/bench_scrapers.py - Scraper modlarının yerel taklit sunucuya karşı ölçümü
+"""Her scraper modunu yerel MockPetlebiServer'a karşı çalıştırıp ölçer
+
+Her mod ayrı bir alt süreçte çalışır; böylece CPU süresi ve en yüksek
+bellek kullanımı (peak RSS) yalnızca o moda aittir ve sunucunun yükü
+ölçüme karışmaz. İstek gecikmesi, scraper'ın tek istek gönderen metodu
+(_get_once / _fetch_once) sarılarak ölçülür ve hız sınırlayıcı beklemesini
+de içerir.
+
+Kullanım (repo kökünden):
+    python -m benchmarks.bench_scrapers --pages 20 --latency 0.02 --output results/scrapers.json
+    python -m benchmarks.bench_scrapers --compare results/scrapers.json
+"""
+import argparse
+import asyncio
+import functools
+import json
+import subprocess
+import sys
+import time
+from benchmarks.common import REPO_DIR, percentile, cpu_seconds, peak_rss_mb, write_results, compare_results
+from benchmarks.mock_server import MockPetlebiServer
+
+MODES = ("sync", "sync-sitemap", "async", "async-sitemap")
+
+# Alt sürecin sonuç satırını diğer çıktılardan ayıran önek
+RESULT_PREFIX = "BENCHMARK_RESULT "
+
+def _timed(func, samples):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            samples.append(time.perf_counter() - start)
+    return wrapper
+
+def _timed_async(func, samples):
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            samples.append(time.perf_counter() - start)
+    return wrapper
+
+def run_mode(mode, base_url, sitemap_url, workers, throttle=False):
+    """Tek bir modu bu süreçte çalıştırır ve metrik sözlüğünü döndürür"""
+    from rate_limiter import AdaptiveRateLimiter
+
+    discovery = "sitemap" if mode.endswith("-sitemap") else "pagination"
+    # Kod değişikliklerini karşılaştırmak için hız sınırı varsayılan olarak devre dışıdır
+    rate_limiter = None if throttle else AdaptiveRateLimiter(
+        rate=10000, max_rate=10000, concurrency=workers + 1, max_concurrency=workers + 1
+    )
+    latencies = []
+    options = dict(base_url=base_url, rate_limiter=rate_limiter, http_cache=False, keep_products=False,
+                   discovery=discovery, sitemap_url=sitemap_url)
+
+    if mode.startswith("async"):
+        from async_scraper import AsyncPetlebiScraper
+        scraper = AsyncPetlebiScraper(concurrency_limit=workers, **options)
+        scraper._fetch_once = _timed_async(scraper._fetch_once, latencies)
+        run = lambda: asyncio.run(scraper.scrape_all())
+    else:
+        from scraper import PetlebiScraper
+        scraper = PetlebiScraper(max_workers=workers, **options)
+        scraper._get_once = _timed(scraper._get_once, latencies)
+        run = scraper.scrape_all_pages
+
+    cpu_start = cpu_seconds()
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    # ProcessPoolExecutor alt süreçleri beklendiği için CPU sürelerine dahildir
+    cpu = cpu_seconds() - cpu_start
+
+    p50, p99 = percentile(latencies, 0.50), percentile(latencies, 0.99)
+    return {
+        "name": mode,
+        "products": scraper.product_count,
+        "seconds": round(elapsed, 3),
+        "products_per_second": round(scraper.product_count / max(elapsed, 1e-9), 1),
+        "requests": len(latencies),
+        "p50_ms": round(p50 * 1000, 2) if p50 is not None else None,
+        "p99_ms": round(p99 * 1000, 2) if p99 is not None else None,
+        "cpu_seconds": round(cpu, 3),
+        "peak_rss_mb": peak_rss_mb(),
+        "retries": scraper.retry_policy.get_stats()["retries"]
+    }
+
+def run_worker(mode, server, args):
+    """Modu ayrı bir alt süreçte çalıştırır ve sonucunu döndürür"""
+    command = [sys.executable, "-m", "benchmarks.bench_scrapers", "--worker", mode,
+               "--base-url", server.base_url, "--sitemap-url", server.sitemap_url,
+               "--workers", str(args.workers)]
+    if args.throttle:
+        command.append("--throttle")
+    completed = subprocess.run(command, cwd=REPO_DIR, stdout=subprocess.PIPE,
+                               stderr=None if args.verbose else subprocess.DEVNULL, text=True)
+    for line in reversed(completed.stdout.splitlines()):
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX):])
+    raise RuntimeError(f"{mode} modu sonuç üretmedi (çıkış kodu {completed.returncode})")
+
+def main():
+    parser = argparse.ArgumentParser(description="Scraper modlarını yerel taklit sunucuya karşı ölçer")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES), help="Ölçülecek modlar")
+    parser.add_argument("--pages", type=int, default=20, help="Taklit sunucudaki liste sayfası sayısı")
+    parser.add_argument("--per-page", type=int, default=24, help="Sayfa başına ürün")
+    parser.add_argument("--latency", type=float, default=0.02, help="Sunucu yanıt gecikmesi (saniye)")
+    parser.add_argument("--jitter", type=float, default=0.01, help="Gecikmeye eklenen en fazla rastgele süre (saniye)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 döndürülen isteklerin oranı (0-1)")
+    parser.add_argument("--workers", type=int, default=8, help="Detay iş parçacığı / eşzamanlı istek sayısı")
+    parser.add_argument("--repeat", type=int, default=1, help="Her modun kaç kez çalıştırılacağı (ortanca süreli sonuç raporlanır)")
+    parser.add_argument("--throttle", action="store_true", help="CONFIG'deki hız sınırlayıcı ayarlarını kullan")
+    parser.add_argument("--output", type=str, default="benchmark_scrapers.json", help="Sonuç JSON dosyası")
+    parser.add_argument("--compare", type=str, default=None, help="Karşılaştırılacak önceki sonuç dosyası")
+    parser.add_argument("--verbose", action="store_true", help="Scraper loglarını göster")
+    # Alt süreç argümanları
+    parser.add_argument("--worker", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    parser.add_argument("--sitemap-url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        result = run_mode(args.worker, args.base_url, args.sitemap_url, args.workers, args.throttle)
+        print(RESULT_PREFIX + json.dumps(result), flush=True)
+        return
+
+    settings = {key: getattr(args, key) for key in
+                ("pages", "per_page", "latency", "jitter", "error_rate", "workers", "repeat", "throttle")}
+    results = []
+    with MockPetlebiServer(pages=args.pages, per_page=args.per_page, latency=args.latency,
+                           jitter=args.jitter, error_rate=args.error_rate) as server:
+        for mode in args.modes:
+            runs = []
+            for _ in range(args.repeat):
+                errors_before = server.errors
+                result = run_worker(mode, server, args)
+                result["server_errors"] = server.errors - errors_before
+                result["complete"] = result["products"] == server.product_count
+                runs.append(result)
+            result = sorted(runs, key=lambda run: run["seconds"])[len(runs) // 2]
+            results.append(result)
+            print(f"{mode:<14} {result['products']:>6} ürün  {result['seconds']:>8.2f} sn  "
+                  f"{result['products_per_second']:>8.1f} ürün/sn  p50 {result['p50_ms']} ms  p99 {result['p99_ms']} ms  "
+                  f"CPU {result['cpu_seconds']:.2f} sn  RSS {result['peak_rss_mb']} MB")
+
+    report = write_results(args.output, "scrapers", settings, results)
+    if args.compare:
+        compare_results(args.compare, report)
+
+if __name__ == "__main__":
+    main()
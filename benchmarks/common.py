@@ -0,0 +1,111 @@
+# benchmarks/common.py - Ölçüm betiklerinin ortak yardımcıları
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+try:
+    import resource  # Yalnızca Unix; Windows'ta CPU/RSS ölçümleri boş kalır
+except ImportError:
+    resource = None
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Karşılaştırılan metrikler; diğer alanlar (ör. ürün sayısı) bilgi amaçlıdır
+LOWER_IS_BETTER = ("seconds", "cpu_seconds", "peak_rss_mb", "p50_ms", "p99_ms", "us_per_call",
+                   "bytes_per_product", "jsonl_us_per_product", "json_us_per_product",
+                   "write_us_per_product", "read_us_per_product")
+HIGHER_IS_BETTER = ("products_per_second", "rows_per_second", "calls_per_second")
+
+def percentile(samples, fraction):
+    """Sıralı olmayan örneklerden yakın sıra (nearest-rank) yüzdeliği döndürür"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def cpu_seconds():
+    """Sürecin ve beklenmiş alt süreçlerinin (ör. ayrıştırma havuzu) toplam CPU süresi"""
+    if resource is None:
+        return time.process_time()
+    total = 0.0
+    for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN):
+        usage = resource.getrusage(who)
+        total += usage.ru_utime + usage.ru_stime
+    return total
+
+def peak_rss_mb():
+    """Sürecin o ana kadarki en yüksek bellek kullanımı (MB)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux kilobayt, macOS bayt cinsinden döndürür
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def git_revision():
+    """Ölçümün alındığı commit'i döndürür (git yoksa None)"""
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                                  capture_output=True, text=True, timeout=10)
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_DIR,
+                               capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if revision.returncode != 0:
+        return None
+    return revision.stdout.strip() + ("-dirty" if dirty.stdout.strip() else "")
+
+def write_results(filename, benchmark, settings, results):
+    """Sonuçları commit ve ortam bilgisiyle birlikte JSON dosyasına yazar"""
+    report = {
+        "benchmark": benchmark,
+        "revision": git_revision(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "settings": settings,
+        "results": results
+    }
+    directory = os.path.dirname(filename)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    with open(filename, "w", encoding="utf-8") as result_file:
+        json.dump(report, result_file, ensure_ascii=False, indent=2)
+    print(f"Sonuçlar {filename} dosyasına yazıldı")
+    return report
+
+def compare_results(previous_file, report, threshold=0.05):
+    """Önceki bir sonuç dosyasıyla karşılaştırıp threshold'dan büyük farkları yazdırır
+
+    Sonuçlar "name" alanıyla eşleştirilir; LOWER_IS_BETTER ve HIGHER_IS_BETTER
+    metrikleri için yüzde değişim ve iyileşme/gerileme işareti gösterilir.
+
+    Returns:
+        Gerileyen (ad, metrik, değişim) üçlülerinin listesi
+    """
+    with open(previous_file, "r", encoding="utf-8") as result_file:
+        previous = json.load(result_file)
+    previous_results = {result["name"]: result for result in previous.get("results", [])}
+    print(f"Karşılaştırma: {previous.get('revision')} -> {report.get('revision')}")
+
+    regressions = []
+    for result in report["results"]:
+        old = previous_results.get(result["name"])
+        if old is None:
+            continue
+        for metric in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+            value, old_value = result.get(metric), old.get(metric)
+            if not isinstance(value, (int, float)) or not isinstance(old_value, (int, float)) or not old_value:
+                continue
+            change = (value - old_value) / old_value
+            if abs(change) < threshold:
+                continue
+            worse = change > 0 if metric in LOWER_IS_BETTER else change < 0
+            if worse:
+                regressions.append((result["name"], metric, change))
+            marker = "GERİLEME" if worse else "iyileşme"
+            print(f"  {result['name']:<24} {metric:<16} {old_value:>12} -> {value:<12} ({change:+.1%}, {marker})")
+    return regressions
@@ -0,0 +1,243 @@
+# benchmarks/mock_server.py - Kayıtlı HTML fikstürlerini sunan yerel Petlebi taklidi
+import argparse
+import gzip
+import html
+import json
+import os
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from string import Template
+from urllib.parse import urlsplit, parse_qs
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+def load_fixture(name):
+    """fixtures/ altındaki HTML şablonunu string.Template olarak yükler"""
+    with open(os.path.join(FIXTURES_DIR, name), "r", encoding="utf-8") as fixture_file:
+        return Template(fixture_file.read())
+
+class MockPetlebiServer:
+    """Liste, detay ve sitemap sayfalarını fikstürlerden üreten HTTP sunucusu
+
+    Her istek latency (+ rastgele jitter) saniye bekletilir; error_rate
+    olasılıkla 503 döndürülür. Detay sayfaları ETag ile sunulur ve
+    If-None-Match eşleşirse 304 döner. pages sayfadan sonraki liste
+    sayfaları boştur (katalog sonu).
+    """
+
+    CATEGORIES = ("Kedi > Kedi Maması", "Kedi > Kedi Kumu", "Köpek > Köpek Maması", "Köpek > Köpek Ödülü", "Kuş > Kuş Yemi")
+    BRANDS = ("Royal Canin", "Pro Plan", "Hills", "Acana", "Reflex", "Brit Care")
+
+    def __init__(self, pages=20, per_page=24, latency=0.0, jitter=0.0, error_rate=0.0,
+                 host="127.0.0.1", port=0, seed=0):
+        """Sunucuyu hazırla (start() ile dinlemeye başlar)
+
+        Args:
+            pages: Ürün içeren liste sayfası sayısı
+            per_page: Sayfa başına ürün sayısı
+            latency: Her yanıttan önceki sabit bekleme (saniye)
+            jitter: Beklemeye eklenen en fazla rastgele süre (saniye)
+            error_rate: 503 döndürülen isteklerin oranı (0-1)
+            host, port: Dinlenecek adres (port 0: boş bir port seçilir)
+            seed: Hata ve gecikme dağılımı için rastgele tohum
+        """
+        self.pages = pages
+        self.per_page = per_page
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.host = host
+        self.port = port
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._listing = load_fixture("listing.html")
+        self._card = load_fixture("card.html")
+        self._detail = load_fixture("detail.html")
+        self._server = None
+        self._thread = None
+        self.requests = 0
+        self.errors = 0
+
+    @property
+    def origin(self):
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def base_url(self):
+        return f"{self.origin}/alisveris/ara"
+
+    @property
+    def sitemap_url(self):
+        return f"{self.origin}/sitemap.xml"
+
+    @property
+    def product_count(self):
+        return self.pages * self.per_page
+
+    def start(self):
+        """Sunucuyu arka plan iş parçacığında başlatır"""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Başlık ve gövde ayrı yazıldığı için Nagle + gecikmeli ACK her yanıta ~40 ms ekler
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                status, headers, body = server.handle(self.path, self.headers)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-sunucu", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Sunucuyu durdurur"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def handle(self, path, request_headers):
+        """İsteği yanıtlar: (durum kodu, başlıklar, gövde) döndürür"""
+        with self._random_lock:
+            self.requests += 1
+            delay = self.latency + (self._random.random() * self.jitter if self.jitter else 0.0)
+            failed = self.error_rate and self._random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        if delay:
+            time.sleep(delay)
+        if failed:
+            return 503, {"Retry-After": "0"}, b""
+
+        parts = urlsplit(path)
+        if parts.path == "/sitemap.xml":
+            return 200, {"Content-Type": "application/xml"}, self.sitemap_index()
+        if parts.path == "/sitemap-products.xml.gz":
+            return 200, {"Content-Type": "application/gzip"}, self.product_sitemap()
+        if parts.path.startswith("/urun/") and parts.path.endswith(".html"):
+            product_id = parts.path[len("/urun/"):-len(".html")]
+            if not product_id.isdigit():
+                return 404, {}, b""
+            etag = f'"{product_id}-v1"'
+            if request_headers.get("If-None-Match") == etag:
+                return 304, {"ETag": etag}, b""
+            headers = {"Content-Type": "text/html; charset=utf-8", "ETag": etag}
+            return 200, headers, self.detail_page(int(product_id)).encode("utf-8")
+        if parts.path == "/alisveris/ara":
+            page = int(parse_qs(parts.query).get("page", ["1"])[0])
+            return 200, {"Content-Type": "text/html; charset=utf-8"}, self.listing_page(page).encode("utf-8")
+        return 404, {}, b""
+
+    def _product(self, product_id):
+        """Ürün kimliğinden belirlenimci (her çalışmada aynı) ürün alanları üretir"""
+        return {
+            "id": str(product_id),
+            "url": f"{self.origin}/urun/{product_id}.html",
+            "name": f"Test Mama {product_id} Tavuklu 2 kg",
+            "price": f"{50 + product_id % 950}.90",
+            "stock": "Stokta" if product_id % 7 else "Tükendi",
+            "category": self.CATEGORIES[product_id % len(self.CATEGORIES)],
+            "brand": self.BRANDS[product_id % len(self.BRANDS)],
+            "barcode": f"869{product_id:010d}",
+            "image": f"https://cdn.petlebi.com/img/{product_id}.jpg"
+        }
+
+    def listing_page(self, page):
+        """page numaralı liste sayfasını üretir (pages'ten sonrası boştur)"""
+        cards = []
+        if 1 <= page <= self.pages:
+            for index in range(self.per_page):
+                product = self._product(page * 1000 + index)
+                gtm = json.dumps({
+                    "id": product["id"], "name": product["name"], "price": product["price"],
+                    "dimension2": product["stock"], "category": product["category"], "brand": product["brand"]
+                }, ensure_ascii=False)
+                cards.append(self._card.substitute(
+                    url=product["url"], gtm=html.escape(gtm), image=product["image"], name=html.escape(product["name"]),
+                    brand=html.escape(product["brand"]), price=product["price"], id=product["id"]
+                ))
+        pagination = "".join(
+            f'<li class="page-item"><a class="page-link" href="{self.base_url}?page={number}">{number}</a></li>'
+            for number in range(max(1, page - 2), min(self.pages, page + 2) + 1)
+        )
+        return self._listing.substitute(title="Arama", cards="".join(cards), pagination=pagination)
+
+    def detail_page(self, product_id):
+        """Ürün detay sayfasını (JSON-LD dahil) üretir"""
+        product = self._product(product_id)
+        jsonld = json.dumps({
+            "@context": "https://schema.org", "@type": "Product", "name": product["name"],
+            "productID": product["id"], "sku": product["id"], "image": product["image"],
+            "brand": {"@type": "Brand", "name": product["brand"]}, "category": product["category"],
+            "offers": {
+                "@type": "Offer", "priceCurrency": "TRY", "price": product["price"],
+                "availability": "https://schema.org/InStock" if product["stock"] == "Stokta" else "https://schema.org/OutOfStock"
+            }
+        }, ensure_ascii=False)
+        return self._detail.substitute(
+            title=html.escape(product["name"]), jsonld=jsonld.replace("</", "<\\/"), name=html.escape(product["name"]),
+            image=product["image"], brand=html.escape(product["brand"]), brand_slug=product["brand"].lower().replace(" ", "-"),
+            price=product["price"], id=product["id"], barcode=product["barcode"], category=html.escape(product["category"]),
+            description=f"Yetişkin kediler için tam ve dengeli bir mama. Ürün {product_id}, hassas sindirim sistemine uygundur."
+        )
+
+    def sitemap_index(self):
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            f'<sitemap><loc>{self.origin}/sitemap-products.xml.gz</loc></sitemap>'
+            '</sitemapindex>'
+        ).encode("utf-8")
+
+    def product_sitemap(self):
+        urls = "".join(
+            f"<url><loc>{self._product(page * 1000 + index)['url']}</loc><changefreq>daily</changefreq></url>"
+            for page in range(1, self.pages + 1) for index in range(self.per_page)
+        )
+        return gzip.compress(
+            ('<?xml version="1.0" encoding="UTF-8"?>'
+             f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>').encode("utf-8")
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description="Kayıtlı fikstürleri sunan yerel Petlebi taklidi")
+    parser.add_argument("--port", type=int, default=8800, help="Dinlenecek port")
+    parser.add_argument("--pages", type=int, default=20, help="Ürün içeren liste sayfası sayısı")
+    parser.add_argument("--per-page", type=int, default=24, help="Sayfa başına ürün")
+    parser.add_argument("--latency", type=float, default=0.02, help="Yanıt başına gecikme (saniye)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Gecikmeye eklenen en fazla rastgele süre (saniye)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 döndürülen isteklerin oranı (0-1)")
+    args = parser.parse_args()
+
+    server = MockPetlebiServer(pages=args.pages, per_page=args.per_page, latency=args.latency, jitter=args.jitter,
+                               error_rate=args.error_rate, port=args.port).start()
+    print(f"Sunucu hazır: {server.base_url} (sitemap: {server.sitemap_url})", flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+# checkpoint.py - Uzun taramalar için kaldığı yerden devam etme kaydı
+import json
+import os
+import threading
+import time
+from config import CONFIG
+
+class Checkpoint:
+    """Tamamlanan sayfaları ve detay URL'lerini atomik olarak diske yazar
+
+    Bir sayfanın listesi alınınca kaç ürününün beklendiği kaydedilir; ürünler
+    çıktıya yazıldıkça sayaç düşer ve sıfırlanınca sayfa tamamlanmış sayılır.
+    Dosya önce geçici bir dosyaya yazılıp os.replace ile değiştirildiği için
+    yarıda kesilen bir yazma eski kaydı bozmaz.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path, base_url=None, save_interval=None):
+        """Boş bir kayıt oluştur
+
+        Args:
+            path: Kayıt dosyasının yolu
+            base_url: Taranan liste URL'si (devam ederken karşılaştırılır)
+            save_interval: İki kayıt arasındaki en kısa süre (saniye, varsayılan CONFIG)
+        """
+        self.path = path
+        self.base_url = base_url
+        self.save_interval = save_interval if save_interval is not None else CONFIG['checkpoint']['save_interval']
+        self.completed_pages = set()
+        self.completed_urls = set()
+        self.pending = {}  # Sayfa -> çıktıya yazılmayı bekleyen ürün sayısı
+        self.failed_pages = set()  # En az bir ürünü alınamayan sayfalar (devam ederken yeniden denenir)
+        self.failed_urls = set()  # Sitemap'ten bulunup alınamayan ürünler (sayfası yoktur)
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # Aynı anda iki iş parçacığı geçici dosyaya yazmasın
+        self._last_save = 0.0
+        self._written_at = 0.0  # Diske yazılan son durumun saved_at değeri
+
+    @classmethod
+    def load(cls, path, base_url=None, save_interval=None):
+        """Kayıt dosyasını okur; dosya yoksa None döndürür
+
+        Raises:
+            ValueError: Dosya bozuksa ya da başka bir URL'ye aitse
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as checkpoint_file:
+                state = json.load(checkpoint_file)
+        except FileNotFoundError:
+            return None
+
+        if state.get("version") != cls.VERSION:
+            raise ValueError(f"Desteklenmeyen kayıt sürümü: {state.get('version')}")
+        if base_url and state.get("base_url") and state["base_url"] != base_url:
+            raise ValueError(f"Kayıt başka bir adrese ait: {state['base_url']}")
+
+        checkpoint = cls(path, base_url=base_url or state.get("base_url"), save_interval=save_interval)
+        checkpoint.completed_pages = set(state["completed_pages"])
+        checkpoint.completed_urls = set(state["completed_urls"])
+        # Yarım kalan sayfaların listesi devam ederken yeniden alınır
+        return checkpoint
+
+    def is_page_done(self, page):
+        with self._lock:
+            return page in self.completed_pages
+
+    def is_url_done(self, url):
+        with self._lock:
+            return url in self.completed_urls
+
+    def page_started(self, page, product_count):
+        """Sayfanın listesi alındı; product_count ürün çıktıya yazılmayı bekliyor"""
+        with self._lock:
+            if product_count:
+                self.pending[page] = product_count
+            else:
+                self.completed_pages.add(page)
+
+    def item_done(self, page, url, success=True):
+        """Sayfadaki bir ürün işlendi; başarılıysa ürün çıktıya yazılmış sayılır
+        
+        Ürünlerinden biri alınamayan sayfa tamamlanmış sayılmaz; devam ederken
+        listesi yeniden alınır ve yalnızca eksik ürünler işlenir. Sitemap'ten
+        bulunan ürünlerde page None'dır ve yalnızca URL kaydedilir.
+        """
+        with self._lock:
+            if success:
+                self.completed_urls.add(url)
+            elif page is None:
+                self.failed_urls.add(url)
+            else:
+                self.failed_pages.add(page)
+            if page is None:
+                return
+            remaining = self.pending.get(page, 0) - 1
+            if remaining > 0:
+                self.pending[page] = remaining
+            else:
+                self.pending.pop(page, None)
+                if page not in self.failed_pages:
+                    self.completed_pages.add(page)
+
+    def save_due(self):
+        """Son kayıttan bu yana save_interval geçtiyse True döndürür"""
+        return time.monotonic() - self._last_save >= self.save_interval
+
+    def snapshot(self):
+        """Kaydın o anki durumunu kopyalar; save(state) ile daha sonra yazılabilir
+
+        Çağıran kendi kilidi altında durumu alıp çıktıyı kilit dışında
+        boşalttıktan sonra yazabilir; bir sonraki kayıt save_interval sonra gelir.
+        """
+        with self._lock:
+            state = {
+                "version": self.VERSION,
+                "base_url": self.base_url,
+                "saved_at": time.time(),
+                "completed_pages": sorted(self.completed_pages),
+                "pending_pages": {str(page): count for page, count in sorted(self.pending.items())},
+                "completed_urls": sorted(self.completed_urls)
+            }
+            self._last_save = time.monotonic()
+        return state
+
+    def save(self, state=None):
+        """Kaydı (verilmediyse o anki durumu) geçici dosyaya yazıp atomik olarak yerine koyar
+
+        Bu arada daha yeni bir durum yazıldıysa eski durum yazılmaz.
+        """
+        with self._save_lock:
+            if state is None:
+                state = self.snapshot()
+            elif state["saved_at"] < self._written_at:
+                return
+            self._write(state)
+            self._written_at = state["saved_at"]
+
+    def _write(self, state):
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as checkpoint_file:
+            json.dump(state, checkpoint_file, ensure_ascii=False)
+            checkpoint_file.flush()
+            os.fsync(checkpoint_file.fileno())
+        os.replace(temp_path, self.path)
+
+    def finish(self, total_pages=0):
+        """Tüm sayfalar ve sitemap ürünleri tamamlandıysa kaydı siler, aksi halde son durumu yazar
+
+        Args:
+            total_pages: Taranan son sayfa numarası (sitemap ile keşifte 0)
+
+        Returns:
+            Tamamlanamayan sayfaların listesi (alınamayan sitemap ürünleri failed_urls'tedir)
+        """
+        with self._lock:
+            missing = [page for page in range(1, total_pages + 1) if page not in self.completed_pages]
+            failed_urls = bool(self.failed_urls)
+        if missing or failed_urls:
+            self.save()
+        elif os.path.exists(self.path):
+            os.remove(self.path)
+        return missing
+
+def open_checkpoint(path, base_url=None, resume=False):
+    """--resume verildiyse mevcut kaydı yükler, yoksa ya da istenmediyse yeni kayıt açar
+
+    Returns:
+        (checkpoint, resumed) çifti; resumed True ise çıktı dosyasına eklenmelidir
+
+    Raises:
+        ValueError: Mevcut kayıt bozuksa ya da başka bir URL'ye aitse
+    """
+    checkpoint = Checkpoint.load(path, base_url=base_url) if resume else None
+    if checkpoint is not None:
+        return checkpoint, True
+    return Checkpoint(path, base_url=base_url), False
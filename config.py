@@ -5,10 +5,84 @@ CONFIG = {
         "port": 3306,
         "user": "root", 
         "password": "",
-        "db_name": "mydatabase"
+        "db_name": "mydatabase",
+        "batch_size": 500,  # İçe aktarmada grup (commit) başına satır sayısı
+        "batch_retries": 2,  # Başarısız bir grubun satır satır ayıklanmadan önceki deneme sayısı
+        "pool_size": 5,  # DatabaseManager bağlantı havuzunun boyutu
+        "import_workers": 1,  # İçe aktarmada paralel yazıcı (bağlantı) sayısı
+        "writer_queue_size": 2000,  # --sink mysql: veritabanını bekleyen en fazla ürün (geri basınç)
+        "writer_max_latency": 2.0,  # --sink mysql: bir ürünün yazılmadan bekleyebileceği en uzun süre (sn)
+        "upsert": True,  # product_url'ye göre güncelle, içeriği değişmeyen satırları atla
+        "use_load_data": False  # LOAD DATA LOCAL INFILE hızlı yolu (sunucuda local_infile açık olmalı)
     },
     "scraping": {
         "base_url": "https://www.petlebi.com/alisveris/ara",
-        "max_pages": 222
+        "max_pages": None,  # Sayfalamada en fazla sayfa (None: boş sayfaya kadar devam et)
+        "max_failed_pages": 3,  # Sayfalamada art arda alınamayan bu kadar sayfadan sonra durulur
+        "discovery": "pagination",  # Ürün URL'lerinin bulunması: "pagination", "sitemap" veya "auto" (önce sitemap, yoksa sayfalama)
+        "sitemap_url": "https://www.petlebi.com/sitemap.xml",
+        "product_url_pattern": r"^https?://[^/]+/[^/?#]+/[^/?#]+\.html$",  # Sitemap'teki ürün sayfalarını seçer
+        "max_workers": 8,  # Detay sayfaları için eşzamanlı iş parçacığı sayısı
+        "per_host_limit": 8,  # Aynı sunucuya aynı anda yapılabilecek en fazla istek
+        "queue_size": 200,  # Liste ve detay aşamaları arasındaki kuyruğun kapasitesi
+        "parser": "lxml",  # HTML ayrıştırıcı: "lxml" (derlenmiş XPath) veya "soup" (BeautifulSoup)
+        "parse_executor": "auto"  # Asenkron scraper'da ayrıştırma havuzu: "process", "thread" veya "auto"
+    },
+    "rate_limit": {
+        "initial_rate": 5.0,  # Başlangıç hızı (istek/saniye)
+        "min_rate": 0.2,
+        "max_rate": 50.0,
+        "rate_step": 0.1,  # Her başarılı istekte eklenen hız
+        "initial_concurrency": 4,
+        "min_concurrency": 1,
+        "max_concurrency": 16,
+        "decrease_factor": 0.5,  # 429/5xx sonrası hız ve eşzamanlılık çarpanı
+        "cooldown": 1.0  # Art arda düşürmeler arasındaki en kısa süre (saniye)
+    },
+    "retry": {
+        # Hata türü başına en fazla yeniden deneme sayısı
+        "max_retries": {"connection_error": 3, "server_error": 3, "rate_limited": 5},
+        "base_delay": 0.5,  # Üstel geri çekilmenin başlangıç süresi (saniye)
+        "max_delay": 30.0,
+        "budget_ratio": 0.2,  # Her ilk istek başına kazanılan yeniden deneme hakkı
+        "budget_min": 10  # Çalışma başına her zaman izin verilen yeniden deneme sayısı
+    },
+    "http_cache": {
+        "enabled": True,
+        "path": ".cache/http_cache.sqlite",
+        "max_bytes": 256 * 1024 * 1024  # Önbelleğin disk üzerindeki en büyük boyutu
+    },
+    "output": {
+        "format": "json",  # "json" (girintili dizi), "jsonl" (satır başına bir ürün), "msgpack" veya "parquet" (dizin)
+        "serializer": "json",  # JSON kodlayıcı: "json", "orjson" ya da "auto" (orjson kuruluysa orjson)
+        "compression": None,  # "none", "gzip", "zstd"; None: dosya uzantısından (.gz, .zst)
+        "gzip_level": 6,
+        "zstd_level": 3,
+        "flush_every": 100  # Kaç üründe bir çıktı dosyasının diske boşaltılacağı
+    },
+    "parquet": {
+        "partition_by": "category",  # "category", "date" (kazıma günü) ya da "none"
+        "row_group_size": 10000,  # Satır grubu başına ürün sayısı (bölüm başına tamponlanır)
+        "max_buffered_rows": 10000,  # Tüm bölümlerde bellekte bekleyen en fazla ürün; aşılınca en büyük tampon yazılır
+        "compression": "snappy",  # "snappy", "zstd", "gzip" ya da "none"
+        "compact_on_close": True  # Checkpoint'lerde kapatılan küçük parçaları bitişte bölüm başına birleştir
+    },
+    "checkpoint": {
+        "save_interval": 5.0  # Kaldığı yer kaydının en sık kaç saniyede bir yazılacağı
+    },
+    "logging": {
+        "level": "INFO",
+        "to_file": True,
+        "dir": "logs",
+        "queue": True,  # Konsol ve dosya yazımı QueueListener ile arka plan iş parçacığında yapılır
+        "json": False,  # Her kaydı tek satırlık JSON olarak yaz (logs/*.jsonl)
+        "sample_every": 100,  # Logger.sampled: aynı türden her N. ürün mesajı yazılır
+        "rate_limit_interval": 5.0  # Logger.rate_limited: aynı türden mesaj en sık bu kadar saniyede bir yazılır
+    },
+    "metrics": {
+        "summary": True,  # Çalışma sonunda aşama ölçümlerinin tablosunu yazdır
+        "file": None,  # Ölçümlerin yazılacağı dosya (.json: JSON, diğerleri: Prometheus metni)
+        "port": None,  # /metrics adresinde Prometheus metninin sunulacağı port (None: kapalı)
+        "host": "127.0.0.1"
     }
 }
\ No newline at end of file
@@ -1,14 +1,73 @@
 # database.py - Veritabanı işlemleri
 import mysql.connector
+from mysql.connector import pooling
+import asyncio
+import hashlib
 import json
+import os
+import queue
+import tempfile
+import threading
+import time
+import zlib
+from itertools import islice
 from config import CONFIG
+from collections.abc import Mapping
+from product import as_product
+from product_io import iter_products
+
+# petlebi tablosuna yazılan ürün sütunları (sıra _product_values ile aynıdır)
+PRODUCT_COLUMNS = ("product_url", "name", "barcode", "price", "stock",
+                   "image", "description", "sku", "category", "brand")
 
 class Database:
-    def __init__(self):
+    INSERT_PRODUCT_QUERY = f"""
+    INSERT INTO petlebi ({', '.join(PRODUCT_COLUMNS)})
+    VALUES ({', '.join(['%s'] * len(PRODUCT_COLUMNS))})
+    """
+    
+    # product_url üzerindeki benzersiz anahtara çarpan satır güncellenir
+    UPSERT_PRODUCT_QUERY = f"""
+    INSERT INTO petlebi ({', '.join(PRODUCT_COLUMNS)}, content_hash)
+    VALUES ({', '.join(['%s'] * (len(PRODUCT_COLUMNS) + 1))})
+    ON DUPLICATE KEY UPDATE {', '.join(f'{column} = VALUES({column})' for column in PRODUCT_COLUMNS[1:])},
+        content_hash = VALUES(content_hash)
+    """
+    
+    # LOAD DATA ile upsert: satırlar bağlantıya özel geçici tabloya yüklenir, oradan
+    # UPSERT_PRODUCT_QUERY ile aynı anlamda (satır silinmeden, id korunarak) aktarılır
+    STAGING_TABLE_QUERY = f"""
+    CREATE TEMPORARY TABLE IF NOT EXISTS petlebi_staging
+    SELECT {', '.join(PRODUCT_COLUMNS)}, content_hash FROM petlebi LIMIT 0
+    """
+    
+    # İçerik özeti aynı olan satırlara dokunulmaz (content_hash en son atanır)
+    STAGED_UPSERT_QUERY = f"""
+    INSERT INTO petlebi ({', '.join(PRODUCT_COLUMNS)}, content_hash)
+    SELECT {', '.join(PRODUCT_COLUMNS)}, content_hash FROM petlebi_staging
+    ON DUPLICATE KEY UPDATE {', '.join(
+        f'{column} = IF(petlebi.content_hash <=> VALUES(content_hash), petlebi.{column}, VALUES({column}))'
+        for column in PRODUCT_COLUMNS[1:])},
+        content_hash = VALUES(content_hash)
+    """
+    
+    LOAD_DATA_QUERY = """
+    LOAD DATA LOCAL INFILE '{path}' INTO TABLE {table}
+    CHARACTER SET utf8mb4
+    FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\'
+    LINES TERMINATED BY '\\n'
+    ({columns})
+    """
+    
+    # Kilitlenme, kilit bekleme zaman aşımı ve kopan bağlantı: grup yeniden denenir
+    TRANSIENT_ERRNOS = (1205, 1213, 2006, 2013, 2055)
+    
+    def __init__(self, metrics=None):
         self.connection = None
         self.cursor = None
+        self.metrics = metrics  # Grup yazma süreleri ve satır sayaçları için Metrics (opsiyonel)
         
-    def connect(self, host=None, port=None, user=None, password=None):
+    def connect(self, host=None, port=None, user=None, password=None, allow_local_infile=None):
         """Veritabanı bağlantısı oluşturur"""
         host = host or input("localhost name: ")
         port = port or input("port name: ")
@@ -20,7 +79,9 @@ class Database:
                 host=host,
                 port=port,
                 user=user,
-                password=password
+                password=password,
+                allow_local_infile=(CONFIG['database']['use_load_data']
+                                    if allow_local_infile is None else allow_local_infile)
             )
             self.cursor = self.connection.cursor()
             return True
@@ -52,38 +113,318 @@ class Database:
             print(f"SQL dosyası çalıştırma hatası: {e}")
             return False
             
-    def import_products(self, products_data):
-        """Ürünleri veritabanına ekler"""
+    def import_products(self, products_data, batch_size=None, use_load_data=None, upsert=None):
+        """Ürünleri veritabanına toplu olarak ekler
+        
+        Ürünler batch_size'lık gruplar halinde executemany (ya da LOAD DATA LOCAL
+        INFILE) ile yazılır ve her grup ayrı commit edilir. Hatalı bir grup önce
+        yeniden denenir, yine başarısız olursa satır satır yazılarak sorunlu
+        satırlar ayıklanır; içe aktarmanın geri kalanı devam eder.
+        
+        Upsert modunda product_url benzersiz anahtar kabul edilir: mevcut ürünler
+        güncellenir, içerik özeti (content_hash) değişmemiş satırlar hiç yazılmaz.
+        
+        Args:
+            products_data: Ürünlerden (Product ya da sözlük) oluşan herhangi bir iterable
+            batch_size: Grup başına satır sayısı (varsayılan CONFIG)
+            use_load_data: LOAD DATA LOCAL INFILE hızlı yolunu kullan
+            upsert: Mevcut ürünleri güncelle, değişmeyenleri atla (varsayılan CONFIG)
+        """
+        batch_size = batch_size or CONFIG['database']['batch_size']
+        if use_load_data is None:
+            use_load_data = CONFIG['database']['use_load_data']
+        if upsert is None:
+            upsert = CONFIG['database']['upsert']
+        
+        known_hashes = self.prepare_import(upsert)
+        counts = self.new_import_counts()
+        start_time = time.time()
         try:
-            for product in products_data:
-                add_product_query = """
-                INSERT INTO petlebi (product_url, name, barcode, price, stock, image, description, sku, category, brand)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """
-                product_values = (
-                    product['url'],
-                    product['name'],
-                    product.get('barcode', ''),
-                    product['price'],
-                    product['stock'],
-                    product.get('image', ''),
-                    product.get('description', ''),
-                    product.get('sku', ''),
-                    product.get('category', ''),
-                    product.get('brand', '')
-                )
-                self.cursor.execute(add_product_query, product_values)
-            return True
+            for batch in self._batches(products_data, batch_size):
+                self.import_batch(batch, counts, known_hashes, use_load_data)
+                
+                done = counts["inserted"] + counts["updated"] + counts["unchanged"]
+                elapsed = max(time.time() - start_time, 1e-9)
+                print(f"{done} ürün işlendi ({done / elapsed:.0f} satır/sn)")
         except Exception as e:
             print(f"Ürün ekleme hatası: {e}")
             return False
+        
+        self.print_import_summary(counts, time.time() - start_time)
+        done = counts["inserted"] + counts["updated"] + counts["unchanged"]
+        return done > 0 or counts["rejected"] == 0
+    
+    @staticmethod
+    def new_import_counts():
+        """import_batch'in güncellediği sayaç sözlüğünü döndürür"""
+        return {"inserted": 0, "updated": 0, "unchanged": 0, "rejected": 0}
+    
+    @staticmethod
+    def print_import_summary(counts, elapsed):
+        """İçe aktarma sayaçlarını ve hızını yazdırır"""
+        elapsed = max(elapsed, 1e-9)
+        done = counts["inserted"] + counts["updated"] + counts["unchanged"]
+        print(f"İçe aktarma tamamlandı: {counts['inserted']} eklendi, {counts['updated']} güncellendi, "
+              f"{counts['unchanged']} değişmedi, {counts['rejected']} reddedildi, "
+              f"{elapsed:.2f} saniye ({done / elapsed:.0f} satır/sn)")
+    
+    def prepare_import(self, upsert):
+        """Upsert modunda şemayı hazırlar ve mevcut içerik özetlerini döndürür (aksi halde None)"""
+        if not upsert:
+            return None
+        if self.ensure_upsert_schema():
+            return self._load_content_hashes()
+        print("Upsert şeması hazırlanamadı, ürünler doğrudan ekleniyor")
+        return None
+    
+    def import_batch(self, batch, counts, known_hashes=None, use_load_data=False):
+        """Bir grup ürünü yazar ve counts sözlüğünü günceller
+        
+        Args:
+            batch: Ürün (Product ya da sözlük) listesi
+            counts: new_import_counts() ile oluşturulan sayaçlar
+            known_hashes: prepare_import'un döndürdüğü URL -> content_hash (None ise düz ekleme)
+            use_load_data: LOAD DATA LOCAL INFILE hızlı yolunu kullan
+        """
+        upsert = known_hashes is not None
+        before = dict(counts) if self.metrics else None
+        rows = []
+        for product in batch:
+            try:
+                values = self._product_values(product)
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"Eksik alanlı ürün atlandı: {e}")
+                counts["rejected"] += 1
+                continue
+            
+            if upsert:
+                content_hash = self._content_hash(values)
+                if known_hashes.get(values[0]) == content_hash:
+                    counts["unchanged"] += 1
+                    continue
+                values += (content_hash,)
+            rows.append(values)
+        
+        start = time.perf_counter()
+        written = self._load_data_batch(rows, upsert=upsert) if use_load_data else None
+        if written is None:
+            written = self._insert_batch(rows, upsert=upsert)
+        elapsed = time.perf_counter() - start
+        counts["rejected"] += len(rows) - len(written)
+        
+        for row in written:
+            if upsert and row[0] in known_hashes:
+                counts["updated"] += 1
+            else:
+                counts["inserted"] += 1
+            if upsert:
+                known_hashes[row[0]] = row[-1]
+        
+        if self.metrics:
+            self.metrics.observe("db_batch_seconds", elapsed)
+            for result, count in counts.items():
+                if count != before[result]:
+                    self.metrics.inc("db_rows", count - before[result], result=result)
+    
+    def ensure_upsert_schema(self):
+        """content_hash sütununu ve product_url benzersiz anahtarını yoksa ekler"""
+        try:
+            self.cursor.execute("""
+            SELECT COLUMN_NAME, DATA_TYPE FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'petlebi'
+            """)
+            column_types = {name: data_type.lower() for name, data_type in self.cursor.fetchall()}
+            if 'product_url' not in column_types:
+                print("petlebi tablosunda product_url sütunu bulunamadı")
+                return False
+            
+            if 'content_hash' not in column_types:
+                self.cursor.execute("ALTER TABLE petlebi ADD COLUMN content_hash CHAR(32) NULL")
+            
+            # Yalnızca product_url'den oluşan benzersiz bir indeks var mı?
+            self.cursor.execute("""
+            SELECT INDEX_NAME FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'petlebi' AND NON_UNIQUE = 0
+            GROUP BY INDEX_NAME
+            HAVING COUNT(*) = 1 AND MAX(COLUMN_NAME) = 'product_url'
+            """)
+            if not self.cursor.fetchall():
+                # TEXT sütunlar ancak önek uzunluğuyla indekslenebilir
+                key = 'product_url(255)' if column_types['product_url'].endswith(('text', 'blob')) else 'product_url'
+                self.cursor.execute(f"ALTER TABLE petlebi ADD UNIQUE KEY uq_petlebi_product_url ({key})")
+            return True
+        except mysql.connector.Error as err:
+            # Ör. tabloda zaten yinelenen URL'ler varsa benzersiz anahtar eklenemez (1062)
+            print(f"Upsert şeması hatası: {err}")
+            return False
+    
+    def _load_content_hashes(self):
+        """Mevcut ürünlerin URL -> content_hash eşlemesini yükler"""
+        self.cursor.execute("SELECT product_url, content_hash FROM petlebi")
+        return dict(self.cursor.fetchall())
+    
+    @staticmethod
+    def _content_hash(values):
+        """Ürün sütun değerlerinin (URL hariç) MD5 özetini döndürür"""
+        normalized = [str(value) if value is not None else None for value in values[1:]]
+        return hashlib.md5(json.dumps(normalized, ensure_ascii=False).encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def _batches(iterable, size):
+        """Iterable'ı size uzunluğunda listelere böler"""
+        iterator = iter(iterable)
+        while True:
+            batch = list(islice(iterator, size))
+            if not batch:
+                return
+            yield batch
+    
+    @staticmethod
+    def _product_values(product):
+        """Ürünü (Product ya da sözlük) PRODUCT_COLUMNS sırasına çevirir
+        
+        Fiyat iki ondalıklı metin olarak yazılır (DECIMAL(10,2)); böylece içerik
+        özeti kaynaktaki "110.90" ile 110.9 arasında değişmez. URL'si ya da
+        geçerli fiyatı olmayan ürün için hata verir (import_batch satırı reddeder).
+        """
+        product = as_product(product)
+        if not product.url:
+            raise KeyError('url')
+        if product.price != product.price:
+            raise ValueError(f"geçersiz fiyat ({product.url})")
+        return (
+            product.url,
+            product.name,
+            product.barcode,
+            f"{product.price:.2f}",
+            product.stock,
+            product.image,
+            product.description,
+            product.sku,
+            product.category,
+            product.brand
+        )
+    
+    def _insert_batch(self, rows, upsert=False):
+        """Bir grubu executemany ile yazar ve yazılan satırları döndürür
+        
+        Hata olursa grup yeniden denenir, yine yazılamazsa satırlar tek tek
+        yazılarak sorunlu olanlar ayıklanır.
+        """
+        if not rows:
+            return []
+        
+        query = self.UPSERT_PRODUCT_QUERY if upsert else self.INSERT_PRODUCT_QUERY
+        retries = CONFIG['database']['batch_retries']
+        for attempt in range(retries + 1):
+            try:
+                self.cursor.executemany(query, rows)
+                self.connection.commit()
+                return rows
+            except mysql.connector.Error as err:
+                self._rollback()
+                print(f"Grup yazılamadı ({attempt + 1}. deneme, {len(rows)} satır): {err}")
+                # Veri hataları (ör. yinelenen anahtar) tekrar denemekle düzelmez
+                if err.errno not in self.TRANSIENT_ERRNOS:
+                    break
+                if attempt < retries:
+                    time.sleep(0.5 * (2 ** attempt))
+        
+        # Grup hâlâ yazılamıyorsa sorunlu satırları tek tek ayıkla
+        written = []
+        for row in rows:
+            try:
+                self.cursor.execute(query, row)
+                written.append(row)
+            except mysql.connector.Error as err:
+                print(f"Satır eklenemedi ({row[0]}): {err}")
+        self.connection.commit()
+        return written
+    
+    def _load_data_batch(self, rows, upsert=False):
+        """Grubu geçici bir TSV dosyası üzerinden LOAD DATA LOCAL INFILE ile yazar
+        
+        Upsert modunda grup önce petlebi_staging geçici tablosuna yüklenir,
+        ardından INSERT ... SELECT ... ON DUPLICATE KEY UPDATE ile aktarılır;
+        REPLACE'ın aksine mevcut satır silinmez ve id'si değişmez. Başarısız
+        olursa None döndürür; çağıran executemany yoluna geri döner.
+        """
+        if not rows:
+            return []
+        
+        columns = PRODUCT_COLUMNS + ('content_hash',) if upsert else PRODUCT_COLUMNS
+        fd, path = tempfile.mkstemp(suffix='.tsv')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8', newline='') as tsv_file:
+                for row in rows:
+                    tsv_file.write('\t'.join(self._tsv_field(value) for value in row))
+                    tsv_file.write('\n')
+            
+            if upsert:
+                self.cursor.execute(self.STAGING_TABLE_QUERY)
+                self.cursor.execute("TRUNCATE TABLE petlebi_staging")
+            self.cursor.execute(self.LOAD_DATA_QUERY.format(
+                path=path.replace('\\', '/'),
+                table='petlebi_staging' if upsert else 'petlebi',
+                columns=', '.join(columns)
+            ))
+            if upsert:
+                self.cursor.execute(self.STAGED_UPSERT_QUERY)
+            self.connection.commit()
+            return rows
+        except mysql.connector.Error as err:
+            self._rollback()
+            print(f"LOAD DATA başarısız, executemany ile devam ediliyor: {err}")
+            return None
+        finally:
+            os.remove(path)
+    
+    @staticmethod
+    def _tsv_field(value):
+        """Değeri LOAD DATA'nın varsayılan kaçış kurallarına göre yazar"""
+        if value is None:
+            return '\\N'
+        return (str(value)
+                .replace('\\', '\\\\')
+                .replace('\t', '\\t')
+                .replace('\n', '\\n')
+                .replace('\r', '\\r'))
+    
+    def _rollback(self):
+        """Açık işlemi geri alır; bağlantı koptuysa yeniden bağlanmayı dener"""
+        try:
+            self.connection.rollback()
+        except mysql.connector.Error:
+            pass
+        try:
+            self.connection.ping(reconnect=True, attempts=3, delay=1)
+            self.cursor = self.connection.cursor()
+        except mysql.connector.Error as err:
+            print(f"Veritabanına yeniden bağlanılamadı: {err}")
     
-    def import_products_from_json(self, filename):
-        """JSON dosyasından ürünleri içe aktarır"""
+    def iter_products(self):
+        """petlebi tablosundaki ürünleri sözlük olarak döndürür"""
+        cursor = self.connection.cursor(dictionary=True)
         try:
-            with open(filename, 'r') as json_file:
-                products_data = json.load(json_file)
-                return self.import_products(products_data)
+            cursor.execute("""
+            SELECT product_url AS url, name, barcode, price, stock, image, description, sku, category, brand
+            FROM petlebi
+            """)
+            for row in cursor:
+                yield row
+        finally:
+            cursor.close()
+    
+    def import_products_from_json(self, filename, serializer=None, **import_options):
+        """JSON, JSON Lines veya msgpack dosyasındaki ürünleri akış halinde içe aktarır
+        
+        Dosya tamamen belleğe alınmaz; çözülen ürünler import_products'a gruplar
+        halinde aktarılır ve ilk grup dosyanın geri kalanı okunmadan yazılır.
+        Biçim ve gzip/zstd sıkıştırması dosyadan anlaşılır; serializer JSON Lines
+        satırlarını çözecek kodlayıcıdır. Diğer seçenekler import_products'a iletilir.
+        """
+        try:
+            return self.import_products(iter_products(filename, serializer=serializer), **import_options)
         except Exception as e:
             print(f"JSON okuma hatası: {e}")
             return False
@@ -93,4 +434,309 @@ class Database:
         if self.connection:
             self.connection.commit()
             self.connection.close()
-            print("Veritabanı bağlantısı kapatıldı")
\ No newline at end of file
+            print("Veritabanı bağlantısı kapatıldı")
+
+class DatabaseWriter:
+    """Scraper'dan gelen ürünleri arka plan iş parçacığında gruplar halinde yazan sink
+    
+    write() ürünü sınırlı bir kuyruğa koyar; kuyruk doluysa (veritabanı
+    geride kaldıysa) scraper bekler. Yazıcı iş parçacığı batch_size ürün
+    biriktiğinde ya da ilk üründen bu yana max_latency saniye geçtiğinde grubu
+    Database.import_batch ile yazar; böylece ürünler kazındıktan birkaç saniye
+    sonra tabloda görünür.
+    """
+    
+    _STOP = object()
+    
+    def __init__(self, database, batch_size=None, max_latency=None, queue_size=None,
+                 upsert=None, use_load_data=None, known_hashes=None):
+        """Yazıcıyı başlat
+        
+        Args:
+            database: Bağlantısı açık Database nesnesi (yalnızca yazıcı iş parçacığı kullanır)
+            batch_size: Grup başına satır sayısı (varsayılan CONFIG)
+            max_latency: Bir ürünün yazılmadan bekleyebileceği en uzun süre (saniye)
+            queue_size: Bekleyen en fazla ürün sayısı (aşılınca write() bloklanır)
+            upsert: product_url'ye göre güncelle, değişmeyenleri atla (varsayılan CONFIG)
+            use_load_data: LOAD DATA LOCAL INFILE hızlı yolunu kullan
+            known_hashes: Önceden yüklenmiş URL -> content_hash (verilmezse prepare_import çağrılır)
+        """
+        settings = CONFIG['database']
+        self.database = database
+        self.batch_size = batch_size or settings['batch_size']
+        self.max_latency = max_latency or settings['writer_max_latency']
+        self.use_load_data = settings['use_load_data'] if use_load_data is None else use_load_data
+        self.upsert = settings['upsert'] if upsert is None else upsert
+        self.counts = Database.new_import_counts()
+        self.count = 0
+        self.error = None
+        self._queue = queue.Queue(maxsize=queue_size or settings['writer_queue_size'])
+        self._start_time = time.time()
+        self._known_hashes = known_hashes if known_hashes is not None else database.prepare_import(self.upsert)
+        self._thread = threading.Thread(target=self._run, name="db-yazici", daemon=True)
+        self._thread.start()
+    
+    def write(self, product):
+        """Ürünü yazma kuyruğuna ekler; kuyruk doluysa yer açılana kadar bekler"""
+        self._observe_depth()
+        self._put(product)
+        self.count += 1
+    
+    async def write_async(self, product):
+        """write ile aynı, ancak kuyruk doluyken olay döngüsünü bloklamaz"""
+        self._observe_depth()
+        try:
+            self._check_error()
+            self._queue.put_nowait(product)
+        except queue.Full:
+            await asyncio.get_running_loop().run_in_executor(None, self._put, product)
+        self.count += 1
+    
+    def flush(self):
+        """Kuyruktaki tüm ürünler veritabanına yazılana kadar bekler"""
+        self.flush_nowait()()
+    
+    def flush_nowait(self):
+        """Şu ana kadar yazılan ürünlerin boşaltılmasını ister ve beklemeden döner
+        
+        Returns:
+            Çağrıldığında bu ürünler commit edilene kadar bekleyen fonksiyon
+            (yazıcı hata verirse RuntimeError fırlatır)
+        """
+        done = threading.Event()
+        self._put(done)
+        
+        def wait():
+            while not done.wait(0.5):
+                self._check_error()
+            self._check_error()
+        return wait
+    
+    def close(self, summary=True):
+        """Kalan ürünleri yazar, iş parçacığını durdurur ve (summary ise) özeti yazdırır"""
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join()
+        if summary:
+            Database.print_import_summary(self.counts, time.time() - self._start_time)
+    
+    def _observe_depth(self):
+        # Derinlik sürekli kapasitedeyse darboğaz veritabanıdır
+        if self.database.metrics:
+            self.database.metrics.observe("queue_depth", self._queue.qsize(), queue="db_writer")
+    
+    def _check_error(self):
+        if self.error is not None:
+            raise RuntimeError(f"Veritabanı yazıcısı durdu: {self.error}")
+    
+    def _put(self, item):
+        # Yazıcı hata verip durduysa sonsuza kadar beklememek için aralıklarla denetlenir
+        while True:
+            self._check_error()
+            try:
+                self._queue.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+    
+    def _run(self):
+        """Kuyruğu boşaltan ve grupları yazan iş parçacığı döngüsü"""
+        batch = []
+        deadline = None
+        try:
+            while True:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None  # max_latency doldu, eldeki grup yazılır
+                
+                if item is self._STOP:
+                    self._write(batch)
+                    return
+                if isinstance(item, threading.Event):
+                    self._write(batch)
+                    batch, deadline = [], None
+                    item.set()
+                    continue
+                if item is not None:
+                    batch.append(item)
+                    if deadline is None:
+                        deadline = time.monotonic() + self.max_latency
+                if item is None or len(batch) >= self.batch_size:
+                    self._write(batch)
+                    batch, deadline = [], None
+        except Exception as e:
+            self.error = e
+            print(f"Veritabanı yazıcısı hatası: {e}")
+            # Bekleyen flush çağrıları ve write() kilitlenmesin diye kuyruk boşaltılır
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(item, threading.Event):
+                    item.set()
+    
+    def _write(self, batch):
+        if batch:
+            self.database.import_batch(batch, self.counts, self._known_hashes, self.use_load_data)
+
+class DatabaseManager(Database):
+    """Bağlantı havuzu kullanan, kopan bağlantıları yenileyen veritabanı yöneticisi
+    
+    Şema işlemleri (create_database, run_sql_file) ana bağlantıda yapılır.
+    Paralel içe aktarmada her yazıcı havuzdan kendi bağlantısını alır; ürünler
+    URL'lerine göre yazıcılara bölünür, böylece aynı ürün hep aynı bağlantıdan
+    yazılır ve upsert'ler birbirini ezmez.
+    """
+    
+    def __init__(self, pool_size=None, metrics=None):
+        super().__init__(metrics)
+        self.pool_size = pool_size or CONFIG['database']['pool_size']
+        self.pool = None
+        self._connect_args = None
+    
+    def connect(self, host=None, port=None, user=None, password=None, allow_local_infile=None):
+        """Ana bağlantıyı açar ve havuz için bağlantı bilgilerini saklar"""
+        host = host or input("localhost name: ")
+        port = port or input("port name: ")
+        user = user or input("User name: ")
+        password = password or input("MySQL password: ")
+        if allow_local_infile is None:
+            allow_local_infile = CONFIG['database']['use_load_data']
+        
+        if not super().connect(host=host, port=port, user=user, password=password,
+                               allow_local_infile=allow_local_infile):
+            return False
+        self._connect_args = {
+            "host": host,
+            "port": port,
+            "user": user,
+            "password": password,
+            "allow_local_infile": allow_local_infile
+        }
+        return True
+    
+    def create_database(self, db_name):
+        """Veritabanını oluşturur; havuz yeni veritabanıyla yeniden kurulur"""
+        if not super().create_database(db_name):
+            return False
+        self.pool = None
+        return True
+    
+    def ensure_connection(self):
+        """Ana bağlantıyı yoklar, kopmuşsa yeniden bağlanır"""
+        try:
+            self.connection.ping(reconnect=True, attempts=3, delay=1)
+            self.cursor = self.connection.cursor()
+            return True
+        except mysql.connector.Error as err:
+            print(f"Veritabanına yeniden bağlanılamadı: {err}")
+            return False
+    
+    def _get_pool(self):
+        if self.pool is None:
+            self.pool = pooling.MySQLConnectionPool(
+                pool_name=f"petlebi_{id(self)}",
+                pool_size=self.pool_size,
+                pool_reset_session=True,
+                database=self.connection.database,
+                **self._connect_args
+            )
+        return self.pool
+    
+    def get_connection(self):
+        """Havuzdan sağlığı denetlenmiş bir bağlantı alır (close() ile havuza geri döner)"""
+        connection = self._get_pool().get_connection()
+        try:
+            connection.ping(reconnect=True, attempts=3, delay=1)
+        except mysql.connector.Error:
+            connection.close()
+            raise
+        return connection
+    
+    def pooled_database(self):
+        """Havuzdan alınan bağlantıyı kullanan bağımsız bir Database döndürür"""
+        database = Database(self.metrics)
+        database.connection = self.get_connection()
+        database.cursor = database.connection.cursor()
+        return database
+    
+    def import_products(self, products_data, batch_size=None, use_load_data=None, upsert=None, workers=None):
+        """Ürünleri içe aktarır; workers > 1 ise paralel yazıcılarla (bkz. parallel_import)"""
+        workers = workers or CONFIG['database']['import_workers']
+        if not self.ensure_connection():
+            return False
+        if workers <= 1:
+            return super().import_products(products_data, batch_size=batch_size,
+                                           use_load_data=use_load_data, upsert=upsert)
+        return self.parallel_import(products_data, workers, batch_size=batch_size,
+                                    use_load_data=use_load_data, upsert=upsert)
+    
+    def parallel_import(self, products_data, workers, batch_size=None, use_load_data=None, upsert=None):
+        """Ürün akışını URL'ye göre workers adet havuz bağlantısına bölerek yazar
+        
+        Her parça bir DatabaseWriter (arka plan iş parçacığı) tarafından
+        gruplar halinde yazılır. İçerik özetleri ana bağlantıda bir kez yüklenir
+        ve yazıcılara parçalarına göre dağıtılır.
+        """
+        if upsert is None:
+            upsert = CONFIG['database']['upsert']
+        if self.pool is None:
+            self.pool_size = min(max(self.pool_size, workers), pooling.CNX_POOL_MAXSIZE)
+        if workers > self.pool_size:
+            print(f"Yazıcı sayısı havuz boyutuna indirildi: {self.pool_size}")
+            workers = self.pool_size
+        
+        known_hashes = self.prepare_import(upsert)
+        shard_hashes = [{} for _ in range(workers)] if known_hashes is not None else [None] * workers
+        if known_hashes is not None:
+            for url, content_hash in known_hashes.items():
+                shard_hashes[self._shard(url, workers)][url] = content_hash
+            known_hashes.clear()
+        
+        start_time = time.time()
+        databases = []
+        writers = []
+        try:
+            for shard in range(workers):
+                database = self.pooled_database()
+                databases.append(database)
+                writers.append(DatabaseWriter(
+                    database, batch_size=batch_size, upsert=known_hashes is not None,
+                    use_load_data=use_load_data, known_hashes=shard_hashes[shard]
+                ))
+            
+            for count, product in enumerate(products_data, 1):
+                url = product.get('url') if isinstance(product, Mapping) else None
+                writers[self._shard(url, workers)].write(product)
+                if count % 1000 == 0:
+                    elapsed = max(time.time() - start_time, 1e-9)
+                    print(f"{count} ürün yazıcılara dağıtıldı ({count / elapsed:.0f} satır/sn)")
+        except Exception as e:
+            print(f"Paralel içe aktarma hatası: {e}")
+            return False
+        finally:
+            counts = self.new_import_counts()
+            for writer in writers:
+                writer.close(summary=False)
+                for key in counts:
+                    counts[key] += writer.counts[key]
+            for database in databases:
+                database.connection.close()  # Bağlantı havuza geri döner
+        
+        print(f"{workers} paralel yazıcı kullanıldı")
+        self.print_import_summary(counts, time.time() - start_time)
+        done = counts["inserted"] + counts["updated"] + counts["unchanged"]
+        return done > 0 or counts["rejected"] == 0
+    
+    @staticmethod
+    def _shard(url, shard_count):
+        """URL'nin yazılacağı parçayı belirler (aynı URL hep aynı parçaya düşer)"""
+        return zlib.crc32((url or '').encode('utf-8')) % shard_count
+    
+    def iter_products(self):
+        """petlebi tablosundaki ürünleri sözlük olarak döndürür (önce bağlantı yoklanır)"""
+        self.ensure_connection()
+        return super().iter_products()
@@ -0,0 +1,56 @@
+# dedup.py - Sayfalar arasında tekrar eden ürünleri ayıklayan indeks
+import threading
+from contextlib import nullcontext
+from urllib.parse import urlsplit, urlunsplit
+
+def normalize_url(url):
+    """Aynı ürün sayfasını gösteren URL'leri tek biçime getirir
+
+    Şema ve sunucu küçük harfe çevrilir; sorgu dizesi (izleme parametreleri),
+    parça (#...) ve sondaki '/' atılır.
+    """
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, '', ''))
+
+class SeenIndex:
+    """Detayı kuyruğa alınmış ürünleri GTM id'si ve normalize edilmiş URL ile hatırlar
+
+    Liste kayarken bir sonraki sayfada yeniden görünen ya da birden fazla
+    aramada çıkan ürünün detay sayfası ikinci kez indirilmez. Sync scraper'ın
+    iş parçacıkları için kilitli, asenkron scraper için kilitsiz kullanılır.
+    """
+
+    def __init__(self, thread_safe=True):
+        """Boş bir indeks oluştur
+
+        Args:
+            thread_safe: True ise add() kilit altında çalışır (tek olay döngüsünde False yeterli)
+        """
+        self._urls = set()
+        self._ids = set()
+        self._lock = threading.Lock() if thread_safe else nullcontext()
+        self.duplicates = 0  # Atlanan (indirilmesi önlenen) detay sayfası sayısı
+
+    def __len__(self):
+        return len(self._urls)
+
+    def add(self, url, product_id=None):
+        """Ürünü indekse ekler; daha önce görüldüyse False döndürür ve tekrarı sayar"""
+        normalized = normalize_url(url)
+        product_id = str(product_id) if product_id not in (None, "") else None
+        with self._lock:
+            if normalized in self._urls or (product_id is not None and product_id in self._ids):
+                self.duplicates += 1
+                return False
+            self._urls.add(normalized)
+            if product_id is not None:
+                self._ids.add(product_id)
+            return True
+
+    def get_stats(self):
+        """Tekil ürün ve önlenen detay isteği sayılarını döndürür"""
+        return {
+            "unique": len(self._urls),
+            "duplicates_skipped": self.duplicates
+        }
@@ -0,0 +1,127 @@
+# discovery.py - Ürün URL'lerini sitemap.xml üzerinden bulma
+import re
+import zlib
+from lxml import etree
+from config import CONFIG
+
+# Sitemap gövdesinin ayrıştırıcıya parça parça verilirken kullanılan boyut (bayt)
+CHUNK_SIZE = 64 * 1024
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+class SitemapParser:
+    """Sitemap XML'ini parça parça çözen akış ayrıştırıcı
+
+    Gövde gzip ile sıkıştırılmışsa (.xml.gz) ilk baytlardan anlaşılır ve açılır.
+    İşlenen <url>/<sitemap> öğeleri hemen silindiği için bellek kullanımı
+    dosyanın boyutundan bağımsızdır. feed() ve close(), bulunan
+    ("url" | "sitemap", adres) çiftlerini döndürür.
+    """
+
+    def __init__(self):
+        self._parser = etree.XMLPullParser(events=("end",), resolve_entities=False, no_network=True)
+        self._decompressor = None
+        self._started = False
+
+    def feed(self, chunk):
+        if not chunk:
+            return []
+        if not self._started:
+            self._started = True
+            if chunk[:2] == _GZIP_MAGIC:
+                self._decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+        if self._decompressor is not None:
+            chunk = self._decompressor.decompress(chunk)
+        self._parser.feed(chunk)
+        return self._read_events()
+
+    def close(self):
+        if self._decompressor is not None:
+            self._parser.feed(self._decompressor.flush())
+        self._parser.close()
+        return self._read_events()
+
+    def _read_events(self):
+        found = []
+        for _, element in self._parser.read_events():
+            if not isinstance(element.tag, str):
+                continue
+            tag = etree.QName(element).localname
+            if tag == "loc":
+                parent = element.getparent()
+                kind = "sitemap" if parent is not None and etree.QName(parent).localname == "sitemap" else "url"
+                location = (element.text or "").strip()
+                if location:
+                    found.append((kind, location))
+            elif tag in ("url", "sitemap"):
+                # İşlenen öğeyi ve önceki kardeşlerini bırak
+                element.clear()
+                parent = element.getparent()
+                while parent is not None and element.getprevious() is not None:
+                    del parent[0]
+        return found
+
+_product_url_pattern = None
+
+def is_product_url(url):
+    """URL'nin bir ürün detay sayfasına ait olup olmadığını CONFIG'deki desenle denetler"""
+    global _product_url_pattern
+    if _product_url_pattern is None:
+        _product_url_pattern = re.compile(CONFIG['scraping']['product_url_pattern'])
+    return bool(_product_url_pattern.search(url))
+
+def _sitemap_entries(body):
+    """Sitemap gövdesini CHUNK_SIZE'lık parçalar halinde ayrıştırır, (tür, adres) çiftlerini üretir"""
+    parser = SitemapParser()
+    for offset in range(0, len(body), CHUNK_SIZE):
+        yield from parser.feed(body[offset:offset + CHUNK_SIZE])
+    yield from parser.close()
+
+def _product_urls(body, depth, max_depth, pending):
+    """Gövdedeki ürün URL'lerini üretir; alt sitemap'leri pending'e ekler"""
+    for kind, location in _sitemap_entries(body):
+        if kind == "sitemap":
+            if depth < max_depth:
+                pending.append((location, depth + 1))
+        elif is_product_url(location):
+            yield location
+
+def iter_sitemap_urls(fetch, sitemap_url, logger=None, max_depth=3):
+    """Sitemap'teki (ve alt sitemap'lerdeki) ürün URL'lerini akış halinde üretir
+
+    İndirme işi çağıranın fetch fonksiyonuna bırakılır; böylece sitemap
+    istekleri de liste/detay sayfalarıyla aynı hız sınırlayıcıdan ve yeniden
+    deneme politikasından geçer. Kök sitemap alınamazsa istisna fırlatılır;
+    çağıran sayfalamaya geri dönebilir. Alt sitemap hataları loglanıp atlanır.
+
+    Args:
+        fetch: URL'yi alıp yanıt gövdesini (bytes) döndüren, başarısızlıkta istisna fırlatan fonksiyon
+        sitemap_url: Kök sitemap (ya da sitemap dizini) adresi
+        logger: Uyarıların yazılacağı logger (opsiyonel)
+        max_depth: İzlenecek en fazla sitemap dizini derinliği
+    """
+    pending = [(sitemap_url, 0)]
+    while pending:
+        url, depth = pending.pop(0)
+        try:
+            yield from _product_urls(fetch(url), depth, max_depth, pending)
+        except Exception as e:
+            if depth == 0:
+                raise
+            if logger:
+                logger.warning(f"Alt sitemap okunamadı ({url}): {e}")
+
+async def aiter_sitemap_urls(fetch, sitemap_url, logger=None, max_depth=3):
+    """iter_sitemap_urls'ün asenkron sürümü (fetch bir coroutine fonksiyonudur)"""
+    pending = [(sitemap_url, 0)]
+    while pending:
+        url, depth = pending.pop(0)
+        try:
+            body = await fetch(url)
+            for location in _product_urls(body, depth, max_depth, pending):
+                yield location
+        except Exception as e:
+            if depth == 0:
+                raise
+            if logger:
+                logger.warning(f"Alt sitemap okunamadı ({url}): {e}")
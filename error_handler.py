@@ -1,32 +1,69 @@
 # error_handler.py - Hata yönetim yardımcısı sınıfı
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
 class ErrorHandler:
     """Uygulama çapında hata yakalama ve işleme için yardımcı sınıf"""
     
     def __init__(self, logger):
         self.logger = logger
     
+    def get_status_code(self, error):
+        """Yanıt ya da hata nesnesinden HTTP durum kodunu alır (requests ve aiohttp)"""
+        status_code = getattr(error, 'status_code', None)
+        if status_code is None:
+            status_code = getattr(error, 'status', None)
+        return status_code if isinstance(status_code, int) else None
+    
+    def classify_request_error(self, error):
+        """HTTP hatasını loglamadan sınıflandırır"""
+        status_code = self.get_status_code(error)
+        if status_code is None:
+            return "connection_error"
+        if status_code == 404:
+            return "not_found"
+        elif status_code == 403:
+            return "forbidden"
+        elif status_code == 429:
+            return "rate_limited"
+        elif status_code >= 500:
+            return "server_error"
+        return "http_error"
+    
+    def get_retry_after(self, response):
+        """Retry-After başlığını saniye cinsinden döndürür (yoksa None)"""
+        headers = getattr(response, 'headers', None)
+        value = headers.get('Retry-After') if headers else None
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        # Başlık HTTP tarihi olarak da gönderilebilir
+        try:
+            retry_at = parsedate_to_datetime(value)
+            return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+    
     def handle_request_error(self, url, error):
         """HTTP isteklerinde oluşan hataları işler"""
-        if hasattr(error, 'status_code'):
-            status_code = error.status_code
-            if status_code == 404:
-                self.logger.warning(f"Sayfa bulunamadı (404): {url}")
-                return "not_found"
-            elif status_code == 403:
-                self.logger.warning(f"Erişim engellendi (403): {url}")
-                return "forbidden"
-            elif status_code == 429:
-                self.logger.warning(f"Çok fazla istek gönderildi (429): {url}")
-                return "rate_limited"
-            elif status_code >= 500:
-                self.logger.error(f"Sunucu hatası ({status_code}): {url}")
-                return "server_error"
-            else:
-                self.logger.error(f"HTTP hatası ({status_code}): {url}")
-                return "http_error"
+        error_type = self.classify_request_error(error)
+        status_code = self.get_status_code(error)
+        if error_type == "not_found":
+            self.logger.warning(f"Sayfa bulunamadı (404): {url}")
+        elif error_type == "forbidden":
+            self.logger.warning(f"Erişim engellendi (403): {url}")
+        elif error_type == "rate_limited":
+            self.logger.warning(f"Çok fazla istek gönderildi (429): {url}")
+        elif error_type == "server_error":
+            self.logger.error(f"Sunucu hatası ({status_code}): {url}")
+        elif error_type == "http_error":
+            self.logger.error(f"HTTP hatası ({status_code}): {url}")
         else:
             self.logger.exception(f"Bağlantı hatası: {url}, {str(error)}")
-            return "connection_error"
+        return error_type
     
     def handle_parse_error(self, url, error):
         """HTML/JSON ayrıştırma hatalarını işler"""
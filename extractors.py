@@ -0,0 +1,296 @@
+# extractors.py - Liste ve detay sayfaları için değiştirilebilir HTML ayrıştırıcılar
+import json
+from bs4 import BeautifulSoup
+from lxml import etree
+from lxml import html as lxml_html
+from config import CONFIG
+
+# Sayfadaki öğelerin sınıf adları (BeautifulSoup'taki class_ eşleşmesiyle aynı)
+LISTING_CARD_CLASS = 'col-lg-4 col-md-4 col-sm-6 search-product-box'
+CARD_BODY_CLASS = 'card-body pb-0 pt-2 pl-3 pr-3'
+DETAIL_INFO_CLASS = 'tab-pane active show read-more-box'
+BARCODE_ROW_CLASS = 'row mb-2'
+BARCODE_LABEL_CLASS = 'col-2 pd-d-t'
+BARCODE_VALUE_CLASS = 'col-10 pd-d-v'
+IMAGE_BOX_CLASS = 'col-md-6 col-sm-5'
+
+def empty_details():
+    """Detay sayfasından çıkarılan alanların varsayılan değerleri"""
+    return {
+        "barcode": "",
+        "description": "",
+        "image": ""
+    }
+
+def _jsonld_items(data):
+    """JSON-LD verisindeki nesneleri (@graph ve listeler dahil) düzleştirir"""
+    if isinstance(data, list):
+        for item in data:
+            yield from _jsonld_items(item)
+    elif isinstance(data, dict):
+        if '@graph' in data:
+            yield from _jsonld_items(data['@graph'])
+        else:
+            yield data
+
+def product_from_jsonld(scripts):
+    """Detay sayfasındaki schema.org Product verisinden liste kartındaki temel alanları çıkarır
+    
+    Sitemap'ten bulunan ürünlerin liste kartı (GTM verisi) olmadığı için ad,
+    fiyat, stok, kategori ve marka buradan alınır. Product yoksa None döndürür.
+    """
+    for script in scripts:
+        try:
+            data = json.loads(script)
+        except (TypeError, ValueError):
+            continue
+        for item in _jsonld_items(data):
+            types = item.get('@type')
+            if 'Product' not in (types if isinstance(types, list) else [types]):
+                continue
+            
+            offers = item.get('offers') or {}
+            if isinstance(offers, list):
+                offers = offers[0] if offers else {}
+            availability = str(offers.get('availability') or '')
+            brand = item.get('brand') or ''
+            if isinstance(brand, dict):
+                brand = brand.get('name') or ''
+            category = item.get('category') or ''
+            if isinstance(category, list):
+                category = category[-1] if category else ''
+            
+            if 'InStock' in availability:
+                stock = "Stokta"
+            elif availability:
+                stock = "Tükendi"
+            else:
+                stock = "Bilinmiyor"
+            return {
+                "name": item.get("name") or "İsimsiz Ürün",
+                "price": offers.get("price", 0.0),
+                "stock": stock,
+                "category": str(category).split('>')[-1].strip(),
+                "id": str(item.get("productID") or item.get("sku") or ""),
+                "brand": brand,
+                "sku": ""
+            }
+    return None
+
+class SoupExtractor:
+    """Tam BeautifulSoup ağacı kuran, referans kabul edilen ayrıştırıcı"""
+
+    name = "soup"
+
+    def parse_listing(self, html):
+        """Liste sayfasındaki ürün kartlarından (URL, GTM JSON metni) çiftlerini çıkarır"""
+        soup = BeautifulSoup(html, 'lxml')
+        cards = []
+        for product in soup.find_all('div', class_=LISTING_CARD_CLASS):
+            more_info = product.find('div', class_=CARD_BODY_CLASS)
+            if not more_info or not more_info.a:
+                continue
+            cards.append((more_info.a.get('href'), more_info.a.get('data-gtm-product')))
+        return cards
+
+    def parse_detail(self, html):
+        """Detay sayfasından barkod, açıklama ve resim bilgilerini çıkarır"""
+        return self._details(BeautifulSoup(html, 'lxml'))
+
+    def parse_product_page(self, html):
+        """Detay sayfasından (JSON-LD temel alanları ya da None, detay sözlüğü) çiftini çıkarır"""
+        soup = BeautifulSoup(html, 'lxml')
+        scripts = [script.string for script in soup.find_all('script', type='application/ld+json')]
+        return product_from_jsonld(scripts), self._details(soup)
+
+    def _details(self, soup):
+        product_details = empty_details()
+
+        # Barkod ve açıklama
+        info = soup.find_all('div', class_=DETAIL_INFO_CLASS, id="hakkinda")
+        for div in info:
+            # Barkod bilgisi
+            barcode_divs = div.find_all('div', class_=BARCODE_ROW_CLASS)
+            for barcode_div in barcode_divs:
+                barcode_label = barcode_div.find('div', class_=BARCODE_LABEL_CLASS)
+                if barcode_label and barcode_label.string == "BARKOD":
+                    barcode_value = barcode_div.find('div', class_=BARCODE_VALUE_CLASS)
+                    if barcode_value:
+                        product_details["barcode"] = barcode_value.text.strip()
+
+            # Ürün açıklaması
+            spans = div.find('span', id='productDescription')
+            if spans:
+                for i, span in enumerate(spans):
+                    if i == 1:  # İkinci öğe açıklama olarak belirtilmiş
+                        product_details["description"] = span.text.strip().replace('\n', ' ')
+
+        # Resim URL'si
+        info2 = soup.find('div', class_=IMAGE_BOX_CLASS)
+        if info2 and info2.a and 'href' in info2.a.attrs:
+            product_details["image"] = info2.a['href']
+
+        return product_details
+
+def _class_xpath(class_name, prefix='.//div', first=True):
+    """Sınıf özniteliği tam olarak eşleşen öğeler için derlenmiş XPath üretir"""
+    expression = f"{prefix}[normalize-space(@class)='{class_name}']"
+    return etree.XPath(f"({expression})[1]" if first else expression)
+
+# BeautifulSoup'un get_text() sırasında atladığı metin kapsayıcıları
+_SKIPPED_TEXT_TAGS = frozenset(('script', 'style', 'template', 'rt', 'rp'))
+
+def _text(element):
+    """BeautifulSoup'un Tag.text davranışına denk metin birleştirme (yorumlar ve betikler hariç)"""
+    parts = []
+    if element.text and element.tag not in _SKIPPED_TEXT_TAGS:
+        parts.append(element.text)
+    for child in element:
+        if isinstance(child.tag, str) and child.tag not in _SKIPPED_TEXT_TAGS:
+            parts.append(_text(child))
+        if child.tail:
+            parts.append(child.tail)
+    return ''.join(parts)
+
+def _string(element):
+    """BeautifulSoup'un Tag.string davranışı: tek bir metin çocuğu varsa onu döndürür"""
+    children = list(element)
+    if not children:
+        return element.text
+    if len(children) == 1 and not element.text and not children[0].tail:
+        return _string(children[0])
+    return None
+
+def _contents(element):
+    """Öğenin doğrudan çocuklarını BeautifulSoup'taki .contents sırasıyla döndürür"""
+    contents = []
+    if element.text:
+        contents.append(element.text)
+    for child in element:
+        contents.append(child)
+        if child.tail:
+            contents.append(child.tail)
+    return contents
+
+_UTF8_PARSER = lxml_html.HTMLParser(encoding='utf-8')
+
+class LxmlExtractor:
+    """Ham lxml ağacı üzerinde derlenmiş XPath ifadeleriyle çalışan hızlı ayrıştırıcı
+
+    BeautifulSoup nesneleri oluşturmaz ve çok sınıflı eşleşmeleri C tarafında
+    yapar; SoupExtractor ile aynı çıktıyı üretir.
+    """
+
+    name = "lxml"
+
+    _cards = _class_xpath(LISTING_CARD_CLASS, prefix='//div', first=False)
+    _card_body = _class_xpath(CARD_BODY_CLASS)
+    _first_link = etree.XPath("(.//a)[1]")
+    _info = etree.XPath(f"//div[@id='hakkinda'][normalize-space(@class)='{DETAIL_INFO_CLASS}']")
+    _barcode_rows = _class_xpath(BARCODE_ROW_CLASS, first=False)
+    _barcode_label = _class_xpath(BARCODE_LABEL_CLASS)
+    _barcode_value = _class_xpath(BARCODE_VALUE_CLASS)
+    _description = etree.XPath("(.//span[@id='productDescription'])[1]")
+    _image_box = _class_xpath(IMAGE_BOX_CLASS, prefix='//div')
+    _jsonld = etree.XPath("//script[@type='application/ld+json']/text()")
+
+    def _parse(self, html):
+        """HTML'i lxml ağacına çevirir; boş belgede None döndürür"""
+        try:
+            if isinstance(html, bytes):
+                # Önbellekten gelen gövde: kodlama bildirimi yoksa UTF-8 varsayılır
+                return lxml_html.document_fromstring(html, parser=_UTF8_PARSER)
+            return lxml_html.document_fromstring(html)
+        except ValueError:
+            # lxml, kodlama bildirimi içeren str girdiyi kabul etmez
+            return lxml_html.document_fromstring(html.encode('utf-8'), parser=_UTF8_PARSER)
+        except etree.ParserError:
+            return None
+
+    def parse_listing(self, html):
+        """Liste sayfasındaki ürün kartlarından (URL, GTM JSON metni) çiftlerini çıkarır"""
+        root = self._parse(html)
+        if root is None:
+            return []
+
+        cards = []
+        for product in self._cards(root):
+            more_info = self._card_body(product)
+            link = self._first_link(more_info[0]) if more_info else None
+            if not link:
+                continue
+            cards.append((link[0].get('href'), link[0].get('data-gtm-product')))
+        return cards
+
+    def parse_detail(self, html):
+        """Detay sayfasından barkod, açıklama ve resim bilgilerini çıkarır"""
+        root = self._parse(html)
+        if root is None:
+            return empty_details()
+        return self._details(root)
+
+    def parse_product_page(self, html):
+        """Detay sayfasından (JSON-LD temel alanları ya da None, detay sözlüğü) çiftini çıkarır"""
+        root = self._parse(html)
+        if root is None:
+            return None, empty_details()
+        return product_from_jsonld(self._jsonld(root)), self._details(root)
+
+    def _details(self, root):
+        product_details = empty_details()
+
+        # Barkod ve açıklama
+        for div in self._info(root):
+            for barcode_div in self._barcode_rows(div):
+                barcode_label = self._barcode_label(barcode_div)
+                if barcode_label and _string(barcode_label[0]) == "BARKOD":
+                    barcode_value = self._barcode_value(barcode_div)
+                    if barcode_value:
+                        product_details["barcode"] = _text(barcode_value[0]).strip()
+
+            spans = self._description(div)
+            if spans:
+                contents = _contents(spans[0])
+                if len(contents) > 1:  # İkinci öğe açıklama olarak belirtilmiş
+                    item = contents[1]
+                    if isinstance(item, str):
+                        text = item
+                    elif isinstance(item.tag, str):
+                        text = _text(item)
+                    else:
+                        text = ''  # Yorumlar metin sayılmaz
+                    product_details["description"] = text.strip().replace('\n', ' ')
+
+        # Resim URL'si
+        image_box = self._image_box(root)
+        if image_box:
+            link = self._first_link(image_box[0])
+            if link and link[0].get('href') is not None:
+                product_details["image"] = link[0].get('href')
+
+        return product_details
+
+EXTRACTORS = {
+    SoupExtractor.name: SoupExtractor(),
+    LxmlExtractor.name: LxmlExtractor()
+}
+
+def get_extractor(name=None):
+    """Adı verilen ayrıştırıcıyı döndürür"""
+    name = name or CONFIG['scraping']['parser']
+    if name not in EXTRACTORS:
+        raise ValueError(f"Bilinmeyen ayrıştırıcı: {name} (seçenekler: {', '.join(EXTRACTORS)})")
+    return EXTRACTORS[name]
+
+# Süreç havuzuna gönderilebilmesi için modül düzeyinde (pickle edilebilir) fonksiyonlar
+def parse_listing(html, backend=None):
+    """Seçilen ayrıştırıcıyla liste sayfasındaki (URL, GTM JSON metni) çiftlerini döndürür"""
+    return get_extractor(backend).parse_listing(html)
+
+def parse_detail(html, backend=None):
+    """Seçilen ayrıştırıcıyla detay sayfasındaki barkod/açıklama/resim sözlüğünü döndürür"""
+    return get_extractor(backend).parse_detail(html)
+
+def parse_product_page(html, backend=None):
+    """Seçilen ayrıştırıcıyla detay sayfasından (JSON-LD temel alanları, detay sözlüğü) çiftini döndürür"""
+    return get_extractor(backend).parse_product_page(html)
@@ -0,0 +1,163 @@
+# http_cache.py - Ürün detay sayfaları için koşullu HTTP önbelleği
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from config import CONFIG
+
+class HttpCache:
+    """URL anahtarlı, ETag/Last-Modified doğrulayıcılı disk önbelleği
+
+    Her kayıt sayfa gövdesini (sıkıştırılmış), doğrulayıcıları ve sayfadan daha
+    önce çıkarılmış detay sözlüğünü (barcode/description/image) tutar. Sunucu 304
+    döndürdüğünde detay sözlüğü doğrudan kullanılır, HTML yeniden ayrıştırılmaz.
+    Toplam boyut max_bytes'ı aşınca en uzun süredir kullanılmayan kayıtlar silinir
+    (LRU). SQLite bağlantısı kilitle korunduğu için iş parçacıkları ve asyncio
+    tarafından birlikte kullanılabilir.
+    """
+
+    def __init__(self, path=None, max_bytes=None):
+        """Önbelleği aç
+
+        Args:
+            path: SQLite dosyasının yolu
+            max_bytes: Saklanan gövdelerin toplam boyut sınırı (bayt)
+        """
+        self.path = path or CONFIG['http_cache']['path']
+        self.max_bytes = max_bytes or CONFIG['http_cache']['max_bytes']
+
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body BLOB,
+                details TEXT,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._connection.execute("CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries (last_access)")
+        self.total_bytes = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+        # Çalışma boyunca tutulan sayaçlar
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def conditional_headers(self, url):
+        """Kayıtlı doğrulayıcılara göre If-None-Match/If-Modified-Since başlıklarını döndürür"""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT etag, last_modified FROM entries WHERE url = ?", (url,)
+            ).fetchone()
+        if not row:
+            return {}
+
+        headers = {}
+        etag, last_modified = row
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def get_details(self, url):
+        """304 yanıtı sonrası önceden ayrıştırılmış detay sözlüğünü döndürür (yoksa None)"""
+        with self._lock:
+            row = self._connection.execute("SELECT details FROM entries WHERE url = ?", (url,)).fetchone()
+            if not row or row[0] is None:
+                return None
+            self._connection.execute("UPDATE entries SET last_access = ? WHERE url = ?", (time.time(), url))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def get_body(self, url):
+        """304 yanıtı sonrası kayıtlı sayfa gövdesini döndürür (yoksa None)"""
+        with self._lock:
+            row = self._connection.execute("SELECT body FROM entries WHERE url = ?", (url,)).fetchone()
+            if not row or row[0] is None:
+                return None
+            self._connection.execute("UPDATE entries SET last_access = ? WHERE url = ?", (time.time(), url))
+            self.hits += 1
+        return zlib.decompress(row[0])
+
+    def store(self, url, headers, body, details):
+        """200 yanıtını doğrulayıcıları ve ayrıştırılmış detaylarla birlikte kaydeder
+
+        Args:
+            url: Sayfa URL'si
+            headers: Yanıt başlıkları (ETag ve Last-Modified okunur)
+            body: Sayfa gövdesi (bytes veya str)
+            details: Sayfadan çıkarılan detay sözlüğü
+        """
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        with self._lock:
+            # Doğrulayıcı yoksa koşullu istek yapılamaz, kaydetmenin faydası olmaz
+            if not etag and not last_modified:
+                self.misses += 1
+                return False
+
+            if isinstance(body, str):
+                body = body.encode('utf-8')
+            compressed = zlib.compress(body)
+            details_json = json.dumps(details, ensure_ascii=False)
+            size = len(compressed) + len(details_json)
+
+            previous = self._connection.execute("SELECT size FROM entries WHERE url = ?", (url,)).fetchone()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO entries (url, etag, last_modified, body, details, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, compressed, details_json, size, time.time())
+            )
+            self.total_bytes += size - (previous[0] if previous else 0)
+            self.misses += 1
+            self.stores += 1
+            self._evict()
+        return True
+
+    def _evict(self):
+        """Boyut sınırı aşıldıysa en eski erişilen kayıtları siler (kilit altında çağrılır)"""
+        while self.total_bytes > self.max_bytes:
+            rows = self._connection.execute(
+                "SELECT url, size FROM entries ORDER BY last_access LIMIT 100"
+            ).fetchall()
+            if not rows:
+                self.total_bytes = 0
+                return
+            for url, size in rows:
+                if self.total_bytes <= self.max_bytes:
+                    break
+                self._connection.execute("DELETE FROM entries WHERE url = ?", (url,))
+                self.total_bytes -= size
+                self.evictions += 1
+
+    def get_stats(self):
+        """Önbellek isabet/ıska sayaçlarını döndürür"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "size_bytes": self.total_bytes
+            }
+
+    def close(self):
+        """Veritabanı bağlantısını kapatır"""
+        with self._lock:
+            self._connection.close()
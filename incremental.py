@@ -0,0 +1,80 @@
+# incremental.py - Yalnızca yeni/değişen ürünlerin detaylarını çeken artımlı tarama
+import hashlib
+import json
+import threading
+from product_io import iter_products
+
+# Detay sayfasıyla ilişkili liste alanları. Fiyat ve stok bilerek dışarıda
+# bırakılır: bunlar her gün değişir ama detay sayfasındaki alanları etkilemez.
+FINGERPRINT_FIELDS = ("url", "name", "brand", "category")
+
+# Yalnızca detay sayfasından gelen alanlar
+DETAIL_FIELDS = ("barcode", "description", "image")
+
+def listing_fingerprint(product):
+    """Ürünün liste kartındaki kimlik alanlarından parmak izi üretir"""
+    values = [str(product.get(field) or "").strip() for field in FINGERPRINT_FIELDS]
+    return hashlib.md5(json.dumps(values, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+class IncrementalIndex:
+    """Önceki çalışmanın ürünlerini id ve URL ile indeksler
+
+    Bir ürünün liste parmak izi değişmediyse önceki detay alanları (barcode,
+    description, image) yeniden kullanılır ve detay sayfası indirilmez.
+    """
+
+    def __init__(self, products=()):
+        self._by_id = {}
+        self._by_url = {}
+        self._lock = threading.Lock()
+
+        # Çalışma boyunca tutulan sayaçlar
+        self.reused = 0
+        self.new = 0
+        self.changed = 0
+
+        for product in products:
+            self.add(product)
+
+    def __len__(self):
+        return len(self._by_url)
+
+    def add(self, product):
+        """Önceki çalışmadan bir ürünü indekse ekler"""
+        url = product.get("url")
+        if not url:
+            return
+        entry = (listing_fingerprint(product), {field: product.get(field) or "" for field in DETAIL_FIELDS})
+        self._by_url[url] = entry
+        product_id = product.get("id")
+        if product_id:
+            self._by_id[str(product_id)] = entry
+
+    def lookup(self, product):
+        """Ürün değişmediyse önceki detay alanlarını, aksi halde None döndürür"""
+        product_id = product.get("id")
+        entry = self._by_id.get(str(product_id)) if product_id else None
+        if entry is None:
+            entry = self._by_url.get(product.get("url"))
+
+        with self._lock:
+            if entry is None:
+                self.new += 1
+                return None
+            fingerprint, details = entry
+            # Detayları boş kalmış (ör. önceki çalışmada alınamamış) ürünler yeniden denenir
+            if fingerprint != listing_fingerprint(product) or not any(details.values()):
+                self.changed += 1
+                return None
+            self.reused += 1
+        return dict(details)
+
+    def get_stats(self):
+        """Yeniden kullanılan, yeni ve değişen ürün sayılarını döndürür"""
+        with self._lock:
+            return {"indexed": len(self._by_url), "reused": self.reused, "new": self.new, "changed": self.changed}
+
+    @classmethod
+    def from_json_file(cls, filename):
+        """Önceki çalışmanın JSON veya JSON Lines çıktısından akış halinde indeks oluşturur"""
+        return cls(iter_products(filename))
@@ -1,68 +1,226 @@
 # logger.py - Loglama yardımcısı
+import atexit
+import json
 import logging
 import os
+import queue
+import threading
+import time
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from config import CONFIG
+
+LOGGER_NAME = 'petlebi_scraper'
+
+class JsonFormatter(logging.Formatter):
+    """Her kaydı tek satırlık JSON nesnesi olarak biçimlendirir
+
+    Mesajla birlikte Logger metotlarına verilen ek alanlar (ör. url=...)
+    nesnenin üst düzey anahtarları olur; böylece loglar jq ya da bir log
+    toplayıcıyla satır satır sorgulanabilir.
+    """
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "thread": record.threadName,
+            "message": record.getMessage()
+        }
+        entry.update(getattr(record, 'fields', None) or {})
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class TextFormatter(logging.Formatter):
+    """Düz metin biçimi; ek alanlar mesajın sonuna anahtar=değer olarak eklenir"""
+
+    def formatMessage(self, record):
+        message = super().formatMessage(record)
+        fields = getattr(record, 'fields', None)
+        if fields:
+            message += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return message
+
+class _QueueHandler(QueueHandler):
+    """Kaydı kuyruğa koymadan önce mesajı ve istisna metnini hazırlayan QueueHandler
+
+    Standart prepare() kaydı kendi biçimiyle biçimlendirip istisnayı mesaja
+    gömer; burada yalnızca mesaj birleştirilir ve istisna exc_text'e yazılır,
+    böylece dinleyicideki metin ve JSON biçimlendiriciler kaydı kendileri
+    biçimlendirir.
+    """
+
+    def prepare(self, record):
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+# Süreç genelindeki yapılandırma: her Logger örneği aynı işleyicileri paylaşır
+_setup_lock = threading.Lock()
+_listener = None
+_configured = False
+
+def _build_handlers(log_to_file, json_format):
+    """Konsol ve (opsiyonel) dosya işleyicilerini oluşturur"""
+    settings = CONFIG['logging']
+    date_format = '%Y-%m-%d %H:%M:%S'
+    if json_format:
+        formatter = JsonFormatter(datefmt=date_format)
+    else:
+        formatter = TextFormatter('%(asctime)s [%(levelname)s] - %(message)s', date_format)
+
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(formatter)
+    handlers = [console_handler]
+
+    if log_to_file:
+        # Log dizinini oluştur
+        log_dir = settings['dir']
+        if not os.path.exists(log_dir):
+            os.makedirs(log_dir)
+
+        # Günlük log dosyası oluştur
+        extension = "jsonl" if json_format else "log"
+        log_filename = f"{log_dir}/petlebi_scraper_{datetime.now().strftime('%Y%m%d')}.{extension}"
+        file_handler = logging.FileHandler(log_filename, encoding="utf-8")
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+    return handlers
+
+def _configure(log_level, log_to_file, use_queue, json_format):
+    """Paylaşılan logger'ın işleyicilerini kurar (eski dinleyici durdurulur)"""
+    global _listener, _configured
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(log_level)
+
+    stop_logging()
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+        handler.close()
+
+    handlers = _build_handlers(log_to_file, json_format)
+    if use_queue:
+        # Dosya ve konsol yazımı arka plan iş parçacığında yapılır; log çağrısı yalnızca kuyruğa ekler
+        log_queue = queue.SimpleQueue()
+        logger.addHandler(_QueueHandler(log_queue))
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+    else:
+        for handler in handlers:
+            logger.addHandler(handler)
+    _configured = True
+
+def stop_logging():
+    """Kuyruk modunda bekleyen kayıtları yazar ve dinleyiciyi durdurur"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+atexit.register(stop_logging)
 
 class Logger:
-    """Uygulama çapında loglama işlevselliği sağlar"""
-    
-    def __init__(self, log_level=logging.INFO, log_to_file=True):
+    """Uygulama çapında loglama işlevselliği sağlar
+
+    Tüm örnekler aynı 'petlebi_scraper' logger'ını kullanır. İşleyiciler ilk
+    örnekte (ya da ayar verilerek oluşturulan örnekte) kurulur; ayarsız
+    oluşturulan sonraki örnekler (ör. scraper'ların içindekiler) mevcut
+    yapılandırmayı değiştirmez.
+    """
+
+    def __init__(self, log_level=None, log_to_file=None, use_queue=None, json_format=None):
         """Logger'ı başlatır
-        
+
         Args:
-            log_level: Loglama seviyesi (logging.DEBUG, logging.INFO, vb.)
+            log_level: Loglama seviyesi (logging.DEBUG, logging.INFO, vb.; varsayılan CONFIG)
             log_to_file: Dosyaya log yazılsın mı?
+            use_queue: Konsol ve dosya yazımı QueueListener ile arka planda yapılsın mı?
+            json_format: Her kayıt tek satırlık JSON olarak yazılsın mı?
         """
-        # Log formatı
-        log_format = '%(asctime)s [%(levelname)s] - %(message)s'
-        date_format = '%Y-%m-%d %H:%M:%S'
-        
-        # Root logger'ı yapılandır
-        self.logger = logging.getLogger('petlebi_scraper')
-        self.logger.setLevel(log_level)
-        
-        # Mevcut handler'ları temizle
-        if self.logger.hasHandlers():
-            self.logger.handlers.clear()
-        
-        # Konsol handler'ı ekle
-        console_handler = logging.StreamHandler()
-        console_handler.setFormatter(logging.Formatter(log_format, date_format))
-        self.logger.addHandler(console_handler)
-        
-        # Dosya handler'ı ekle (opsiyonel)
-        if log_to_file:
-            # Log dizinini oluştur
-            log_dir = 'logs'
-            if not os.path.exists(log_dir):
-                os.makedirs(log_dir)
-            
-            # Günlük log dosyası oluştur
-            log_filename = f"{log_dir}/petlebi_scraper_{datetime.now().strftime('%Y%m%d')}.log"
-            file_handler = logging.FileHandler(log_filename)
-            file_handler.setFormatter(logging.Formatter(log_format, date_format))
-            self.logger.addHandler(file_handler)
-    
-    def debug(self, message):
+        settings = CONFIG['logging']
+        self.logger = logging.getLogger(LOGGER_NAME)
+        options = (log_level, log_to_file, use_queue, json_format)
+        with _setup_lock:
+            if not _configured or any(option is not None for option in options):
+                _configure(
+                    settings['level'] if log_level is None else log_level,
+                    settings['to_file'] if log_to_file is None else log_to_file,
+                    settings['queue'] if use_queue is None else use_queue,
+                    settings['json'] if json_format is None else json_format
+                )
+        self.sample_every = settings['sample_every']
+        self.rate_limit_interval = settings['rate_limit_interval']
+        self._sample_counts = {}  # sampled: anahtar -> çağrı sayısı
+        self._rate_limits = {}  # rate_limited: anahtar -> (son yazım zamanı, atlanan kayıt sayısı)
+        self._samples_lock = threading.Lock()
+
+    def _log(self, level, message, fields, exc_info=False):
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, message, exc_info=exc_info, extra={"fields": fields} if fields else None)
+
+    def debug(self, message, **fields):
         """Debug seviyesinde log"""
-        self.logger.debug(message)
-    
-    def info(self, message):
+        self._log(logging.DEBUG, message, fields)
+
+    def info(self, message, **fields):
         """Info seviyesinde log"""
-        self.logger.info(message)
-    
-    def warning(self, message):
+        self._log(logging.INFO, message, fields)
+
+    def warning(self, message, **fields):
         """Warning seviyesinde log"""
-        self.logger.warning(message)
-    
-    def error(self, message):
+        self._log(logging.WARNING, message, fields)
+
+    def error(self, message, **fields):
         """Error seviyesinde log"""
-        self.logger.error(message)
-    
-    def critical(self, message):
+        self._log(logging.ERROR, message, fields)
+
+    def critical(self, message, **fields):
         """Critical seviyesinde log"""
-        self.logger.critical(message)
-    
-    def exception(self, message):
+        self._log(logging.CRITICAL, message, fields)
+
+    def exception(self, message, **fields):
         """Exception stack trace ile hata logu"""
-        self.logger.exception(message)
\ No newline at end of file
+        self._log(logging.ERROR, message, fields, exc_info=True)
+
+    def sampled(self, key, message, every=None, level=logging.INFO, **fields):
+        """Aynı anahtarla yapılan çağrıların yalnızca her every'incisini loglar (ilki her zaman)
+
+        Ürün başına mesajlar gibi sık tekrarlanan loglar için; yazılan kayda
+        kaç çağrının temsil edildiği "count" alanı olarak eklenir.
+        """
+        if not self.logger.isEnabledFor(level):
+            return
+        every = every or self.sample_every
+        with self._samples_lock:
+            calls = self._sample_counts.get(key, 0) + 1
+            self._sample_counts[key] = calls
+        if calls == 1 or calls % every == 0:
+            self._log(level, message, dict(fields, count=calls))
+
+    def rate_limited(self, key, message, interval=None, level=logging.WARNING, **fields):
+        """Aynı anahtar için en fazla interval saniyede bir kayıt yazar
+
+        Aralık içinde atlanan kayıtların sayısı sonraki kayda "suppressed"
+        alanı olarak eklenir; böylece bir hata fırtınası logları boğmaz ama
+        kaybolmaz da.
+        """
+        if not self.logger.isEnabledFor(level):
+            return
+        interval = self.rate_limit_interval if interval is None else interval
+        now = time.monotonic()
+        with self._samples_lock:
+            last_time, skipped = self._rate_limits.get(key, (None, 0))
+            if last_time is not None and now - last_time < interval:
+                self._rate_limits[key] = (last_time, skipped + 1)
+                return
+            self._rate_limits[key] = (now, 0)
+        if skipped:
+            fields = dict(fields, suppressed=skipped)
+        self._log(level, message, fields)
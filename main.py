@@ -2,11 +2,20 @@
 # main.py - Ana program
 import argparse
 import json
+import logging
+import os
+import shutil
 from config import CONFIG
 from logger import Logger
 from scraper import PetlebiScraper
-from database import DatabaseManager
+from database import DatabaseManager, DatabaseWriter
+from incremental import IncrementalIndex
+from product_io import open_writer, resolve_compression
+from checkpoint import open_checkpoint
+from metrics import start_metrics, finish_metrics
+from product_stats import ProductColumns, format_statistics
 import sys
+import time
 import traceback
 
 def parse_arguments():
@@ -15,97 +24,308 @@ def parse_arguments():
     
     parser.add_argument("--scrape", action="store_true", help="Web sitesinden veri çekmek için bu seçeneği kullanın")
     parser.add_argument("--import", dest="import_data", action="store_true", help="JSON verilerini veritabanına aktarmak için kullanın")
-    parser.add_argument("--pages", type=int, default=CONFIG['scraping']['max_pages'], help="Taranacak sayfa sayısı")
-    parser.add_argument("--output", type=str, default="petlebi_products.json", help="JSON çıktı dosyası")
-    parser.add_argument("--input", type=str, default="petlebi_products.json", help="İçe aktarılacak JSON dosyası")
+    parser.add_argument("--stats", action="store_true", help="Ürün istatistiklerini (dağılımlar, fiyat yüzdelikleri) hesapla")
+    parser.add_argument("--stats-source", choices=["file", "mysql"], default="file", help="İstatistiklerin okunacağı kaynak (file: --input dosyası)")
+    parser.add_argument("--stats-output", type=str, default=None, help="İstatistiklerin yazılacağı JSON dosyası")
+    parser.add_argument("--top", type=int, default=10, help="İstatistik raporunda listelenecek en sık kategori/marka sayısı")
+    parser.add_argument("--pages", type=int, default=CONFIG['scraping']['max_pages'], help="Sayfalamada taranacak en fazla sayfa (varsayılan: ilk boş sayfaya kadar)")
+    parser.add_argument("--discovery", choices=["auto", "sitemap", "pagination"], default=CONFIG['scraping']['discovery'], help="Ürün URL'lerinin bulunması (auto: sitemap, yoksa sayfalama; --incremental yalnızca pagination ile çalışır)")
+    parser.add_argument("--sitemap-url", type=str, default=CONFIG['scraping']['sitemap_url'], help="Kök sitemap adresi")
+    parser.add_argument("--no-cache", action="store_true", help="Detay sayfaları için HTTP önbelleğini kullanma")
+    parser.add_argument("--workers", type=int, default=CONFIG['scraping']['max_workers'], help="Detay sayfaları için eşzamanlı iş parçacığı sayısı")
+    parser.add_argument("--parser", choices=["lxml", "soup"], default=CONFIG['scraping']['parser'], help="HTML ayrıştırıcı")
+    parser.add_argument("--output", type=str, default=None, help="Çıktı dosyası (varsayılan petlebi_products.json; parquet için petlebi_products_parquet dizini)")
+    parser.add_argument("--sink", choices=["file", "mysql"], default="file", help="Kazınan ürünlerin yazılacağı yer (mysql: doğrudan petlebi tablosuna)")
+    parser.add_argument("--format", choices=["json", "jsonl", "msgpack", "parquet"], default=CONFIG['output']['format'], help="Çıktı biçimi (jsonl: satır başına bir ürün, msgpack: ikili, parquet: --output dizinine bölümlenmiş veri kümesi)")
+    parser.add_argument("--serializer", choices=["auto", "json", "orjson"], default=CONFIG['output']['serializer'], help="JSON kodlayıcı/çözücü (auto: orjson kuruluysa orjson)")
+    parser.add_argument("--compression", choices=["auto", "none", "gzip", "zstd"], default=CONFIG['output']['compression'] or "auto", help="Çıktı sıkıştırması (auto: dosya uzantısından, .gz/.zst; parquet için CONFIG kodeki)")
+    parser.add_argument("--partition-by", choices=["category", "date", "none"], default=CONFIG['parquet']['partition_by'], help="Parquet veri kümesinin bölümlenmesi (date: kazıma günü)")
+    parser.add_argument("--resume", action="store_true", help="Yarım kalan taramaya kaldığı yerden devam et ve çıktıya ekle")
+    parser.add_argument("--checkpoint", type=str, default=None, help="Kaldığı yer kaydının dosyası (varsayılan: <output>.checkpoint)")
+    parser.add_argument("--incremental", action="store_true", help="Yalnızca yeni veya değişen ürünlerin detay sayfalarını indir")
+    parser.add_argument("--previous", type=str, default=None, help="Artımlı tarama için önceki JSON çıktısı (varsayılan: --output)")
+    parser.add_argument("--previous-source", choices=["file", "mysql"], default="file", help="Önceki ürünlerin okunacağı kaynak")
+    parser.add_argument("--input", type=str, default="petlebi_products.json", help="İçe aktarılacak dosya (JSON, JSON Lines veya msgpack; gzip/zstd sıkıştırması kendiliğinden anlaşılır)")
     parser.add_argument("--sql", type=str, default="petlebi_create.sql", help="Çalıştırılacak SQL dosyası")
+    parser.add_argument("--batch-size", type=int, default=CONFIG['database']['batch_size'], help="İçe aktarmada grup başına satır sayısı")
+    parser.add_argument("--load-data", action="store_true", default=CONFIG['database']['use_load_data'], help="İçe aktarmada LOAD DATA LOCAL INFILE kullan")
+    parser.add_argument("--import-workers", type=int, default=CONFIG['database']['import_workers'], help="İçe aktarmada paralel yazıcı bağlantısı sayısı")
+    parser.add_argument("--no-upsert", dest="upsert", action="store_false", default=CONFIG['database']['upsert'], help="Mevcut ürünleri güncellemeden yalnızca ekle")
     parser.add_argument("--db-name", type=str, default=CONFIG['database']['db_name'], help="Veritabanı adı")
     parser.add_argument("--host", type=str, default=CONFIG['database']['host'], help="Veritabanı sunucusu")
     parser.add_argument("--port", type=str, default=CONFIG['database']['port'], help="Veritabanı portu")
     parser.add_argument("--user", type=str, default=CONFIG['database']['user'], help="Veritabanı kullanıcısı")
     parser.add_argument("--password", type=str, default=None, help="Veritabanı şifresi")
+    parser.add_argument("--metrics-file", type=str, default=CONFIG['metrics']['file'], help="Aşama ölçümlerinin yazılacağı dosya (.json: JSON, diğerleri: Prometheus metni)")
+    parser.add_argument("--metrics-port", type=int, default=CONFIG['metrics']['port'], help="Çalışma boyunca ölçümlerin /metrics adresinde sunulacağı port")
+    parser.add_argument("--log-format", choices=["text", "json"], default="json" if CONFIG['logging']['json'] else "text", help="Log biçimi (json: satır başına bir JSON nesnesi)")
     parser.add_argument("--debug", action="store_true", help="Debug modu")
     
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.output is None:
+        # Parquet çıktısı bir dizindir; .json adı taşımasın
+        args.output = "petlebi_products_parquet" if args.format == "parquet" else "petlebi_products.json"
+    return args
+
+def load_previous_index(args, logger):
+    """Artımlı tarama için önceki çalışmanın ürünlerini dosyadan veya petlebi tablosundan yükler"""
+    if args.previous_source == "mysql":
+        db = DatabaseManager()
+        password = args.password if args.password else input("MySQL şifresi: ")
+        if not db.connect(host=args.host, port=args.port, user=args.user, password=password):
+            logger.error("Veritabanı bağlantısı kurulamadı, tam tarama yapılacak.")
+            return None
+        try:
+            if not db.create_database(args.db_name):
+                logger.error(f"Veritabanı seçilemedi: {args.db_name}, tam tarama yapılacak.")
+                return None
+            index = IncrementalIndex(db.iter_products())
+        except Exception as e:
+            logger.error(f"Önceki ürünler veritabanından okunamadı: {e}, tam tarama yapılacak.")
+            return None
+        finally:
+            db.commit_and_close()
+    else:
+        filename = args.previous or args.output
+        try:
+            index = IncrementalIndex.from_json_file(filename)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Önceki çıktı okunamadı ({filename}): {e}. Tam tarama yapılacak.")
+            return None
+    
+    logger.info(f"Artımlı tarama: önceki çalışmadan {len(index)} ürün yüklendi")
+    return index
+
+def replaces_previous(args):
+    """Artımlı taramanın okuduğu önceki çıktı ile yazılacak çıktı aynı dosya/dizin mi"""
+    if not args.incremental or args.previous_source != "file" or args.sink == "mysql":
+        return False
+    return os.path.realpath(args.previous or args.output) == os.path.realpath(args.output)
 
-def scrape_data(args, logger):
+def replace_output(temp_path, path):
+    """Tamamlanan çıktıyı önceki çıktının yerine koyar (Parquet veri kümesi için dizinler değiştirilir)"""
+    if not os.path.isdir(temp_path):
+        os.replace(temp_path, path)
+        return
+    old_path = f"{path}.old"
+    if os.path.isdir(old_path):
+        shutil.rmtree(old_path)
+    if os.path.exists(path):
+        os.replace(path, old_path)
+    os.replace(temp_path, path)
+    if os.path.isdir(old_path):
+        shutil.rmtree(old_path)
+
+def scrape_data(args, logger, metrics=None):
     """Web sitesinden veri çeker"""
-    logger.info(f"Veri çekme işlemi başlatılıyor: {args.pages} sayfa")
+    if args.incremental and args.discovery != "pagination":
+        # Sitemap ürünlerinin liste verisi olmadığından önceki çalışmayla karşılaştırılamazlar
+        logger.warning(f"--incremental liste sayfalarındaki verilerle çalışır, keşif {args.discovery} yerine pagination kullanılıyor")
+        args.discovery = "pagination"
+    logger.info(f"Veri çekme işlemi başlatılıyor: keşif {args.discovery}, en fazla {args.pages or 'sınırsız'} sayfa")
+    
+    previous_index = load_previous_index(args, logger) if args.incremental else None
+    
+    base_url = CONFIG['scraping']['base_url']
+    checkpoint_path = args.checkpoint or f"{args.output}.checkpoint"
+    try:
+        checkpoint, resumed = open_checkpoint(checkpoint_path, base_url, args.resume)
+    except (OSError, ValueError) as e:
+        logger.error(f"Kaldığı yer kaydı okunamadı ({checkpoint_path}): {e}")
+        return False
+    if resumed:
+        logger.info(f"Kaldığı yerden devam ediliyor: {len(checkpoint.completed_pages)} sayfa, "
+                    f"{len(checkpoint.completed_urls)} ürün tamamlanmış")
+    elif args.resume:
+        logger.warning(f"Kaldığı yer kaydı bulunamadı ({checkpoint_path}), tarama baştan başlıyor")
+    
+    scraper = PetlebiScraper(
+        base_url=base_url,
+        max_pages=args.pages,
+        max_workers=args.workers,
+        http_cache=False if args.no_cache else None,
+        previous_index=previous_index,
+        parser=args.parser,
+        keep_products=False,  # Ürünler kazındıkça dosyaya yazılır, bellekte tutulmaz
+        checkpoint=checkpoint,
+        discovery=args.discovery,
+        sitemap_url=args.sitemap_url,
+        metrics=metrics
+    )
+    
+    db = None
+    temp_output = None
+    if args.sink == "mysql":
+        # Ürünler ara JSON dosyası olmadan arka planda gruplar halinde tabloya yazılır
+        db = open_database(args, logger, metrics)
+        if db is None:
+            return False
+        sink = DatabaseWriter(db, batch_size=args.batch_size, use_load_data=args.load_data, upsert=args.upsert)
+        target = f"{args.db_name}.petlebi tablosuna"
+    else:
+        options = {"serializer": args.serializer, "compression": args.compression}
+        if args.format == "parquet":
+            options["partition_by"] = args.partition_by
+        # Önceki çıktı artımlı taramada okunurken üzerine yazılmaz: ürünler geçici dosyaya
+        # yazılır, tarama tamamlanınca yerine konur (çöken çalışma --resume ile bu dosyaya devam eder)
+        if replaces_previous(args):
+            temp_output = f"{args.output}.tmp"
+            if args.format != "parquet":
+                # Sıkıştırma geçici dosyanın değil asıl çıktının uzantısından seçilir
+                options["compression"] = resolve_compression(args.output, args.compression)
+        sink = open_writer(temp_output or args.output, args.format, append=resumed, **options)
+        target = f"{args.output} dosyasına"
+    
+    scraper.add_sink(sink)
+    try:
+        scraper.scrape_all_pages()
+    finally:
+        sink.close()
+        if db is not None:
+            db.commit_and_close()
     
-    scraper = PetlebiScraper(base_url=CONFIG['scraping']['base_url'], max_pages=args.pages)
-    products = scraper.scrape_all_pages()
+    if temp_output:
+        if os.path.exists(checkpoint_path):
+            # Tarama tamamlanmadı (kayıt silinmedi); önceki çıktı korunur
+            logger.warning(f"Tarama tamamlanmadı, {args.output} değiştirilmedi; "
+                           f"--resume ile tamamlanınca güncellenecek")
+            target = f"{temp_output} dosyasına"
+        else:
+            replace_output(temp_output, args.output)
     
-    if products:
-        scraper.save_to_json(args.output)
-        logger.info(f"{len(products)} ürün {args.output} dosyasına kaydedildi")
+    if sink.count or resumed:
+        logger.info(f"{sink.count} ürün {target} kaydedildi")
         return True
     else:
         logger.error("Veri çekme işlemi başarısız oldu")
         return False
 
-def import_to_database(args, logger):
-    """JSON verilerini veritabanına aktarır"""
-    logger.info("Veritabanı işlemleri başlatılıyor")
-    
+def open_database(args, logger, metrics=None):
+    """Veritabanına bağlanır, veritabanını oluşturur ve SQL dosyasını çalıştırır (hata olursa None)"""
     # Veritabanı yöneticisini başlat
-    db = DatabaseManager()
+    db = DatabaseManager(metrics=metrics)
     
     # Kullanıcı şifresi
     password = args.password if args.password else input("MySQL şifresi: ")
     
     # Veritabanına bağlan
-    if not db.connect(host=args.host, port=args.port, user=args.user, password=password):
+    if not db.connect(host=args.host, port=args.port, user=args.user, password=password,
+                      allow_local_infile=args.load_data):
         logger.error("Veritabanı bağlantısı kurulamadı.")
-        return False
+        return None
     
     # Veritabanını oluştur
     if not db.create_database(args.db_name):
         logger.error(f"Veritabanı oluşturulamadı: {args.db_name}")
-        return False
+        return None
     
     # SQL dosyasını çalıştır
     if not db.run_sql_file(args.sql):
         logger.error(f"SQL dosyası çalıştırılamadı: {args.sql}")
+        return None
+    
+    return db
+
+def import_to_database(args, logger, metrics=None):
+    """JSON verilerini veritabanına aktarır"""
+    logger.info("Veritabanı işlemleri başlatılıyor")
+    
+    db = open_database(args, logger, metrics)
+    if db is None:
         return False
     
     # JSON'dan veri aktar
     logger.info(f"{args.input} dosyasından veriler içe aktarılıyor...")
-    if not db.import_products_from_json(args.input):
+    if not db.import_products_from_json(args.input, serializer=args.serializer, batch_size=args.batch_size,
+                                       use_load_data=args.load_data, upsert=args.upsert,
+                                       workers=args.import_workers):
         logger.error("Ürünler veritabanına aktarılamadı")
         db.commit_and_close()
         return False
     
     # Bağlantıyı kapat
     db.commit_and_close()
+    if metrics is not None and CONFIG['metrics']['summary']:
+        logger.info(f"Aşama ölçümleri:\n{metrics.summary_table()}")
     logger.info("Veritabanı işlemleri tamamlandı")
     return True
 
+def show_statistics(args, logger):
+    """Ürünleri dosyadan veya petlebi tablosundan sütunlara yükleyip istatistiklerini raporlar"""
+    start = time.perf_counter()
+    if args.stats_source == "mysql":
+        db = DatabaseManager()
+        password = args.password if args.password else input("MySQL şifresi: ")
+        if not db.connect(host=args.host, port=args.port, user=args.user, password=password):
+            logger.error("Veritabanı bağlantısı kurulamadı.")
+            return False
+        try:
+            if not db.create_database(args.db_name):
+                logger.error(f"Veritabanı seçilemedi: {args.db_name}")
+                return False
+            columns = ProductColumns.from_database(db)
+        except Exception as e:
+            logger.error(f"Ürünler veritabanından okunamadı: {e}")
+            return False
+        finally:
+            db.commit_and_close()
+    else:
+        try:
+            columns = ProductColumns.from_file(args.input, serializer=args.serializer)
+        except (OSError, ValueError) as e:
+            logger.error(f"Ürünler okunamadı ({args.input}): {e}")
+            return False
+    loaded = time.perf_counter()
+    
+    stats = columns.statistics()
+    logger.info(f"{len(columns)} ürün {loaded - start:.2f} sn'de yüklendi, "
+                f"istatistikler {time.perf_counter() - loaded:.3f} sn'de hesaplandı\n{format_statistics(stats, args.top)}")
+    
+    if args.stats_output:
+        with open(args.stats_output, 'w', encoding='utf-8') as f:
+            json.dump(stats, f, ensure_ascii=False, indent=2)
+        logger.info(f"İstatistikler {args.stats_output} dosyasına kaydedildi")
+    return True
+
 def main():
     # Argümanları işle
     args = parse_arguments()
     
     # Logger'ı başlat
-    logger = Logger(log_level=logging.DEBUG if args.debug else logging.INFO)
+    logger = Logger(log_level=logging.DEBUG if args.debug else logging.INFO, json_format=args.log_format == "json")
     
     try:
-        if not args.scrape and not args.import_data:
-            logger.info("Bir işlem belirtmediniz. --scrape veya --import seçeneğini kullanın.")
+        if not args.scrape and not args.import_data and not args.stats:
+            logger.info("Bir işlem belirtmediniz. --scrape, --import veya --stats seçeneğini kullanın.")
             print("\nKullanım örnekleri:")
             print("  python main.py --scrape --pages 10 --output products.json")
+            print("  python main.py --scrape --incremental --output products.json")
+            print("  python main.py --scrape --sink mysql --db-name petlebidb")
             print("  python main.py --import --input products.json --db-name petlebidb")
+            print("  python main.py --stats --input products.jsonl")
             return
         
-        # Veri çekme
-        if args.scrape:
-            if not scrape_data(args, logger):
-                logger.error("Veri çekme işlemi başarısız oldu")
-                return
-        
-        # Veritabanına aktarma
-        if args.import_data:
-            if not import_to_database(args, logger):
-                logger.error("Veritabanı işlemleri başarısız oldu")
-                return
+        metrics = start_metrics(args.metrics_port, logger)
+        try:
+            # Veri çekme
+            if args.scrape:
+                if not scrape_data(args, logger, metrics):
+                    logger.error("Veri çekme işlemi başarısız oldu")
+                    return
+            
+            # Veritabanına aktarma
+            if args.import_data:
+                if not import_to_database(args, logger, metrics):
+                    logger.error("Veritabanı işlemleri başarısız oldu")
+                    return
+            
+            # İstatistikler
+            if args.stats:
+                if not show_statistics(args, logger):
+                    logger.error("İstatistikler hesaplanamadı")
+                    return
+        finally:
+            finish_metrics(metrics, args.metrics_file, logger)
         
         logger.info("İşlem başarıyla tamamlandı!")
         
@@ -118,48 +338,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
-# Ayrıca asenkron versiyonunun nasıl kullanılacağını gösterelim
-# async_main.py - Asenkron sürüm için ana program
-import asyncio
-import argparse
-import logging
-from config import CONFIG
-from logger import Logger
-from async_scraper import AsyncPetlebiScraper
-from database import DatabaseManager
-
-async def main_async():
-    # Argümanları işle
-    parser = argparse.ArgumentParser(description="Petlebi Asenkron Veri Kazıma Aracı")
-    parser.add_argument("--pages", type=int, default=10, help="Taranacak sayfa sayısı")
-    parser.add_argument("--output", type=str, default="petlebi_products_async.json", help="JSON çıktı dosyası")
-    parser.add_argument("--concurrency", type=int, default=5, help="Eşzamanlı istek sayısı")
-    parser.add_argument("--debug", action="store_true", help="Debug modu")
-    args = parser.parse_args()
-    
-    # Logger'ı başlat
-    logger = Logger(log_level=logging.DEBUG if args.debug else logging.INFO)
-    logger.info(f"Asenkron veri çekme işlemi başlatılıyor: {args.pages} sayfa, {args.concurrency} eşzamanlı istek")
-    
-    try:
-        # Asenkron scraper'ı oluştur ve çalıştır
-        scraper = AsyncPetlebiScraper(
-            base_url=CONFIG['scraping']['base_url'],
-            max_pages=args.pages,
-            concurrency_limit=args.concurrency
-        )
-        
-        await scraper.run_and_save(args.output)
-        logger.info(f"Asenkron veri çekme işlemi tamamlandı, çıktı: {args.output}")
-        
-    except KeyboardInterrupt:
-        logger.warning("İşlem kullanıcı tarafından iptal edildi.")
-    except Exception as e:
-        logger.critical(f"Beklenmeyen hata: {e}")
-        if args.debug:
-            import traceback
-            logger.debug(traceback.format_exc())
-
-if __name__ == "__main__":
-    asyncio.run(main_async())
\ No newline at end of file
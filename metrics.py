@@ -0,0 +1,333 @@
+# metrics.py - Aşama bazında sayaç ve histogram ölçümleri
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from config import CONFIG
+
+# Süre ölçümlerinin kova sınırları (saniye)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Yanıt boyutlarının kova sınırları (bayt)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+# Kuyruk derinliği gibi adet ölçümlerinin kova sınırları
+DEPTH_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+# Bilinen metrikler: ad -> (birim, açıklama, kova sınırları); sayaçlarda kova yoktur
+DEFINITIONS = {
+    "fetch_seconds": ("seconds", "Yeniden denemeler dahil sayfa indirme süresi", LATENCY_BUCKETS),
+    "http_request_seconds": ("seconds", "Tek bir HTTP isteğinin ağ süresi", LATENCY_BUCKETS),
+    "rate_limit_wait_seconds": ("seconds", "İstek öncesi hız sınırlayıcıda beklenen süre", LATENCY_BUCKETS),
+    "response_bytes": ("bytes", "İndirilen yanıt gövdesinin boyutu", SIZE_BUCKETS),
+    "parse_seconds": ("seconds", "HTML ayrıştırma süresi", LATENCY_BUCKETS),
+    "queue_depth": ("count", "Ekleme anında kuyruktaki iş sayısı", DEPTH_BUCKETS),
+    "sink_write_seconds": ("seconds", "Ürünün çıktılara (dosya, veritabanı kuyruğu) yazılma süresi", LATENCY_BUCKETS),
+    "db_batch_seconds": ("seconds", "Bir grubun veritabanına yazılma süresi", LATENCY_BUCKETS),
+    "http_responses": ("count", "Durum koduna göre HTTP yanıtları (error: bağlantı hatası)", None),
+    "validation_failures": ("count", "Eksik ya da geçersiz alan yüzünden atılan ürünler", None),
+    "retries": ("count", "Hata türüne göre yeniden denemeler", None),
+    "retries_exhausted": ("count", "Deneme hakkı bittiği için vazgeçilen istekler", None),
+    "retry_budget_denied": ("count", "Genel bütçe dolduğu için yapılmayan yeniden denemeler", None),
+    "db_rows": ("count", "Sonuca göre veritabanı satırları", None)
+}
+
+def _label_key(labels):
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+def _format_labels(label_key, extra=()):
+    pairs = label_key + tuple(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in pairs) + "}"
+
+def _format_value(value, unit):
+    """Değeri birimine uygun okunur biçimde döndürür"""
+    if value is None:
+        return "-"
+    if unit == "seconds":
+        return f"{value * 1000:.1f} ms" if value < 1 else f"{value:.2f} sn"
+    if unit == "bytes":
+        for suffix, size in (("MB", 1024 * 1024), ("KB", 1024)):
+            if value >= size:
+                return f"{value / size:.1f} {suffix}"
+        return f"{value:.0f} B"
+    return f"{value:.0f}" if float(value).is_integer() else f"{value:.1f}"
+
+class Counter:
+    """Yalnızca artan sayaç"""
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def to_dict(self):
+        return {"name": self.name, "type": "counter", "labels": dict(self.labels), "value": self.value}
+
+class Histogram:
+    """Gözlemleri sabit kovalarda sayan histogram
+
+    Bellek kullanımı gözlem sayısından bağımsızdır. Yüzdelikler kova
+    sınırları arasında doğrusal aradeğerlemeyle (Prometheus'un
+    histogram_quantile'ı gibi) tahmin edilir; en küçük ve en büyük gözlem
+    ayrıca tutulduğu için uç kovalar da bu değerlerle daraltılır.
+    """
+
+    def __init__(self, name, labels, buckets):
+        self.name = name
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * (len(self.buckets) + 1)  # Son kova: +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.bucket_counts[index] += 1
+            self.count += 1
+            self.sum += value
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+
+    @contextmanager
+    def time(self):
+        """with bloğunun süresini saniye olarak gözlemler"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def quantile(self, fraction):
+        """Yaklaşık yüzdeliği döndürür (gözlem yoksa None)"""
+        with self._lock:
+            if not self.count:
+                return None
+            rank = fraction * self.count
+            cumulative = 0
+            for index, bucket_count in enumerate(self.bucket_counts):
+                if bucket_count and cumulative + bucket_count >= rank:
+                    lower = self.buckets[index - 1] if index > 0 else self.min
+                    upper = self.buckets[index] if index < len(self.buckets) else self.max
+                    lower, upper = max(lower, self.min), min(upper, self.max)
+                    return lower + (upper - lower) * (rank - cumulative) / bucket_count
+                cumulative += bucket_count
+            return self.max
+
+    def to_dict(self):
+        with self._lock:
+            state = {
+                "name": self.name, "type": "histogram", "labels": dict(self.labels),
+                "count": self.count, "sum": self.sum, "min": self.min, "max": self.max,
+                "buckets": dict(zip([str(bound) for bound in self.buckets] + ["+Inf"], self.bucket_counts))
+            }
+        for label, fraction in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99)):
+            state[label] = self.quantile(fraction)
+        return state
+
+class Metrics:
+    """Bir çalışmanın sayaç ve histogramlarını tutan, iş parçacığı güvenli kayıt
+
+    Metrikler ad ve etiketlerle (ör. stage="detail") ilk kullanımda
+    oluşturulur; birim, açıklama ve kova sınırları DEFINITIONS'tan alınır.
+    Çalışma sonunda summary_table() ile okunur tablo, write_file() ile JSON
+    ya da Prometheus metin dosyası üretilir; serve() çalışma boyunca
+    /metrics adresinde Prometheus metin biçimini sunar.
+    """
+
+    PREFIX = "petlebi_"
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self._server = None
+
+    def _get(self, kind, name, labels):
+        key = (name, _label_key(labels))
+        metric = self._metrics.get(key)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(key)
+                if metric is None:
+                    if kind is Histogram:
+                        buckets = DEFINITIONS.get(name, (None, None, None))[2] or LATENCY_BUCKETS
+                        metric = Histogram(name, key[1], buckets)
+                    else:
+                        metric = Counter(name, key[1])
+                    self._metrics[key] = metric
+        if not isinstance(metric, kind):
+            raise TypeError(f"{name} metriği {type(metric).__name__} olarak tanımlı")
+        return metric
+
+    def counter(self, name, **labels):
+        return self._get(Counter, name, labels)
+
+    def histogram(self, name, **labels):
+        return self._get(Histogram, name, labels)
+
+    def inc(self, name, amount=1, **labels):
+        """Sayacı artırır"""
+        self.counter(name, **labels).inc(amount)
+
+    def observe(self, name, value, **labels):
+        """Histograma bir gözlem ekler"""
+        self.histogram(name, **labels).observe(value)
+
+    def timer(self, name, **labels):
+        """with bloğunun süresini histograma ekleyen bağlam yöneticisi döndürür"""
+        return self.histogram(name, **labels).time()
+
+    def _sorted_metrics(self):
+        with self._lock:
+            return [self._metrics[key] for key in sorted(self._metrics)]
+
+    def to_dict(self):
+        return {"created_at": time.time(), "metrics": [metric.to_dict() for metric in self._sorted_metrics()]}
+
+    def summary_table(self):
+        """Histogramları (adet, toplam, ortalama, p50/p95/p99, en büyük) ve sayaçları tablo olarak döndürür"""
+        metrics = self._sorted_metrics()
+        histograms = [metric for metric in metrics if isinstance(metric, Histogram) and metric.count]
+        counters = [metric for metric in metrics if isinstance(metric, Counter) and metric.value]
+        if not histograms and not counters:
+            return "Ölçüm yok"
+
+        rows = []
+        if histograms:
+            rows.append(("Metrik", "Adet", "Toplam", "Ortalama", "p50", "p95", "p99", "En büyük"))
+            for metric in histograms:
+                unit = DEFINITIONS.get(metric.name, ("seconds",))[0]
+                rows.append((
+                    metric.name + _format_labels(metric.labels), str(metric.count),
+                    # Kuyruk derinliği gibi adet ölçümlerinin toplamı anlamsızdır
+                    _format_value(metric.sum if unit != "count" else None, unit),
+                    _format_value(metric.sum / metric.count, unit),
+                    _format_value(metric.quantile(0.50), unit), _format_value(metric.quantile(0.95), unit),
+                    _format_value(metric.quantile(0.99), unit), _format_value(metric.max, unit)
+                ))
+        widths = [max(len(row[column]) for row in rows) for column in range(8)] if rows else [0]
+        lines = [
+            "  ".join(cell.ljust(widths[0]) if column == 0 else cell.rjust(widths[column])
+                      for column, cell in enumerate(row))
+            for row in rows
+        ]
+        if counters:
+            if lines:
+                lines.append("")
+            names = [metric.name + _format_labels(metric.labels) for metric in counters]
+            name_width = max(len(name) for name in names)
+            lines.append(f"{'Sayaç'.ljust(name_width)}  Değer")
+            lines.extend(f"{name.ljust(name_width)}  {metric.value}" for name, metric in zip(names, counters))
+        return "\n".join(lines)
+
+    def to_prometheus(self):
+        """Metrikleri Prometheus metin biçiminde (exposition format 0.0.4) döndürür"""
+        lines = []
+        described = set()
+        for metric in self._sorted_metrics():
+            name = self.PREFIX + metric.name
+            if isinstance(metric, Counter):
+                name += "_total"
+            if name not in described:
+                described.add(name)
+                lines.append(f"# HELP {name} {DEFINITIONS.get(metric.name, (None, metric.name))[1]}")
+                lines.append(f"# TYPE {name} {'counter' if isinstance(metric, Counter) else 'histogram'}")
+            if isinstance(metric, Counter):
+                lines.append(f"{name}{_format_labels(metric.labels)} {metric.value}")
+                continue
+            state = metric.to_dict()
+            cumulative = 0
+            for bound, bucket_count in state["buckets"].items():
+                cumulative += bucket_count
+                lines.append(f"{name}_bucket{_format_labels(metric.labels, (('le', bound),))} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(metric.labels)} {state['sum']}")
+            lines.append(f"{name}_count{_format_labels(metric.labels)} {state['count']}")
+        return "\n".join(lines) + "\n"
+
+    def write_file(self, path):
+        """Metrikleri dosyaya yazar: .json uzantısında JSON, diğerlerinde Prometheus metni
+
+        Prometheus metni node_exporter'ın textfile toplayıcısıyla okunabilir.
+        Dosya geçici dosyaya yazılıp os.replace ile değiştirilir; okuyan taraf
+        yarım dosya görmez.
+        """
+        if path.endswith(".json"):
+            content = json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+        else:
+            content = self.to_prometheus()
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as metrics_file:
+            metrics_file.write(content)
+        os.replace(temp_path, path)
+
+    def serve(self, port, host=None):
+        """/metrics adresinde Prometheus metnini sunan HTTP sunucusunu arka planda başlatır"""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.to_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._server = ThreadingHTTPServer((host or CONFIG['metrics']['host'], port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="metrik-sunucu", daemon=True).start()
+        return self._server.server_address
+
+    def close(self):
+        """Metrik sunucusunu durdurur"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+def start_metrics(port=None, logger=None):
+    """Ölçüm kaydını oluşturur; port verildiyse /metrics sunucusunu başlatır"""
+    metrics = Metrics()
+    if port:
+        try:
+            host, bound_port = metrics.serve(port)
+            if logger:
+                logger.info(f"Ölçümler http://{host}:{bound_port}/metrics adresinde sunuluyor")
+        except OSError as e:
+            if logger:
+                logger.error(f"Ölçüm sunucusu başlatılamadı (port {port}): {e}")
+    return metrics
+
+def finish_metrics(metrics, path=None, logger=None):
+    """path verildiyse ölçümleri dosyaya yazar ve /metrics sunucusunu durdurur"""
+    if path:
+        try:
+            metrics.write_file(path)
+            if logger:
+                logger.info(f"Ölçümler {path} dosyasına yazıldı")
+        except OSError as e:
+            if logger:
+                logger.error(f"Ölçüm dosyası yazılamadı ({path}): {e}")
+    metrics.close()
@@ -0,0 +1,148 @@
+# product.py - Bellekte sıkıştırılmış ürün kaydı
+import json
+import math
+from sys import intern
+from collections.abc import Mapping
+from json.encoder import encode_basestring
+from operator import attrgetter
+
+# Ürün alanları; JSON çıktısındaki anahtar sırası da budur
+PRODUCT_FIELDS = ("url", "name", "price", "stock", "category", "id", "brand", "sku",
+                  "barcode", "description", "image")
+_FIELD_SET = frozenset(PRODUCT_FIELDS)
+
+# Az sayıda farklı değeri olan alanlar: aynı metin tüm ürünlerde tek nesne olarak paylaşılır
+INTERNED_FIELDS = ("stock", "category", "brand")
+
+def parse_price(value):
+    """Fiyatı float'a çevirir; geçersizse NaN döndürür"""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return math.nan
+
+_field_values = attrgetter(*PRODUCT_FIELDS)
+
+def _intern(value):
+    return intern(value) if type(value) is str else value
+
+class _NestedValue(Exception):
+    """Değer liste/sözlük gibi iç içe bir yapı: şablon yerine json.dumps kullanılır"""
+
+def _json_value(value):
+    """Tek bir düz değeri json.dumps(..., ensure_ascii=False) ile aynı biçimde kodlar"""
+    value_type = type(value)
+    if value_type is str:
+        return encode_basestring(value)
+    if value_type is float:
+        if value != value:
+            return 'NaN'
+        if value in (math.inf, -math.inf):
+            return 'Infinity' if value > 0 else '-Infinity'
+        return float.__repr__(value)
+    if value_type is int:
+        return int.__repr__(value)
+    if value is None or value_type is bool:
+        return json.dumps(value)
+    raise _NestedValue
+
+class Product(Mapping):
+    """Tek bir ürünün sabit alanlı kaydı
+
+    __slots__ sayesinde ürün başına sözlük tutulmaz; stok, kategori ve marka
+    metinleri sys.intern ile paylaşılır, fiyat bir kez float'a çevrilir
+    (geçersizse NaN). Eski sözlük tabanlı kodla uyum için salt okunur Mapping
+    arayüzü (get, [], keys, items) ve update() desteklenir; dosyaya
+    to_dict() ya da to_json() ile yazılır.
+    """
+
+    __slots__ = PRODUCT_FIELDS
+
+    def __init__(self, url="", name="", price=math.nan, stock="", category="", id="", brand="", sku="",
+                 barcode="", description="", image=""):
+        self.url = url
+        self.name = name
+        self.price = price if type(price) is float else parse_price(price)
+        self.stock = intern(stock) if type(stock) is str else stock
+        self.category = intern(category) if type(category) is str else category
+        self.id = id
+        self.brand = intern(brand) if type(brand) is str else brand
+        self.sku = sku
+        self.barcode = barcode
+        self.description = description
+        self.image = image
+
+    @classmethod
+    def from_dict(cls, data):
+        """Sözlükten (ör. JSON satırı ya da veritabanı satırı) ürün oluşturur; bilinmeyen anahtarlar atılır"""
+        if isinstance(data, cls):
+            return data
+        if not isinstance(data, Mapping):
+            raise TypeError(f"ürün sözlük olmalı: {type(data).__name__}")
+        try:
+            return cls(**data)
+        except TypeError:
+            # Sözlükte Product alanı olmayan anahtarlar var
+            return cls(**{key: value for key, value in data.items() if key in _FIELD_SET})
+
+    def update(self, values):
+        """Sözlükteki alanları (ör. detay sayfasından gelen barkod/açıklama/resim) ürüne yazar"""
+        for key, value in values.items():
+            self[key] = value
+
+    def __setitem__(self, key, value):
+        if key not in _FIELD_SET:
+            raise KeyError(key)
+        if key == "price":
+            value = parse_price(value)
+        elif key in INTERNED_FIELDS:
+            value = _intern(value)
+        setattr(self, key, value)
+
+    def __getitem__(self, key):
+        if key not in _FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in _FIELD_SET else default
+
+    def __contains__(self, key):
+        return key in _FIELD_SET
+
+    def __iter__(self):
+        return iter(PRODUCT_FIELDS)
+
+    def __len__(self):
+        return len(PRODUCT_FIELDS)
+
+    def to_dict(self):
+        """Alanları PRODUCT_FIELDS sırasıyla sözlük olarak döndürür"""
+        return dict(zip(PRODUCT_FIELDS, _field_values(self)))
+
+    def to_json(self, indent=None):
+        """json.dumps(self.to_dict(), ensure_ascii=False, indent=indent) ile aynı metni üretir
+
+        Değerler tek tek C kodlayıcısıyla kodlanıp önceden hazırlanmış şablona
+        yerleştirilir; ara sözlük oluşturulmaz. Yalnızca indent None veya 2 için
+        şablon vardır, diğer durumlarda json.dumps kullanılır.
+        """
+        template = _JSON_TEMPLATES.get(indent)
+        if template is not None:
+            try:
+                return template % tuple(map(_json_value, _field_values(self)))
+            except _NestedValue:
+                pass
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=indent)
+
+    def __repr__(self):
+        return f"Product({self.to_dict()!r})"
+
+_JSON_TEMPLATES = {
+    None: "{" + ", ".join(f'"{field}": %s' for field in PRODUCT_FIELDS) + "}",
+    2: "{\n" + ",\n".join(f'  "{field}": %s' for field in PRODUCT_FIELDS) + "\n}"
+}
+
+def as_product(product):
+    """Sözlüğü Product'a çevirir (zaten Product ise aynısını döndürür)"""
+    return product if isinstance(product, Product) else Product.from_dict(product)
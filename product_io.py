@@ -0,0 +1,376 @@
+# product_io.py - Ürünleri bellekte biriktirmeden yazan/okuyan akış yardımcıları
+import gzip
+import io
+import json
+import os
+from config import CONFIG
+from product import Product
+from product_parquet import ParquetDatasetWriter, iter_dataset
+
+try:
+    import orjson  # Opsiyonel: C ile yazılmış hızlı JSON kodlayıcı/çözücü
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack  # Opsiyonel: ikili "msgpack" çıktı biçimi
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard  # Opsiyonel: zstd sıkıştırma
+except ImportError:
+    zstandard = None
+
+# Akış okuyucunun dosyadan tek seferde okuduğu karakter sayısı
+READ_CHUNK_SIZE = 64 * 1024
+
+# Devam ederken yarım kalan son kaydı bulmak için dosya sonundan okunan bayt sayısı
+_TAIL_BYTES = 1024 * 1024
+
+# Sıkıştırılmış dosyaların ilk baytları (okurken biçim bunlardan anlaşılır)
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Dosya uzantısından çıkarılan sıkıştırma
+_COMPRESSION_SUFFIXES = {".gz": "gzip", ".gzip": "gzip", ".zst": "zstd", ".zstd": "zstd"}
+
+COMPRESSIONS = ("none", "gzip", "zstd")
+
+def _encode(product, indent=None):
+    """Product kaydı şablonla, sözlük json.dumps ile kodlanır (çıktı metni aynıdır)"""
+    if isinstance(product, Product):
+        return product.to_json(indent)
+    return json.dumps(product, ensure_ascii=False, indent=indent)
+
+def _to_dict(value):
+    """orjson/msgpack'in tanımadığı Product kayıtlarını sözlüğe çevirir"""
+    if isinstance(value, Product):
+        return value.to_dict()
+    raise TypeError(f"Kodlanamayan değer: {type(value).__name__}")
+
+class JsonSerializer:
+    """Standart kütüphane json'u (Product kayıtları şablonla kodlanır)"""
+
+    name = "json"
+
+    def dumps(self, product, indent=None):
+        return _encode(product, indent).encode("utf-8")
+
+    def loads(self, data):
+        return json.loads(data)
+
+class OrjsonSerializer:
+    """orjson: json'dan birkaç kat hızlı; satırlar boşluksuz (kompakt) yazılır"""
+
+    name = "orjson"
+
+    def dumps(self, product, indent=None):
+        return orjson.dumps(product, default=_to_dict, option=orjson.OPT_INDENT_2 if indent else 0)
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+class MsgpackSerializer:
+    """msgpack: ikili, JSON'dan küçük ve hızlı çözülen kayıtlar"""
+
+    name = "msgpack"
+
+    def dumps(self, product, indent=None):
+        return msgpack.packb(product, default=_to_dict)
+
+    def loads(self, data):
+        return msgpack.unpackb(data, raw=False)
+
+SERIALIZERS = {
+    JsonSerializer.name: (JsonSerializer, lambda: True),
+    OrjsonSerializer.name: (OrjsonSerializer, lambda: orjson is not None),
+    MsgpackSerializer.name: (MsgpackSerializer, lambda: msgpack is not None)
+}
+
+def get_serializer(name=None):
+    """Adı verilen kodlayıcıyı döndürür ("auto": orjson kuruluysa orjson, değilse json)"""
+    name = name or CONFIG['output']['serializer']
+    if name == "auto":
+        name = OrjsonSerializer.name if orjson is not None else JsonSerializer.name
+    if name not in SERIALIZERS:
+        raise ValueError(f"Bilinmeyen kodlayıcı: {name} (seçenekler: auto, {', '.join(SERIALIZERS)})")
+    serializer_class, available = SERIALIZERS[name]
+    if not available():
+        raise ValueError(f"{name} kodlayıcısı için '{name}' paketi kurulu değil (pip install {name})")
+    return serializer_class()
+
+def resolve_compression(filename, compression=None):
+    """Sıkıştırmayı seçer: verilmediyse CONFIG, o da yoksa dosya uzantısı (.gz, .zst)"""
+    compression = compression or CONFIG['output']['compression']
+    if compression in (None, "auto"):
+        compression = _COMPRESSION_SUFFIXES.get(os.path.splitext(filename)[1].lower(), "none")
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Bilinmeyen sıkıştırma: {compression} (seçenekler: {', '.join(COMPRESSIONS)})")
+    if compression == "zstd" and zstandard is None:
+        raise ValueError("zstd sıkıştırması için 'zstandard' paketi kurulu değil (pip install zstandard)")
+    return compression
+
+def _open_output(filename, mode, compression):
+    """Çıktı dosyasını ikili modda (gerekirse sıkıştırarak) açar"""
+    if compression == "gzip":
+        return gzip.open(filename, mode, compresslevel=CONFIG['output']['gzip_level'])
+    if compression == "zstd":
+        compressor = zstandard.ZstdCompressor(level=CONFIG['output']['zstd_level'])
+        return compressor.stream_writer(open(filename, mode))
+    return open(filename, mode)
+
+def _read_tail(handle):
+    """Dosyanın son _TAIL_BYTES baytını ve bu parçanın başladığı konumu döndürür"""
+    size = handle.seek(0, os.SEEK_END)
+    start = max(0, size - _TAIL_BYTES)
+    handle.seek(start)
+    return start, handle.read()
+
+class JsonLinesWriter:
+    """Her ürünü bir satırlık JSON (NDJSON) olarak dosyaya ekler
+
+    Ürünler kazındıkça yazılır; flush_every üründe bir dosya tamponu
+    boşaltılır. Çalışma yarıda kesilse bile o ana kadar yazılan satırlar
+    geçerli kalır. Kodlayıcı (json/orjson) ve sıkıştırma (gzip/zstd)
+    seçilebilir; sıkıştırılmış akışta flush blok sınırına kadar yazar.
+    """
+
+    format = "jsonl"
+
+    def __init__(self, filename, flush_every=None, append=False, serializer=None, compression=None):
+        """Yazıcıyı aç
+
+        Args:
+            filename: Çıktı dosyası
+            flush_every: Kaç üründe bir tamponun diske boşaltılacağı (varsayılan CONFIG)
+            append: Mevcut dosyanın sonuna ekle (False ise dosya sıfırlanır)
+            serializer: Kodlayıcı adı ("json", "orjson", "auto"; varsayılan CONFIG)
+            compression: "none", "gzip" veya "zstd" (varsayılan: dosya uzantısından)
+        """
+        self.filename = filename
+        self.flush_every = flush_every or CONFIG['output']['flush_every']
+        self.serializer = self._get_serializer(serializer)
+        self.compression = resolve_compression(filename, compression)
+        self.count = 0
+        exists = append and os.path.exists(filename) and os.path.getsize(filename) > 0
+        if exists and self.compression != "none":
+            # Sıkıştırılmış akışın yarım kalan sonu güvenle kesilemez
+            raise ValueError(f"Sıkıştırılmış çıktıya devam edilemez: {filename}")
+        # Dosyada önceki bir çalışmadan kalan kayıt var mı?
+        self._has_records = self._prepare_append() if exists else False
+        self._file = _open_output(filename, "ab" if append else "wb", self.compression)
+
+    def _get_serializer(self, name):
+        return get_serializer(name)
+
+    def _prepare_append(self):
+        """Çöken bir çalışmanın yarım bıraktığı son satırı siler; kayıt varsa True döndürür"""
+        with open(self.filename, "rb+") as handle:
+            start, tail = _read_tail(handle)
+            if tail and not tail.endswith(b"\n"):
+                handle.truncate(start + tail.rfind(b"\n") + 1)
+            return handle.seek(0, os.SEEK_END) > 0
+
+    def write(self, product):
+        """Ürünü dosyaya yazar"""
+        self._write_record(product)
+        self._has_records = True
+        self.count += 1
+        if self.count % self.flush_every == 0:
+            self.flush()
+
+    def _write_record(self, product):
+        self._file.write(self.serializer.dumps(product) + b"\n")
+
+    def flush(self):
+        """Tamponu dosyaya boşaltır"""
+        self._file.flush()
+
+    def close(self):
+        """Kalan verileri yazar ve dosyayı kapatır"""
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class JsonArrayWriter(JsonLinesWriter):
+    """Ürünleri json.dump(..., indent=2) ile aynı biçimde JSON dizisi olarak yazar
+
+    Dizi, ürünler geldikçe parça parça yazılır ve close() ile kapatılır;
+    böylece eski araçlarla uyumlu çıktı da bellekte liste tutmadan üretilir.
+    Eklemeli açıldığında mevcut dizinin kapanışı kaldırılır ve dizi sürdürülür.
+    """
+
+    format = "json"
+
+    def __init__(self, filename, flush_every=None, append=False, serializer=None, compression=None):
+        self._array_open = False
+        super().__init__(filename, flush_every=flush_every, append=append,
+                         serializer=serializer, compression=compression)
+        if not self._array_open:
+            self._file.write(b"[")
+
+    def _prepare_append(self):
+        """Dizinin kapanışını (ya da yarım kalan son kaydı) keser; kayıt varsa True döndürür"""
+        with open(self.filename, "rb+") as handle:
+            start, tail = _read_tail(handle)
+            stripped = tail.rstrip()
+            if not stripped:
+                return False
+            if stripped.endswith(b"]"):
+                # Düzgün kapanmış dizi: yalnızca ']' kaldırılır
+                body = stripped[:-1].rstrip()
+            else:
+                # Çöken çalışma: son tam kayıttan sonrası atılır
+                end = tail.rfind(b"\n  }")
+                body = tail[:end + 4] if end >= 0 else tail[:tail.find(b"[") + 1]
+            handle.truncate(start + len(body))
+            self._array_open = True
+            return not body.endswith(b"[")
+
+    def _write_record(self, product):
+        # indent=2 ile yazılan listenin içindeki öğeler iki boşluk daha girintilidir
+        record = self.serializer.dumps(product, indent=2).replace(b"\n", b"\n  ")
+        self._file.write((b"," if self._has_records else b"") + b"\n  " + record)
+
+    def close(self):
+        """Diziyi kapatır ve dosyayı kapatır"""
+        if not self._file.closed:
+            self._file.write(b"\n]" if self._has_records else b"]")
+        super().close()
+
+class MsgpackWriter(JsonLinesWriter):
+    """Ürünleri art arda msgpack kayıtları olarak yazar (ayraçsız ikili akış)"""
+
+    format = "msgpack"
+
+    def _get_serializer(self, name):
+        # Biçim kodlayıcıyı belirler; serializer seçeneği yalnızca JSON biçimleri içindir
+        return get_serializer(MsgpackSerializer.name)
+
+    def _prepare_append(self):
+        """Yarım kalan son kaydı keser (dosya baştan çözülür); kayıt varsa True döndürür"""
+        with open(self.filename, "rb+") as handle:
+            unpacker = msgpack.Unpacker(handle, raw=False)
+            end = 0
+            for _ in unpacker:
+                end = unpacker.tell()
+            handle.truncate(end)
+            return end > 0
+
+    def _write_record(self, product):
+        self._file.write(self.serializer.dumps(product))
+
+WRITERS = {
+    JsonArrayWriter.format: JsonArrayWriter,
+    JsonLinesWriter.format: JsonLinesWriter,
+    MsgpackWriter.format: MsgpackWriter,
+    ParquetDatasetWriter.format: ParquetDatasetWriter
+}
+
+def open_writer(filename, output_format=None, **options):
+    """Biçime uygun akış yazıcısını açar ("json", "jsonl", "msgpack" veya "parquet"; varsayılan CONFIG)
+
+    Seçenekler (append, serializer, compression, flush_every; parquet için
+    partition_by, row_group_size) yazıcıya iletilir.
+    """
+    output_format = output_format or CONFIG['output']['format']
+    if output_format not in WRITERS:
+        raise ValueError(f"Bilinmeyen çıktı biçimi: {output_format} (seçenekler: {', '.join(WRITERS)})")
+    return WRITERS[output_format](filename, **options)
+
+def iter_products(filename, chunk_size=READ_CHUNK_SIZE, serializer=None):
+    """Ürünleri dosyadan tek tek okur; tüm dosya belleğe alınmaz
+
+    Biçim dosyanın başına bakılarak belirlenir: gzip/zstd sıkıştırması
+    sihirli baytlardan, ardından msgpack (ilk bayt bir harita), JSON dizisi
+    ('[') ya da JSON Lines. JSON Lines satır satır, eski biçimdeki JSON
+    dizileri parça parça okunup öğe öğe çözülür. Dizin verilirse Parquet
+    veri kümesi olarak okunur.
+
+    Args:
+        filename: Okunacak dosya (ya da Parquet veri kümesi dizini)
+        chunk_size: JSON dizisi okunurken tek seferde okunan karakter sayısı
+        serializer: JSON Lines satırlarını çözecek kodlayıcı (varsayılan CONFIG; "auto" orjson'u tercih eder)
+    """
+    if os.path.isdir(filename):
+        yield from iter_dataset(filename)
+        return
+    raw_file = open(filename, "rb")
+    with raw_file:
+        product_file = _open_input_stream(filename, raw_file)
+        head = product_file.peek(chunk_size)
+        first = head.lstrip()[:1]
+        if first and (0x80 <= first[0] <= 0x8f or first[0] in (0xde, 0xdf)):
+            yield from _iter_msgpack(filename, product_file)
+        elif first == b"[":
+            text_file = io.TextIOWrapper(product_file, encoding="utf-8")
+            buffer = text_file.read(chunk_size).lstrip()
+            yield from _iter_json_array(filename, text_file, buffer[1:], chunk_size)
+        elif first:
+            yield from _iter_json_lines(filename, product_file, get_serializer(serializer))
+
+def _open_input_stream(filename, raw_file):
+    """Açık ham dosyayı (gerekirse açarak) peek destekleyen ikili akışa çevirir"""
+    magic = raw_file.peek(4)[:4]
+    if magic.startswith(_GZIP_MAGIC):
+        return gzip.GzipFile(fileobj=raw_file, mode="rb")  # close() ham dosyayı kapatmaz
+    if magic == _ZSTD_MAGIC:
+        if zstandard is None:
+            raise ValueError(f"{filename}: zstd dosyası için 'zstandard' paketi kurulu değil (pip install zstandard)")
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(raw_file, read_across_frames=True))
+    return raw_file
+
+def _iter_json_lines(filename, product_file, decoder):
+    for line_number, line in enumerate(product_file, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield decoder.loads(line)
+        except ValueError as e:  # json.JSONDecodeError ve orjson.JSONDecodeError ValueError'dır
+            raise ValueError(f"{filename}:{line_number}. satır çözülemedi: {e}") from e
+
+def _iter_msgpack(filename, product_file):
+    if msgpack is None:
+        raise ValueError(f"{filename}: msgpack dosyası için 'msgpack' paketi kurulu değil (pip install msgpack)")
+    unpacker = msgpack.Unpacker(product_file, raw=False)
+    try:
+        yield from unpacker
+    except (msgpack.UnpackException, ValueError) as e:
+        raise ValueError(f"{filename}: msgpack kaydı çözülemedi: {e}") from e
+
+def _iter_json_array(filename, product_file, buffer, chunk_size):
+    """Açılış '[' sonrasındaki dizi öğelerini raw_decode ile sırayla çözer"""
+    decoder = json.JSONDecoder()
+    position = 0
+    eof = False
+
+    while True:
+        # Öğeler arasındaki boşluk ve virgülleri atla
+        while position < len(buffer) and (buffer[position] == "," or buffer[position].isspace()):
+            position += 1
+
+        if position < len(buffer):
+            if buffer[position] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                end = None
+            # Parçanın tam sonunda biten öğe (ör. yarım sayı) eksik olabilir, devamı okunur
+            if end is not None and (end < len(buffer) or eof):
+                yield item
+                position = end
+                continue
+
+        if eof:
+            raise ValueError(f"{filename}: JSON dizisi eksik ya da bozuk")
+        more = product_file.read(chunk_size)
+        eof = not more
+        buffer, position = buffer[position:] + more, 0
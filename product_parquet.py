@@ -0,0 +1,286 @@
+# product_parquet.py - Ürünleri bölümlenmiş Parquet veri kümesi olarak yazan/okuyan akış yardımcıları
+import datetime
+import glob
+import json
+import os
+from urllib.parse import quote, unquote
+from config import CONFIG
+from product import PRODUCT_FIELDS, INTERNED_FIELDS, as_product
+
+try:
+    import pyarrow  # Opsiyonel: Parquet çıktısı
+    import pyarrow.parquet as parquet
+except ImportError:
+    pyarrow = None
+    parquet = None
+
+# Bölümleme seçenekleri: kategoriye, kazıma tarihine göre ya da bölümsüz
+PARTITIONS = ("category", "date", "none")
+
+# Tarihe göre bölümlemede dizin adındaki sütun
+DATE_COLUMN = "scrape_date"
+
+# Boş bölüm değerinin dizin adı (Hive/pyarrow ile aynı)
+_DEFAULT_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+# Veri kümesinin bu yazıcıya ait olduğunu gösteren dosya ("_" ile başladığı için okuyucular atlar)
+_MARKER = "_petlebi_dataset.json"
+
+# Sıkıştırma seçeneklerinin Parquet kodek karşılıkları
+_CODECS = {"none": "none", "gzip": "gzip", "zstd": "zstd", "snappy": "snappy"}
+
+def _require_pyarrow():
+    if pyarrow is None:
+        raise ValueError("Parquet için 'pyarrow' paketi kurulu değil (pip install pyarrow)")
+
+def _field_type(field):
+    """Sütun tipi: fiyat float, az sayıda farklı değeri olan alanlar sözlük kodlu, diğerleri metin"""
+    if field == "price":
+        return pyarrow.float64()
+    if field in INTERNED_FIELDS:
+        return pyarrow.dictionary(pyarrow.int32(), pyarrow.string())
+    return pyarrow.string()
+
+def _column_array(field, values):
+    """Tampondaki değerleri sütun tipine uygun Arrow dizisine çevirir"""
+    if field == "price":
+        # Geçersiz fiyat (NaN) boş değer olarak yazılır
+        return pyarrow.array(values, type=pyarrow.float64(), from_pandas=True)
+    values = [value if value is None or type(value) is str else str(value) for value in values]
+    array = pyarrow.array(values, type=pyarrow.string())
+    return array.dictionary_encode() if field in INTERNED_FIELDS else array
+
+def _partition_value(value):
+    """Bölüm değerini dizin adına uygun hale getirir (pyarrow'un 'uri' kodlamasıyla aynı)"""
+    return quote(str(value), safe="") if value else _DEFAULT_PARTITION
+
+def _part_files(directory):
+    return glob.glob(os.path.join(glob.escape(directory), "**", "part-*.parquet"), recursive=True)
+
+def _part_number(path):
+    try:
+        return int(os.path.basename(path)[5:-8])
+    except ValueError:
+        return -1
+
+class ParquetDatasetWriter:
+    """Ürünleri Hive tarzı bölümlenmiş Parquet veri kümesine yazar
+
+    filename bir dizindir; her bölüm (ör. category=Kedi%20Mamas%C4%B1/)
+    kendi part-NNNNN.parquet dosyalarını içerir. Ürünler bölüm başına
+    sütun sütun tamponlanır ve row_group_size ürüne ulaşınca satır grubu
+    olarak yazılır; tüm bölümlerdeki tamponlar toplamı max_buffered_rows'u
+    aşarsa en büyük tampon beklemeden yazılır. flush() kalan tamponları yazıp açık dosyaları kapatır;
+    böylece checkpoint'te tamamlandı görünen her ürün okunabilir bir dosyada
+    bulunur, sonraki ürünler yeni parça dosyalarına yazılır. close() bu
+    küçük parçaları ve satır gruplarını bölüm başına tek dosyada birleştirir.
+    Yazıcı yalnızca boş ya da kendi oluşturduğu (_petlebi_dataset.json
+    içeren) bir dizine yazar.
+    """
+
+    format = "parquet"
+
+    def __init__(self, filename, flush_every=None, append=False, serializer=None, compression=None,
+                 partition_by=None, row_group_size=None, max_buffered_rows=None):
+        """Yazıcıyı aç
+
+        Args:
+            filename: Veri kümesi dizini
+            flush_every: Kullanılmaz (satır grupları row_group_size ile yazılır); diğer yazıcılarla uyum için
+            append: Mevcut parçaları koru ve yeni parçalar ekle (False ise önceki parçalar silinir)
+            serializer: Kullanılmaz; diğer yazıcılarla uyum için
+            compression: "none", "gzip", "zstd" veya "snappy" (None/"auto": CONFIG)
+            partition_by: "category", "date" veya "none" (varsayılan CONFIG)
+            row_group_size: Satır grubu başına ürün sayısı (varsayılan CONFIG)
+            max_buffered_rows: Tüm bölümlerde bellekte bekleyebilecek en fazla ürün (varsayılan CONFIG)
+
+        Raises:
+            ValueError: pyarrow kurulu değilse, seçenekler geçersizse ya da
+                dizin bu yazıcının oluşturmadığı dosyalar içeriyorsa
+        """
+        _require_pyarrow()
+        settings = CONFIG['parquet']
+        self.filename = filename
+        self.partition_by = partition_by or settings['partition_by']
+        if self.partition_by not in PARTITIONS:
+            raise ValueError(f"Bilinmeyen bölümleme: {self.partition_by} (seçenekler: {', '.join(PARTITIONS)})")
+        if compression in (None, "auto"):
+            compression = settings['compression']
+        if compression not in _CODECS:
+            raise ValueError(f"Parquet için bilinmeyen sıkıştırma: {compression} (seçenekler: {', '.join(_CODECS)})")
+        self.compression = _CODECS[compression]
+        self.row_group_size = row_group_size or settings['row_group_size']
+        self.max_buffered_rows = max_buffered_rows or settings['max_buffered_rows']
+        self.count = 0
+        self._buffered = 0  # Tüm bölüm tamponlarındaki ürün sayısı
+        # Kategoriye göre bölümlemede kategori dizin adında tutulur, dosyaya yazılmaz
+        self.columns = tuple(field for field in PRODUCT_FIELDS
+                             if not (self.partition_by == "category" and field == "category"))
+        self.schema = pyarrow.schema([(field, _field_type(field)) for field in self.columns])
+        self._buffers = {}  # Bölüm dizini -> {sütun: değer listesi}
+        self._writers = {}  # Bölüm dizini -> açık ParquetWriter
+        self._run_parts = {}  # Bölüm dizini -> bu çalışmada yazılan parça dosyaları
+        self._next_part = self._prepare_directory(append)
+
+    def _prepare_directory(self, append):
+        """Dizini hazırlar ve ilk parça numarasını döndürür
+
+        Var olan dizin boş değilse bu yazıcının işaret dosyasını içermelidir;
+        aksi halde kullanıcının dosyaları silinmesin diye hata verilir.
+        Eklemeli açılışta çöken bir çalışmanın kapatılamamış (alt bilgisi
+        olmayan) parçaları ve yarım kalmış birleştirme dosyaları silinir; bu
+        parçalardaki ürünler checkpoint'te tamamlandı olarak kaydedilmemiştir
+        ve yeniden kazınır. Eklemesiz açılışta önceki parçalar silinir.
+        """
+        marker = os.path.join(self.filename, _MARKER)
+        if os.path.exists(self.filename):
+            if not os.path.isdir(self.filename):
+                raise ValueError(f"Parquet çıktısı bir dizin olmalı, {self.filename} bir dosya")
+            if not os.path.exists(marker):
+                if os.listdir(self.filename):
+                    raise ValueError(f"{self.filename} bu yazıcının oluşturmadığı dosyalar içeriyor; "
+                                     f"Parquet çıktısı için yeni ya da boş bir dizin verin")
+            elif append:
+                with open(marker, "r", encoding="utf-8") as marker_file:
+                    previous = json.load(marker_file).get("partition_by")
+                if previous != self.partition_by:
+                    raise ValueError(f"{self.filename} '{previous}' ile bölümlenmiş; "
+                                     f"'{self.partition_by}' ile devam edilemez")
+        os.makedirs(self.filename, exist_ok=True)
+        with open(marker, "w", encoding="utf-8") as marker_file:
+            json.dump({"format": self.format, "partition_by": self.partition_by}, marker_file)
+
+        for path in glob.glob(os.path.join(glob.escape(self.filename), "**", "part-*.parquet.tmp"), recursive=True):
+            os.remove(path)  # Yarım kalmış birleştirme
+        parts = []
+        for path in _part_files(self.filename):
+            if append:
+                try:
+                    parquet.read_metadata(path)
+                    parts.append(path)
+                    continue
+                except Exception:
+                    pass
+            os.remove(path)
+        return 1 + max((_part_number(path) for path in parts), default=-1)
+
+    def _partition(self, product):
+        """Ürünün yazılacağı bölüm dizini (veri kümesi dizinine göre)"""
+        if self.partition_by == "category":
+            return f"category={_partition_value(product.category)}"
+        if self.partition_by == "date":
+            return f"{DATE_COLUMN}={datetime.date.today().isoformat()}"
+        return ""
+
+    def write(self, product):
+        """Ürünü bölüm tamponuna ekler; tampon dolduysa satır grubu olarak yazar"""
+        product = as_product(product)
+        partition = self._partition(product)
+        buffer = self._buffers.get(partition)
+        if buffer is None:
+            buffer = self._buffers[partition] = {field: [] for field in self.columns}
+        for field in self.columns:
+            buffer[field].append(getattr(product, field))
+        self.count += 1
+        self._buffered += 1
+        if len(buffer["url"]) >= self.row_group_size:
+            self._write_row_group(partition)
+        elif self._buffered >= self.max_buffered_rows:
+            # Çok sayıda küçük bölümde bellek sınırlı kalsın: en büyük tamponu şimdi yaz
+            self._write_row_group(max(self._buffers, key=lambda key: len(self._buffers[key]["url"])))
+
+    def _write_row_group(self, partition):
+        """Bölüm tamponunu bölümün açık parça dosyasına satır grubu olarak yazar"""
+        buffer = self._buffers.pop(partition, None)
+        if not buffer or not buffer["url"]:
+            return
+        self._buffered -= len(buffer["url"])
+        table = pyarrow.Table.from_arrays([_column_array(field, buffer[field]) for field in self.columns],
+                                          schema=self.schema)
+        writer = self._writers.get(partition)
+        if writer is None:
+            directory = os.path.join(self.filename, partition)
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"part-{self._next_part:05d}.parquet")
+            self._next_part += 1
+            writer = self._writers[partition] = parquet.ParquetWriter(path, self.schema, compression=self.compression)
+            self._run_parts.setdefault(partition, []).append(path)
+        writer.write_table(table, row_group_size=self.row_group_size)
+
+    def flush(self):
+        """Kalan tamponları yazar ve açık parça dosyalarını kapatır (dosyalar okunabilir hale gelir)"""
+        for partition in list(self._buffers):
+            self._write_row_group(partition)
+        writers, self._writers = self._writers, {}
+        for writer in writers.values():
+            writer.close()
+
+    def close(self):
+        """Kalan ürünleri yazar, dosyaları kapatır ve bölüm başına bu çalışmanın parçalarını birleştirir"""
+        self.flush()
+        run_parts, self._run_parts = self._run_parts, {}
+        if CONFIG['parquet']['compact_on_close']:
+            for paths in run_parts.values():
+                if self._needs_compaction(paths):
+                    self._compact(paths)
+
+    def _needs_compaction(self, paths):
+        """Birden çok parça ya da gereğinden fazla (küçük) satır grubu varsa True"""
+        if len(paths) > 1:
+            return True
+        metadata = parquet.read_metadata(paths[0])
+        return metadata.num_row_groups > -(-metadata.num_rows // self.row_group_size)
+
+    def _compact(self, paths):
+        """Parçaları row_group_size'lık satır gruplarıyla ilkinin yerine tek dosyaya yazar
+
+        Her checkpoint kaydı açık dosyaları kapattığından ve tampon sınırı
+        küçük satır grupları yazdırdığından uzun bir çalışma bölüm başına çok
+        sayıda küçük parça bırakır. Birleşik dosya önce
+        geçici adla yazılıp ilk parçanın yerine taşınır, sonra diğerleri
+        silinir; arada çökme veri kaybına değil tekrar eden satırlara yol açar.
+        """
+        temporary = f"{paths[0]}.tmp"
+        with parquet.ParquetWriter(temporary, self.schema, compression=self.compression) as writer:
+            pending = None
+            for path in paths:
+                for batch in parquet.ParquetFile(path).iter_batches(batch_size=self.row_group_size):
+                    table = pyarrow.Table.from_batches([batch])
+                    pending = table if pending is None else pyarrow.concat_tables([pending, table])
+                    # Dilimleme kopyalamaz; her satır grubu tam row_group_size olur
+                    while pending.num_rows >= self.row_group_size:
+                        writer.write_table(pending.slice(0, self.row_group_size))
+                        pending = pending.slice(self.row_group_size)
+            if pending is not None and pending.num_rows:
+                writer.write_table(pending)
+        os.replace(temporary, paths[0])
+        for path in paths[1:]:
+            os.remove(path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def _partition_values(directory, path):
+    """Parça dosyasının yolundaki key=value dizinlerinden bölüm sütunlarını çıkarır"""
+    values = {}
+    for segment in os.path.relpath(os.path.dirname(path), directory).split(os.sep):
+        key, separator, value = segment.partition("=")
+        if separator:
+            values[key] = "" if value == _DEFAULT_PARTITION else unquote(value)
+    return values
+
+def iter_dataset(directory):
+    """Veri kümesindeki ürünleri satır grubu satır grubu okur; tüm veri belleğe alınmaz
+
+    Bölüm sütunları (category, scrape_date) dizin adlarından geri eklenir.
+    """
+    _require_pyarrow()
+    for path in sorted(_part_files(directory)):
+        partition = _partition_values(directory, path)
+        for batch in parquet.ParquetFile(path).iter_batches():
+            for row in batch.to_pylist():
+                row.update(partition)
+                yield row
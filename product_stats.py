@@ -0,0 +1,374 @@
+# product_stats.py - Büyük ürün kümeleri için sütunlu istatistikler
+import bisect
+import math
+import threading
+from array import array
+from collections import Counter
+from product import parse_price
+from product_io import iter_products
+
+try:
+    import numpy  # Opsiyonel: varsa sayımlar ve yüzdelikler vektörel hesaplanır
+except ImportError:
+    numpy = None
+
+# Fiyat aralıkları: (etiket, üst sınır dahil)
+PRICE_RANGES = (("0-50", 50.0), ("51-100", 100.0), ("101-200", 200.0), ("201+", math.inf))
+_PRICE_BOUNDS = [bound for _, bound in PRICE_RANGES[:-1]]
+
+STOCK_STATUSES = ("In Stock", "Out of Stock", "Other")
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95, 99)
+
+# Kapsam oranı hesaplanan detay alanları
+COVERAGE_FIELDS = ("barcode", "image", "description")
+
+def classify_stock(stock):
+    """Stok metnini "In Stock", "Out of Stock" ya da "Other" olarak sınıflandırır"""
+    stock = (stock or '').lower()
+    if 'in stock' in stock or 'stokta' in stock:
+        return "In Stock"
+    if 'out of stock' in stock or 'stokta yok' in stock or 'tükendi' in stock:
+        return "Out of Stock"
+    return "Other"
+
+def _percentile(ordered, fraction):
+    """Sıralı listede doğrusal aradeğerlemeli yüzdelik (numpy.percentile'ın varsayılanı)"""
+    position = (len(ordered) - 1) * fraction
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+class DictionaryColumn:
+    """Tekrar eden metinleri sözlük kodlamasıyla tutan sütun
+
+    Her farklı değer bir kez saklanır; satır başına yalnızca 4 baytlık kod
+    tutulur. Marka, kategori ve stok gibi birkaç yüz farklı değeri olan
+    alanlar için bellek kullanımı satır sayısıyla neredeyse sabit kalır.
+    """
+
+    def __init__(self):
+        self.values = []
+        self.codes = array('I')
+        self._index = {}
+
+    def __len__(self):
+        return len(self.codes)
+
+    def append(self, value):
+        code = self._index.get(value)
+        if code is None:
+            code = len(self.values)
+            self._index[value] = code
+            self.values.append(value)
+        self.codes.append(code)
+
+    def code_counts(self):
+        """Her kodun kaç satırda geçtiğini (kod sırasıyla) döndürür"""
+        if numpy is not None:
+            codes = numpy.frombuffer(self.codes, dtype=numpy.uint32) if self.codes else numpy.zeros(0, numpy.uint32)
+            return numpy.bincount(codes, minlength=len(self.values)).tolist()
+        counts = Counter(self.codes)
+        return [counts[code] for code in range(len(self.values))]
+
+    def value_counts(self):
+        """Değer -> satır sayısı sözlüğü (değerlerin ilk görülme sırasıyla)"""
+        return dict(zip(self.values, self.code_counts()))
+
+class ProductColumns:
+    """Ürünleri satır başına sözlük yerine sütun dizilerinde tutar
+
+    Fiyat float dizisinde (geçersizse NaN), kategori/marka/stok sözlük
+    kodlamalı sütunlarda, barkod/resim/açıklama varlığı bayt dizilerinde
+    tutulur; ürün başına ~23 bayt yer kaplar. Dağılımlar satırlar yerine
+    sütunlar üzerinden hesaplanır: stok metni her farklı değer için bir kez
+    sınıflandırılır, sayımlar NumPy varsa vektörel, yoksa C'de çalışan
+    Counter/bytearray.count ile yapılır.
+    """
+
+    def __init__(self):
+        self.price = array('d')
+        self.category = DictionaryColumn()
+        self.brand = DictionaryColumn()
+        self.stock = DictionaryColumn()
+        self.coverage = {field: bytearray() for field in COVERAGE_FIELDS}
+
+    def __len__(self):
+        return len(self.price)
+
+    def append(self, product):
+        """Bir ürün sözlüğünü sütunlara ekler"""
+        self.price.append(parse_price(product.get('price', 0)))
+        self.category.append(product.get('category', 'Unknown'))
+        self.brand.append(product.get('brand', 'Unknown'))
+        self.stock.append(product.get('stock', ''))
+        for field, column in self.coverage.items():
+            column.append(1 if product.get(field) else 0)
+
+    def extend(self, products):
+        for product in products:
+            self.append(product)
+
+    @classmethod
+    def from_products(cls, products):
+        columns = cls()
+        columns.extend(products)
+        return columns
+
+    @classmethod
+    def from_file(cls, filename, serializer=None):
+        """JSON, JSON Lines veya msgpack dosyasını (sıkıştırılmış olabilir) akış halinde sütunlara yükler"""
+        return cls.from_products(iter_products(filename, serializer=serializer))
+
+    @classmethod
+    def from_database(cls, database):
+        """petlebi tablosundaki ürünleri (Database.iter_products) sütunlara yükler"""
+        return cls.from_products(database.iter_products())
+
+    def stock_status(self):
+        """Stok durumlarının sayısı; her farklı stok metni bir kez sınıflandırılır"""
+        status = dict.fromkeys(STOCK_STATUSES, 0)
+        for value, count in self.stock.value_counts().items():
+            status[classify_stock(value)] += count
+        return status
+
+    def _valid_prices(self):
+        """NaN olmayan fiyatlar (numpy dizisi ya da liste)"""
+        if numpy is not None:
+            prices = numpy.frombuffer(self.price, dtype=numpy.float64) if self.price else numpy.zeros(0)
+            return prices[~numpy.isnan(prices)]
+        return [price for price in self.price if price == price]
+
+    def price_ranges(self):
+        """Fiyat aralıklarına düşen ürün sayıları (geçersiz fiyatlar sayılmaz)"""
+        prices = self._valid_prices()
+        if numpy is not None:
+            counts = numpy.bincount(numpy.searchsorted(_PRICE_BOUNDS, prices, side='left'),
+                                    minlength=len(PRICE_RANGES)).tolist()
+        else:
+            counter = Counter(bisect.bisect_left(_PRICE_BOUNDS, price) for price in prices)
+            counts = [counter[index] for index in range(len(PRICE_RANGES))]
+        return {label: count for (label, _), count in zip(PRICE_RANGES, counts)}
+
+    def price_summary(self, percentiles=DEFAULT_PERCENTILES):
+        """Geçerli fiyatların adet, en küçük, ortalama, en büyük ve yüzdelik değerleri"""
+        prices = self._valid_prices()
+        if len(prices) == 0:
+            return {"count": 0}
+        if numpy is not None:
+            values = numpy.percentile(prices, percentiles).tolist()
+            summary = {"count": int(len(prices)), "min": float(prices.min()),
+                       "mean": float(prices.mean()), "max": float(prices.max())}
+        else:
+            ordered = sorted(prices)
+            values = [_percentile(ordered, percentile / 100) for percentile in percentiles]
+            summary = {"count": len(ordered), "min": ordered[0],
+                       "mean": math.fsum(ordered) / len(ordered), "max": ordered[-1]}
+        summary.update({f"p{percentile}": round(value, 2) for percentile, value in zip(percentiles, values)})
+        summary["mean"] = round(summary["mean"], 2)
+        return summary
+
+    def statistics(self, include_price_summary=True):
+        """PetlebiScraper.get_statistics ile aynı dağılımları (ve fiyat yüzdeliklerini) döndürür"""
+        if not len(self):
+            return {"total": 0}
+        stats = {
+            "total": len(self),
+            "categories": self.category.value_counts(),
+            "brands": self.brand.value_counts(),
+            "stock_status": self.stock_status(),
+            "price_ranges": self.price_ranges()
+        }
+        for field, column in self.coverage.items():
+            stats[f"with_{field}"] = column.count(1)
+        stats["coverage"] = _coverage_ratios(stats)
+        if include_price_summary:
+            stats["price"] = self.price_summary()
+        return stats
+
+def _coverage_ratios(stats):
+    """with_<alan> sayılarından alan doluluk oranlarını (0-1) hesaplar; sayılar eski uyumluluk için kalır"""
+    return {field: round(stats[f"with_{field}"] / stats["total"], 4) for field in COVERAGE_FIELDS}
+
+class P2Quantile:
+    """Tek bir yüzdeliği sabit bellek ve gözlem başına O(1) işle izleyen P² kestirimcisi
+
+    Jain & Chlamtac'ın P² algoritması: değerler saklanmaz; en küçük, en büyük,
+    hedef yüzdelik ve iki ara nokta için beş işaretçinin yüksekliği ve konumu
+    tutulur, her gözlemde işaretçiler parabolik aradeğerlemeyle kaydırılır.
+    İlk beş gözleme kadar sonuç kesindir.
+    """
+
+    def __init__(self, fraction):
+        self.fraction = fraction
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * fraction, 1 + 4 * fraction, 3 + 2 * fraction, 5]
+        self.increments = [0, fraction / 2, fraction, (1 + fraction) / 2, 1]
+
+    def add(self, value):
+        heights = self.heights
+        if len(heights) < 5:
+            bisect.insort(heights, value)
+            return
+
+        # Değerin düştüğü hücreyi bul, uç işaretçileri gerekirse genişlet
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = bisect.bisect_right(heights, value) - 1
+
+        positions = self.positions
+        for index in range(cell + 1, 5):
+            positions[index] += 1
+        for index in range(5):
+            self.desired[index] += self.increments[index]
+
+        # Ara işaretçileri istenen konumlarına doğru birer adım kaydır
+        for index in range(1, 4):
+            offset = self.desired[index] - positions[index]
+            if ((offset >= 1 and positions[index + 1] - positions[index] > 1) or
+                    (offset <= -1 and positions[index - 1] - positions[index] < -1)):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(index, step)
+                if not heights[index - 1] < height < heights[index + 1]:
+                    height = heights[index] + step * (heights[index + step] - heights[index]) / (
+                        positions[index + step] - positions[index])
+                heights[index] = height
+                positions[index] += step
+
+    def _parabolic(self, index, step):
+        heights, positions = self.heights, self.positions
+        return heights[index] + step / (positions[index + 1] - positions[index - 1]) * (
+            (positions[index] - positions[index - 1] + step) * (heights[index + 1] - heights[index])
+            / (positions[index + 1] - positions[index])
+            + (positions[index + 1] - positions[index] - step) * (heights[index] - heights[index - 1])
+            / (positions[index] - positions[index - 1]))
+
+    def value(self):
+        """Güncel kestirim (gözlem yoksa None)"""
+        if not self.heights:
+            return None
+        if len(self.heights) < 5:
+            return _percentile(self.heights, self.fraction)
+        return self.heights[2]
+
+class StatisticsAggregator:
+    """Ürünler akarken güncellenen istatistikler (scraper sink'i olarak kullanılır)
+
+    Her ürün sayımlara, fiyat aralıklarına, kapsam sayaçlarına ve P²
+    yüzdelik kestirimcilerine O(1) işle eklenir; snapshot() o ana kadarki
+    ürün sayısından bağımsız sürede get_statistics ile aynı sözlüğü döndürür.
+    Böylece tarama sırasında ilerleme raporu için tüm ürünler yeniden
+    taranmaz. Fiyat yüzdelikleri yaklaşıktır; kesin değerler için
+    ProductColumns kullanılır.
+    """
+
+    def __init__(self, percentiles=DEFAULT_PERCENTILES):
+        self.total = 0
+        self.categories = {}
+        self.brands = {}
+        self.stock_status = dict.fromkeys(STOCK_STATUSES, 0)
+        self.price_ranges = dict.fromkeys((label for label, _ in PRICE_RANGES), 0)
+        self.coverage = dict.fromkeys(COVERAGE_FIELDS, 0)
+        self.price_count = 0
+        self.price_sum = 0.0
+        self.price_min = math.inf
+        self.price_max = -math.inf
+        self.quantiles = {percentile: P2Quantile(percentile / 100) for percentile in percentiles}
+        self._stock_classes = {}  # stok metni -> sınıf (her farklı değer bir kez sınıflandırılır)
+        self._lock = threading.Lock()  # snapshot başka bir iş parçacığından alınabilir
+
+    def write(self, product):
+        """Bir ürünü istatistiklere ekler"""
+        stock = product.get('stock', '')
+        price = parse_price(product.get('price', 0))
+        with self._lock:
+            self.total += 1
+            category = product.get('category', 'Unknown')
+            self.categories[category] = self.categories.get(category, 0) + 1
+            brand = product.get('brand', 'Unknown')
+            self.brands[brand] = self.brands.get(brand, 0) + 1
+
+            status = self._stock_classes.get(stock)
+            if status is None:
+                status = self._stock_classes[stock] = classify_stock(stock)
+            self.stock_status[status] += 1
+
+            for field in COVERAGE_FIELDS:
+                if product.get(field):
+                    self.coverage[field] += 1
+
+            if price == price:  # NaN: geçersiz fiyat sayılmaz
+                self.price_ranges[PRICE_RANGES[bisect.bisect_left(_PRICE_BOUNDS, price)][0]] += 1
+                self.price_count += 1
+                self.price_sum += price
+                self.price_min = min(self.price_min, price)
+                self.price_max = max(self.price_max, price)
+                for quantile in self.quantiles.values():
+                    quantile.add(price)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+    def price_summary(self):
+        """Fiyatların adet, en küçük, ortalama, en büyük ve (yaklaşık) yüzdelik değerleri"""
+        with self._lock:
+            if not self.price_count:
+                return {"count": 0}
+            summary = {"count": self.price_count, "min": self.price_min,
+                       "mean": round(self.price_sum / self.price_count, 2), "max": self.price_max}
+            summary.update({f"p{percentile}": round(quantile.value(), 2)
+                            for percentile, quantile in self.quantiles.items()})
+            return summary
+
+    def snapshot(self, include_price_summary=True):
+        """Güncel istatistiklerin kopyası (ProductColumns.statistics ile aynı biçim)"""
+        with self._lock:
+            if not self.total:
+                return {"total": 0}
+            stats = {
+                "total": self.total,
+                "categories": dict(self.categories),
+                "brands": dict(self.brands),
+                "stock_status": dict(self.stock_status),
+                "price_ranges": dict(self.price_ranges)
+            }
+            for field, count in self.coverage.items():
+                stats[f"with_{field}"] = count
+        stats["coverage"] = _coverage_ratios(stats)
+        if include_price_summary:
+            stats["price"] = self.price_summary()
+        return stats
+
+def format_statistics(stats, top=10):
+    """İstatistikleri okunur çok satırlı metin olarak döndürür (en sık top kategori/marka)"""
+    total = stats.get("total", 0)
+    if not total:
+        return "Ürün bulunamadı"
+
+    def share(count):
+        return f"{count:>10}  %{100 * count / total:5.1f}"
+
+    lines = [f"Toplam ürün: {total}"]
+    for title, key in (("Kategoriler", "categories"), ("Markalar", "brands")):
+        counts = sorted(stats[key].items(), key=lambda item: item[1], reverse=True)
+        lines.append(f"{title} ({len(counts)} farklı, en sık {min(top, len(counts))}):")
+        lines.extend(f"  {str(name)[:40]:<40}{share(count)}" for name, count in counts[:top])
+    lines.append("Stok durumu:")
+    lines.extend(f"  {name:<40}{share(count)}" for name, count in stats["stock_status"].items())
+    lines.append("Fiyat aralıkları:")
+    lines.extend(f"  {name:<40}{share(count)}" for name, count in stats["price_ranges"].items())
+    price = stats.get("price")
+    if price and price.get("count"):
+        lines.append("Fiyat: " + ", ".join(f"{key} {value}" for key, value in price.items()))
+    lines.append("Detay kapsamı:")
+    lines.extend(f"  {field:<40}{share(stats[f'with_{field}'])}" for field in COVERAGE_FIELDS)
+    return "\n".join(lines)
@@ -0,0 +1,146 @@
+# rate_limiter.py - Sunucu tepkisine göre uyarlanan istek hızı sınırlayıcı
+import asyncio
+import threading
+import time
+from config import CONFIG
+
+class AdaptiveRateLimiter:
+    """Token bucket tabanlı, hız ve eşzamanlılığı AIMD ile ayarlayan sınırlayıcı
+
+    Başarılı isteklerde hız ve eşzamanlılık toplamsal olarak artar (additive
+    increase); "rate_limited" ve "server_error" hatalarında çarpımsal olarak
+    azalır (multiplicative decrease) ve varsa Retry-After süresi kadar yeni istek
+    verilmez. Aynı nesne iş parçacıklarından (acquire) ve asyncio'dan
+    (acquire_async) birlikte kullanılabilir.
+    """
+
+    # Hız ve eşzamanlılığın düşürülmesini gerektiren hata türleri
+    BACKOFF_ERRORS = ("rate_limited", "server_error")
+
+    # Eşzamanlılık sınırına takılan isteklerin yeniden deneme aralığı (saniye)
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, rate=None, min_rate=None, max_rate=None, concurrency=None,
+                 min_concurrency=None, max_concurrency=None, logger=None):
+        """Sınırlayıcıyı başlat
+
+        Args:
+            rate: Başlangıç hızı (istek/saniye)
+            min_rate, max_rate: Hızın inebileceği/çıkabileceği sınırlar
+            concurrency: Başlangıçtaki eşzamanlı istek sayısı
+            min_concurrency, max_concurrency: Eşzamanlılık sınırları
+            logger: Hız değişikliklerinin yazılacağı logger (opsiyonel)
+        """
+        settings = CONFIG['rate_limit']
+        self.max_rate = max_rate or settings['max_rate']
+        self.min_rate = min_rate or settings['min_rate']
+        self.max_concurrency = max_concurrency or settings['max_concurrency']
+        self.min_concurrency = min_concurrency or settings['min_concurrency']
+        self.rate_step = settings['rate_step']
+        self.decrease_factor = settings['decrease_factor']
+        self.cooldown = settings['cooldown']
+        self.logger = logger
+
+        self.rate = min(rate or settings['initial_rate'], self.max_rate)
+        self.concurrency = float(min(concurrency or settings['initial_concurrency'], self.max_concurrency))
+        self.burst = max(1.0, self.rate)
+        self.tokens = self.burst
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self.throttle_count = 0
+
+        self._last_refill = time.monotonic()
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        """Geçen süreye göre token kovasını doldurur"""
+        self.tokens = min(self.burst, self.tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def _try_acquire(self):
+        """İzin alınabiliyorsa alır ve 0 döndürür; aksi halde beklenecek süreyi döndürür"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+
+            if now < self.blocked_until:
+                return self.blocked_until - now
+            if self.in_flight >= int(self.concurrency):
+                return self.POLL_INTERVAL
+            if self.tokens < 1:
+                return (1 - self.tokens) / self.rate
+
+            self.tokens -= 1
+            self.in_flight += 1
+            return 0
+
+    def acquire(self):
+        """İstek izni alınana kadar iş parçacığını bekletir"""
+        while True:
+            wait = self._try_acquire()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """İstek izni alınana kadar olay döngüsünü bloklamadan bekler"""
+        while True:
+            wait = self._try_acquire()
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def release(self, error_type=None, retry_after=None):
+        """İsteğin sonucunu bildirir ve hız/eşzamanlılığı buna göre ayarlar
+
+        Args:
+            error_type: ErrorHandler'ın döndürdüğü hata türü (başarılı istekte None)
+            retry_after: Sunucunun Retry-After başlığındaki bekleme süresi (saniye)
+        """
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+            if error_type is None:
+                self._increase()
+            elif error_type in self.BACKOFF_ERRORS:
+                self._decrease(retry_after)
+
+    def _increase(self):
+        """Toplamsal artış: her başarılı istekte hızı ve eşzamanlılığı biraz yükseltir"""
+        self.rate = min(self.max_rate, self.rate + self.rate_step)
+        self.burst = max(1.0, self.rate)
+        # Eşzamanlılık, pencere başına yaklaşık bir artacak şekilde büyür
+        self.concurrency = min(self.max_concurrency, self.concurrency + 1.0 / max(self.concurrency, 1.0))
+
+    def _decrease(self, retry_after):
+        """Çarpımsal azalış: hızı ve eşzamanlılığı düşürür, gerekirse istekleri durdurur"""
+        now = time.monotonic()
+        if retry_after:
+            self.blocked_until = max(self.blocked_until, now + retry_after)
+
+        # Aynı anda dönen hata dalgasında birden fazla kez düşürmemek için bekleme süresi
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+
+        self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+        self.burst = max(1.0, self.rate)
+        self.tokens = min(self.tokens, 0.0)
+        self.concurrency = max(float(self.min_concurrency), self.concurrency * self.decrease_factor)
+        self.throttle_count += 1
+
+        if self.logger:
+            self.logger.warning(
+                f"Sunucu yavaşlama istedi, hız düşürüldü: {self.rate:.2f} istek/sn, "
+                f"eşzamanlılık {int(self.concurrency)}"
+            )
+
+    def get_state(self):
+        """Sınırlayıcının anlık durumunu döndürür"""
+        with self._lock:
+            return {
+                "rate": round(self.rate, 2),
+                "concurrency": int(self.concurrency),
+                "in_flight": self.in_flight,
+                "throttle_count": self.throttle_count
+            }
@@ -0,0 +1,145 @@
+# retry.py - Jitter'lı üstel geri çekilmeyle yeniden deneme
+import asyncio
+import random
+import threading
+import time
+from config import CONFIG
+
+class RetryPolicy:
+    """ErrorHandler.should_retry kararına göre istekleri yeniden dener
+
+    Her hata türünün kendi deneme bütçesi vardır (ör. server_error için 3).
+    Bekleme süresi "full jitter" üstel geri çekilmeyle seçilir; sunucu
+    Retry-After gönderdiyse en az o kadar beklenir. Ayrıca tüm çalışma için
+    ortak bir bütçe tutulur: yapılabilecek yeniden deneme sayısı, ilk istek
+    sayısının belirli bir oranıyla sınırlıdır. Böylece sunucu tamamen çöktüğünde
+    yeniden denemeler yükü katlayamaz.
+
+    Deneme fonksiyonu (result, error_type, retry_after) döndürür; başarıda
+    error_type None'dır. retry_exceptions içindeki istisnalar bağlantı hatası
+    sayılır ve deneme hakkı bittiğinde yeniden fırlatılır.
+    """
+
+    def __init__(self, error_handler, max_retries=None, base_delay=None, max_delay=None,
+                 budget_ratio=None, budget_min=None, logger=None, metrics=None):
+        """Yeniden deneme politikasını başlat
+
+        Args:
+            error_handler: Hataları sınıflandıran ve should_retry sağlayan ErrorHandler
+            max_retries: Hata türü -> en fazla yeniden deneme sayısı sözlüğü
+            base_delay: İlk yeniden denemenin üst bekleme sınırı (saniye)
+            max_delay: Tek bir beklemenin üst sınırı (saniye)
+            budget_ratio: Her ilk isteğin genel bütçeye eklediği yeniden deneme hakkı
+            budget_min: Genel bütçenin taban değeri
+            logger: Yeniden denemelerin yazılacağı logger (opsiyonel)
+            metrics: Yeniden deneme sayaçlarının da işleneceği Metrics (opsiyonel)
+        """
+        settings = CONFIG['retry']
+        self.error_handler = error_handler
+        self.max_retries = max_retries or settings['max_retries']
+        self.base_delay = base_delay or settings['base_delay']
+        self.max_delay = max_delay or settings['max_delay']
+        self.budget_ratio = budget_ratio if budget_ratio is not None else settings['budget_ratio']
+        self.budget_min = budget_min if budget_min is not None else settings['budget_min']
+        self.logger = logger
+        self.metrics = metrics
+
+        # Çalışma boyunca tutulan sayaçlar
+        self.request_count = 0
+        self.retry_count = 0
+        self.retry_counts = {}
+        self.exhausted_count = 0
+        self.budget_denied_count = 0
+        self._lock = threading.Lock()
+
+    def _reserve_retry(self, error_type, retries_done):
+        """Yeniden deneme yapılabilecekse hakkı ayırır ve True döndürür"""
+        if not self.error_handler.should_retry(error_type):
+            return False
+
+        with self._lock:
+            if retries_done >= self.max_retries.get(error_type, 0):
+                self.exhausted_count += 1
+                outcome = "retries_exhausted"
+            elif self.retry_count >= self.budget_min + self.budget_ratio * self.request_count:
+                self.budget_denied_count += 1
+                outcome = "retry_budget_denied"
+            else:
+                self.retry_count += 1
+                self.retry_counts[error_type] = self.retry_counts.get(error_type, 0) + 1
+                outcome = "retries"
+        if self.metrics:
+            self.metrics.inc(outcome, error_type=error_type)
+        return outcome == "retries"
+
+    def _delay(self, retries_done, retry_after):
+        """Bir sonraki deneme öncesi beklenecek süreyi hesaplar"""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** retries_done)))
+        if retry_after:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+    def _count_request(self):
+        with self._lock:
+            self.request_count += 1
+
+    def _log_retry(self, url, error_type, retries_done, delay):
+        if self.logger:
+            self.logger.warning(
+                f"Yeniden deneniyor ({error_type}, {retries_done + 1}. deneme, {delay:.2f} sn sonra): {url}"
+            )
+
+    def run(self, attempt, url, retry_exceptions=()):
+        """Deneme fonksiyonunu gerekirse yeniden deneyerek çalıştırır ve sonucunu döndürür"""
+        self._count_request()
+        retries_done = 0
+        while True:
+            error = None
+            try:
+                result, error_type, retry_after = attempt()
+            except retry_exceptions as e:
+                result, error_type, retry_after = None, self.error_handler.classify_request_error(e), None
+                error = e
+
+            if error_type is None or not self._reserve_retry(error_type, retries_done):
+                if error is not None:
+                    raise error
+                return result
+
+            delay = self._delay(retries_done, retry_after)
+            self._log_retry(url, error_type, retries_done, delay)
+            time.sleep(delay)
+            retries_done += 1
+
+    async def run_async(self, attempt, url, retry_exceptions=()):
+        """run ile aynı, ancak deneme fonksiyonu bir coroutine fonksiyonudur"""
+        self._count_request()
+        retries_done = 0
+        while True:
+            error = None
+            try:
+                result, error_type, retry_after = await attempt()
+            except retry_exceptions as e:
+                result, error_type, retry_after = None, self.error_handler.classify_request_error(e), None
+                error = e
+
+            if error_type is None or not self._reserve_retry(error_type, retries_done):
+                if error is not None:
+                    raise error
+                return result
+
+            delay = self._delay(retries_done, retry_after)
+            self._log_retry(url, error_type, retries_done, delay)
+            await asyncio.sleep(delay)
+            retries_done += 1
+
+    def get_stats(self):
+        """Çalışma boyunca yapılan yeniden denemelerin özetini döndürür"""
+        with self._lock:
+            return {
+                "requests": self.request_count,
+                "retries": self.retry_count,
+                "by_error": dict(self.retry_counts),
+                "exhausted": self.exhausted_count,
+                "budget_denied": self.budget_denied_count
+            }
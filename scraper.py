@@ -1,32 +1,93 @@
 # scraper.py - İyileştirilmiş web kazıma sınıfı
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlsplit
 import requests
+import itertools
 import json
+import math
+import queue
+import threading
 import time
 from config import CONFIG
 from logger import Logger
 from error_handler import ErrorHandler
+from rate_limiter import AdaptiveRateLimiter
+from retry import RetryPolicy
+from http_cache import HttpCache
+from extractors import get_extractor
+from product_io import open_writer
+from discovery import iter_sitemap_urls
+from dedup import SeenIndex
+from metrics import Metrics
+from product import Product
+from product_stats import StatisticsAggregator
 
 class PetlebiScraper:
     """Petlebi web sitesinden ürün verilerini çeken sınıf"""
     
-    def __init__(self, base_url=None, max_pages=None):
+    def __init__(self, base_url=None, max_pages=None, max_workers=None, per_host_limit=None, rate_limiter=None,
+                 http_cache=None, previous_index=None, parser=None, keep_products=True, checkpoint=None,
+                 discovery=None, sitemap_url=None, metrics=None):
         """Scraper'ı başlat
         
         Args:
             base_url: Taranacak web sitesinin temel URL'si
-            max_pages: Taranacak maksimum sayfa sayısı
+            max_pages: Sayfalamada taranacak en fazla sayfa (None: ilk boş sayfaya kadar)
+            max_workers: Detay sayfalarını eşzamanlı indirecek iş parçacığı sayısı (1 = sıralı)
+            per_host_limit: Aynı sunucuya aynı anda gönderilebilecek en fazla istek
+            rate_limiter: Paylaşılan AdaptiveRateLimiter (verilmezse yenisi oluşturulur)
+            http_cache: Detay sayfaları için HttpCache (verilmezse CONFIG'e göre açılır, False ile kapatılır)
+            previous_index: Artımlı tarama için önceki çalışmanın IncrementalIndex'i (opsiyonel)
+            parser: HTML ayrıştırıcı ("lxml" hızlı yol, "soup" BeautifulSoup; varsayılan CONFIG)
+            keep_products: Ürünleri self.products'ta da biriktir (False ise yalnızca sink'lere yazılır)
+            checkpoint: Tamamlanan sayfa/URL'leri kaydeden Checkpoint (devam ederken bunlar atlanır)
+            discovery: Ürün URL'lerinin bulunması: "sitemap", "pagination" veya "auto" (varsayılan CONFIG)
+            sitemap_url: Kök sitemap adresi (varsayılan CONFIG)
+            metrics: İndirme, ayrıştırma ve yazma sürelerinin kaydedileceği Metrics (verilmezse yenisi oluşturulur)
         """
         self.base_url = base_url or CONFIG['scraping']['base_url']
         self.max_pages = max_pages or CONFIG['scraping']['max_pages']
+        self.max_failed_pages = CONFIG['scraping']['max_failed_pages']
+        self.discovery = discovery or CONFIG['scraping']['discovery']
+        self.sitemap_url = sitemap_url or CONFIG['scraping']['sitemap_url']
+        self.max_workers = max_workers or CONFIG['scraping']['max_workers']
+        self.per_host_limit = per_host_limit or CONFIG['scraping']['per_host_limit']
+        self.queue_size = CONFIG['scraping']['queue_size']
         self.products = []
+        self.keep_products = keep_products
+        self.product_count = 0
+        # Her ürünün kazındığı anda yazıldığı hedefler (ör. JsonLinesWriter); ilki ürünler akarken
+        # güncellenen istatistiklerdir, get_statistics ürünleri yeniden taramaz
+        self.statistics = StatisticsAggregator()
+        self.sinks = [self.statistics]
+        self._sink_error = None  # Bir sink yazamazsa tarama durdurulur
+        self._products_lock = threading.Lock()
         self.logger = Logger()
+        self.metrics = metrics or Metrics()
         self.error_handler = ErrorHandler(self.logger)
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter(max_concurrency=self.max_workers + 1, logger=self.logger)
+        self.retry_policy = RetryPolicy(self.error_handler, logger=self.logger, metrics=self.metrics)
+        self.failed_detail_urls = []
+        if http_cache is None and CONFIG['http_cache']['enabled']:
+            http_cache = HttpCache()
+        self.http_cache = http_cache or None
+        self.previous_index = previous_index
+        self.checkpoint = checkpoint
+        self.seen = SeenIndex()  # Sayfalar arasında tekrar eden ürünlerin detayı bir kez indirilir
+        self.extractor = get_extractor(parser)
         self.session = self._create_session()
+        self._executor = None
+        self._host_semaphores = {}
+        self._host_lock = threading.Lock()
     
     def _create_session(self):
         """Oturum oluştur ve başlıkları ayarla"""
         session = requests.Session()
+        # Bağlantı havuzu, eşzamanlı iş parçacıklarının hepsine yetecek büyüklükte olmalı
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=max(self.max_workers, 10))
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
         session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept-Language': 'tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7',
@@ -35,206 +96,650 @@ class PetlebiScraper:
         })
         return session
     
+    def add_sink(self, sink):
+        """Tamamlanan ürünlerin sırayla yazılacağı bir hedef ekler (write(product) metodu olmalı)"""
+        self.sinks.append(sink)
+    
+    def _emit(self, product):
+        """Tamamlanan ürünü sink'lere yazar (_products_lock altında çağrılır)"""
+        self.product_count += 1
+        if self.keep_products:
+            self.products.append(product)
+        if self.sinks:
+            with self.metrics.timer("sink_write_seconds"):
+                for sink in self.sinks:
+                    sink.write(product)
+    
+    def _record_progress(self, page, product_url, success):
+        """Ürünün işlendiğini checkpoint'e bildirir (_products_lock altında)
+        
+        Kayıt zamanı geldiyse checkpoint durumu kopyalanır ve sink'lerin
+        boşaltılması başlatılır. (durum, bekleme fonksiyonları) döndürülür;
+        _complete_save ile kilit bırakıldıktan sonra yazılır, böylece detay
+        işçileri veritabanı commit'ini beklemez. Kayıt zamanı değilse None döndürür.
+        """
+        self.checkpoint.item_done(page, product_url, success)
+        if self.checkpoint.save_due() and self._sink_error is None:
+            return self.checkpoint.snapshot(), self._begin_flush()
+        return None
+    
+    def _complete_save(self, state, waits):
+        """Başlatılan boşaltmaların bitmesini bekler ve checkpoint durumunu yazar (kilit dışında)"""
+        for wait in waits:
+            wait()
+        self.checkpoint.save(state)
+    
+    def _begin_flush(self):
+        """Tamponlu sink'leri boşaltır (_products_lock altında)
+        
+        Arka planda yazan sink'lerin (flush_nowait metodu olanlar, ör.
+        DatabaseWriter) boşaltılması yalnızca istenir; bunların bekleme
+        fonksiyonları döndürülür.
+        """
+        waits = []
+        for sink in self.sinks:
+            flush_nowait = getattr(sink, 'flush_nowait', None)
+            if flush_nowait:
+                waits.append(flush_nowait())
+                continue
+            flush = getattr(sink, 'flush', None)
+            if flush:
+                flush()
+        return waits
+    
+    def _flush_sinks(self):
+        """Tamponlu sink'leri (ör. dosya yazıcıları) boşaltır ve arka planda yazanları bekler"""
+        for wait in self._begin_flush():
+            wait()
+    
+    def _save_checkpoint(self):
+        """Sink tamponlarını boşaltıp checkpoint'i diske yazar
+        
+        Önce çıktı boşaltılır; böylece kayıtta tamamlandı görünen her ürün
+        dosyada da bulunur.
+        """
+        self._flush_sinks()
+        self.checkpoint.save()
+    
+    def _get_executor(self):
+        """Detay sayfaları için paylaşılan iş parçacığı havuzunu döndürür"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+    
+    def close(self):
+        """İş parçacığı havuzunu kapatır"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+    
+    def _host_semaphore(self, url):
+        """URL'nin sunucusu için eşzamanlılık sınırlayıcısını döndürür"""
+        host = urlsplit(url).netloc
+        with self._host_lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.per_host_limit)
+                self._host_semaphores[host] = semaphore
+            return semaphore
+    
+    def _get(self, url, headers=None):
+        """GET isteği gönderir; geçici hatalarda RetryPolicy ile yeniden dener
+        
+        Son denemenin yanıtı döndürülür; bağlantı hatası devam ederse son istisna fırlatılır.
+        """
+        return self.retry_policy.run(
+            lambda: self._get_once(url, headers), url,
+            retry_exceptions=(requests.exceptions.RequestException,)
+        )
+    
+    def _get_once(self, url, headers=None):
+        """Hız sınırlayıcıya ve sunucu başına eşzamanlılık sınırına uyarak tek bir GET isteği gönderir"""
+        wait_start = time.perf_counter()
+        self.rate_limiter.acquire()
+        self.metrics.observe("rate_limit_wait_seconds", time.perf_counter() - wait_start)
+        error_type = None
+        retry_after = None
+        try:
+            with self._host_semaphore(url):
+                request_start = time.perf_counter()
+                response = self.session.get(url, headers=headers, timeout=(10, 30))  # (bağlantı zaman aşımı, okuma zaman aşımı)
+            self.metrics.observe("http_request_seconds", time.perf_counter() - request_start)
+            self.metrics.observe("response_bytes", len(response.content))
+            self.metrics.inc("http_responses", status=response.status_code)
+            if response.status_code >= 400:
+                error_type = self.error_handler.classify_request_error(response)
+                retry_after = self.error_handler.get_retry_after(response)
+            return response, error_type, retry_after
+        except requests.exceptions.RequestException:
+            error_type = "connection_error"
+            self.metrics.inc("http_responses", status="error")
+            raise
+        finally:
+            # Sonucu sınırlayıcıya bildir: başarıda hız artar, 429/5xx'te düşer
+            self.rate_limiter.release(error_type, retry_after)
+    
+    def _page_url(self, page):
+        """Sayfa numarasına karşılık gelen liste URL'sini döndürür"""
+        if page == 1:
+            return self.base_url
+        return f"{self.base_url}?page={page}"
+    
     def scrape_all_pages(self):
-        """Tüm sayfaları sırayla tara"""
-        self.logger.info(f"Veri kazıma başlatılıyor: {self.max_pages} sayfa")
+        """Ürün URL'lerini bulup detaylarını liste/detay hattı (pipeline) üzerinden tara
+        
+        Keşif aşaması ürünleri sınırlı bir kuyruğa yazar; detay işçileri kuyruğu
+        sürekli boşaltır. Sitemap varsa URL'ler akış halinde okunur ve işçilerin
+        hepsi hemen çalışmaya başlar; yoksa liste sayfaları sırayla indirilir ve
+        ilk boş sayfada durulur. Böylece sayfa N'nin detayları indirilirken sayfa
+        N+1'in listesi de indirilir ve sayfa sınırlarında ağ boşta beklemez.
+        """
+        self.logger.info(f"Veri kazıma başlatılıyor (keşif: {self.discovery})")
         
         start_time = time.time()
+        self._scanned_pages = 0
+        self._skipped_pages = 0
+        self._last_page = 0
+        interrupted = False
+        self._sequence = 0
+        self._next_sequence = 0
+        self._pending_products = {}
+        
+        # Detay işçilerini başlat
+        work_queue = queue.Queue(maxsize=self.queue_size)
+        workers = [
+            threading.Thread(target=self._detail_worker, args=(work_queue,), name=f"detay-{i + 1}", daemon=True)
+            for i in range(self.max_workers)
+        ]
+        for worker in workers:
+            worker.start()
+        
+        try:
+            discovered = None
+            if self.discovery in ("auto", "sitemap"):
+                discovered = self._discover_from_sitemap(work_queue)
+            if discovered is None and self.discovery in ("auto", "pagination"):
+                self._discover_from_pages(work_queue)
+        except KeyboardInterrupt:
+            self.logger.warning("Kullanıcı işlemi durdurdu")
+            interrupted = True
+            self._drain_queue(work_queue)
+        finally:
+            # İşçilere bitiş sinyali gönder ve kuyruğun boşalmasını bekle
+            for _ in workers:
+                work_queue.put(None)
+            for worker in workers:
+                worker.join()
+        
+        self.close()
+        if self._sink_error is None:
+            # Süre ve ölçümler çıktıların (ör. veritabanı yazıcısının son grubu) yazılmasını da kapsasın
+            try:
+                self._flush_sinks()
+            except Exception as e:
+                self.logger.error(f"Çıktılar boşaltılamadı: {e}")
+                self._sink_error = e
+        if self.checkpoint and self._sink_error is None:
+            # Sink hata verdiyse diskteki son tutarlı kayıt korunur
+            with self._products_lock:
+                self._finish_checkpoint(interrupted)
+        end_time = time.time()
+        elapsed = max(end_time - start_time, 1e-9)
+        self.logger.info(f"Veri kazıma tamamlandı. {self.product_count} ürün toplandı.")
+        if self._skipped_pages:
+            self.logger.info(f"Önceki çalışmada tamamlanan {self._skipped_pages} sayfa atlandı")
+        self.logger.info(f"Toplam süre: {end_time - start_time:.2f} saniye")
+        self.logger.info(f"Hız: {self._scanned_pages / elapsed:.2f} sayfa/sn, {self.product_count / elapsed:.2f} ürün/sn")
+        self.logger.info(f"Hız sınırlayıcı son durumu: {self.rate_limiter.get_state()}")
+        self.logger.info(f"Yeniden denemeler: {self.retry_policy.get_stats()}")
+        if self.http_cache:
+            self.logger.info(f"HTTP önbelleği: {self.http_cache.get_stats()}")
+        if self.previous_index:
+            self.logger.info(f"Artımlı tarama: {self.previous_index.get_stats()}")
+        if self.seen.duplicates:
+            self.logger.info(f"Tekrar eden ürünler atlandı, önlenen detay isteği: {self.seen.duplicates}")
+        if self.failed_detail_urls:
+            self.logger.warning(f"Detayları alınamayan ürün sayısı: {len(self.failed_detail_urls)}")
+        if CONFIG['metrics']['summary']:
+            self.logger.info(f"Aşama ölçümleri:\n{self.metrics.summary_table()}")
+        
+        return self.products
+    
+    def _enqueue(self, work_queue, page, product_url, product_data):
+        """Ürünü sıra numarasıyla detay kuyruğuna aktarır (kuyruk doluysa işçileri bekler)"""
+        self.metrics.observe("queue_depth", work_queue.qsize(), queue="detail")
+        work_queue.put((self._sequence, page, product_url, product_data))
+        self._sequence += 1
+    
+    def _fetch_sitemap(self, url):
+        """Sitemap'i hız sınırlayıcı ve yeniden deneme politikasıyla indirir, gövdeyi (bytes) döndürür"""
+        with self.metrics.timer("fetch_seconds", stage="sitemap"):
+            response = self._get(url)
+        response.raise_for_status()
+        return response.content
+    
+    def _discover_from_sitemap(self, work_queue):
+        """Sitemap'teki ürün URL'lerini kuyruğa aktarır
+        
+        Returns:
+            Bulunan ürün sayısı; sitemap alınamadıysa ya da ürün içermiyorsa None
+            (bu durumda "auto" modunda sayfalamaya geçilir)
+        """
+        found = 0
+        skipped = 0
+        try:
+            for product_url in iter_sitemap_urls(self._fetch_sitemap, self.sitemap_url, self.logger):
+                if self._sink_error is not None:
+                    self.logger.error(f"Ürünler kaydedilemiyor, tarama durduruluyor: {self._sink_error}")
+                    break
+                found += 1
+                if not self.seen.add(product_url):
+                    continue
+                if self.checkpoint and self.checkpoint.is_url_done(product_url):
+                    skipped += 1
+                    continue
+                # Liste verisi yoktur; temel alanlar detay sayfasından çıkarılır
+                self._enqueue(work_queue, None, product_url, None)
+        except requests.exceptions.RequestException as e:
+            if not found:
+                self.logger.warning(f"Sitemap alınamadı ({self.sitemap_url}): {e}")
+                return None
+            self.logger.error(f"Sitemap okunurken hata, {found} üründen sonra duruldu: {e}")
+        except Exception as e:
+            if not found:
+                self.logger.warning(f"Sitemap ayrıştırılamadı ({self.sitemap_url}): {e}")
+                return None
+            self.logger.exception(f"Sitemap okunurken hata, {found} üründen sonra duruldu: {e}")
         
-        for page in range(1, self.max_pages + 1):
+        if not found:
+            self.logger.warning(f"Sitemap'te ürün bulunamadı: {self.sitemap_url}")
+            return None
+        self.logger.info(f"Sitemap'ten {found} ürün bulundu")
+        if skipped:
+            self.logger.info(f"Önceki çalışmada tamamlanan {skipped} ürün atlandı")
+        return found
+    
+    def _discover_from_pages(self, work_queue):
+        """Liste sayfalarını sırayla tarayıp ürünleri kuyruğa aktarır
+        
+        İlk boş sayfada (katalog sonu), max_pages'e ulaşıldığında ya da art arda
+        max_failed_pages sayfa alınamadığında durulur.
+        """
+        pages = range(1, self.max_pages + 1) if self.max_pages else itertools.count(1)
+        total = self.max_pages or "?"
+        failed_in_row = 0
+        
+        for page in pages:
+            if self._sink_error is not None:
+                self.logger.error(f"Ürünler kaydedilemiyor, tarama durduruluyor: {self._sink_error}")
+                break
             try:
-                if page == 1:
-                    url = self.base_url
-                else:
-                    url = f"{self.base_url}?page={page}"
+                # Önceki çalışmada tamamlanan sayfalar atlanır
+                if self.checkpoint and self.checkpoint.is_page_done(page):
+                    self._skipped_pages += 1
+                    self._last_page = page
+                    continue
+                
+                url = self._page_url(page)
                 
-                self.logger.info(f"Sayfa {page}/{self.max_pages} taranıyor: {url}")
-                success = self.scrape_page(url)
+                self.logger.info(f"Sayfa {page}/{total} taranıyor: {url}")
+                product_list = self._fetch_listing(url)
+                self._scanned_pages += 1
                 
-                if not success:
+                if product_list is None:
+                    self._last_page = page
+                    failed_in_row += 1
+                    if failed_in_row >= self.max_failed_pages:
+                        self.logger.error(f"Art arda {failed_in_row} sayfa taranamadı, sayfalama durduruluyor")
+                        break
                     self.logger.warning(f"Sayfa {page} taranamadı, devam ediliyor...")
+                    continue
+                if not product_list:
+                    self.logger.info(f"Sayfa {page} boş, katalogun sonuna ulaşıldı")
+                    break
+                failed_in_row = 0
+                self._last_page = page
+                
+                # Önceki sayfalarda görülen ürünler (liste kaydıysa) yeniden indirilmez
+                product_list = self._filter_seen(product_list)
+                if self.checkpoint:
+                    # Yarım kalan sayfada yalnızca çıktıya yazılmamış ürünler işlenir
+                    product_list = [item for item in product_list if not self.checkpoint.is_url_done(item[0])]
+                    self.checkpoint.page_started(page, len(product_list))
+                
+                # İstek hızı sabit beklemeler yerine rate_limiter tarafından ayarlanır
+                for product_url, product_data in product_list:
+                    self._enqueue(work_queue, page, product_url, product_data)
                 
-                # Sunucuya aşırı yüklenmemek için bekleme
-                if page % 5 == 0:  # Her 5 sayfada bir
-                    time.sleep(2)
-                else:
-                    time.sleep(0.5)
-                    
             except KeyboardInterrupt:
-                self.logger.warning("Kullanıcı işlemi durdurdu")
-                break
+                raise
             except Exception as e:
                 self.logger.exception(f"Sayfa {page} taranırken beklenmeyen hata: {e}")
                 # Ciddi hatadan sonra kısa bir mola ver
                 time.sleep(5)
+    
+    def _finish_checkpoint(self, interrupted):
+        """Çalışma sonunda checkpoint'i kaydeder; tarama tamamlandıysa siler"""
+        if interrupted:
+            self._save_checkpoint()
+            self.logger.info(f"Kaldığı yer kaydedildi: {self.checkpoint.path} (--resume ile devam edilebilir)")
+            return
         
-        end_time = time.time()
-        self.logger.info(f"Veri kazıma tamamlandı. {len(self.products)} ürün toplandı.")
-        self.logger.info(f"Toplam süre: {end_time - start_time:.2f} saniye")
+        self._flush_sinks()
+        missing = self.checkpoint.finish(self._last_page)
+        if missing:
+            self.logger.warning(f"{len(missing)} sayfa tamamlanamadı, --resume ile yeniden denenebilir: {missing[:10]}")
+        if self.checkpoint.failed_urls:
+            self.logger.warning(f"{len(self.checkpoint.failed_urls)} ürün alınamadı, --resume ile yeniden denenebilir")
+    
+    def _detail_worker(self, work_queue):
+        """Kuyruktaki ürünlerin detaylarını indirir ve sırasıyla kaydeder"""
+        while True:
+            item = work_queue.get()
+            if item is None:
+                break
+            sequence, page, product_url, product_data = item
+            product = self._complete_product(product_url, product_data)
+            try:
+                self._emit_in_order(sequence, product, (page, product_url))
+            except Exception as e:
+                # İşçi ölürse kuyruk dolar ve liste aşaması kilitlenir; hata kaydedilip devam edilir
+                self.logger.exception(f"Ürün kaydedilemedi: {product_url}: {e}")
+                self._sink_error = e
+    
+    def _drain_queue(self, work_queue):
+        """İptal durumunda kuyrukta bekleyen işleri atar"""
+        while True:
+            try:
+                item = work_queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not None:
+                # Sıra boşluğu kalmasın diye atılan işi boş sonuç olarak işaretle
+                self._emit_in_order(item[0], None)
+    
+    def _emit_in_order(self, sequence, product, progress=None):
+        """Tamamlanan ürünü liste sırasını koruyarak kaydeder
         
-        return self.products
+        Args:
+            sequence: Ürünün listedeki sıra numarası
+            product: Tamamlanan ürün (başarısızsa None)
+            progress: Checkpoint'e bildirilecek (sayfa, ürün URL'si); atılan işlerde None
+        """
+        pending_save = None
+        with self._products_lock:
+            self._pending_products[sequence] = (product, progress)
+            while self._next_sequence in self._pending_products:
+                ready, ready_progress = self._pending_products.pop(self._next_sequence)
+                self._next_sequence += 1
+                if ready is not None:
+                    self._emit(ready)
+                if self.checkpoint and ready_progress:
+                    pending_save = self._record_progress(*ready_progress, ready is not None) or pending_save
+        if pending_save:
+            self._complete_save(*pending_save)
     
     def scrape_page(self, url):
         """Belirli bir sayfayı tara ve ürün listesini al"""
+        product_list = self._fetch_listing(url)
+        if not product_list:
+            return False
+        product_list = self._filter_seen(product_list)
+        
+        # Ürün detaylarını paralel al (sıra korunur)
+        successful_count = 0
+        for product_data in self._complete_products(product_list):
+            if product_data:
+                with self._products_lock:
+                    self._emit(product_data)
+                successful_count += 1
+        
+        self.logger.info(f"{successful_count} ürün başarıyla işlendi")
+        # Tüm ürünleri önceden işlenmiş sayfa da başarılı sayılır
+        return successful_count > 0 or not product_list
+    
+    def _fetch_listing(self, url):
+        """Liste sayfasını indirir ve (ürün URL'si, ürün verisi) çiftlerini döndürür
+        
+        Sayfa alınamazsa None, ürünsüz (katalog sonundaki) sayfada boş liste döndürür.
+        """
         try:
             # Sayfayı indir
-            response = self.session.get(url, timeout=(10, 30))  # (bağlantı zaman aşımı, okuma zaman aşımı)
+            with self.metrics.timer("fetch_seconds", stage="listing"):
+                response = self._get(url)
             
             if response.status_code != 200:
-                error_type = self.error_handler.handle_request_error(url, response)
-                return False
+                self.error_handler.handle_request_error(url, response)
+                return None
             
-            # Sayfayı ayrıştır
-            soup = BeautifulSoup(response.text, 'lxml')
-            products = soup.find_all('div', class_='col-lg-4 col-md-4 col-sm-6 search-product-box')
+            with self.metrics.timer("parse_seconds", stage="listing"):
+                product_list = self.parse_product_list(response.text)
             
-            if not products:
+            if not product_list:
                 self.logger.warning(f"Sayfada ürün bulunamadı: {url}")
-                return False
+                return []
             
-            self.logger.info(f"{len(products)} ürün bulundu")
-            
-            # Her ürünü işle
-            successful_count = 0
-            for product in products:
-                try:
-                    # Temel ürün verilerini çıkar
-                    product_data = self.extract_product_data(product)
-                    
-                    if product_data:
-                        # Ürün detaylarını al
-                        detailed_data = self.get_product_details(product_data['url'])
-                        product_data.update(detailed_data)
-                        
-                        # Temiz veriyi doğrula
-                        if self.validate_product(product_data):
-                            self.products.append(product_data)
-                            successful_count += 1
-                        else:
-                            self.logger.warning(f"Ürün doğrulanamadı: {product_data.get('name', 'bilinmiyor')}")
-                
-                except Exception as e:
-                    self.logger.error(f"Ürün işlenirken hata: {e}")
-            
-            self.logger.info(f"{successful_count} ürün başarıyla işlendi")
-            return successful_count > 0
+            self.logger.info(f"{len(product_list)} ürün bulundu")
+            return product_list
             
         except requests.exceptions.RequestException as e:
             self.error_handler.handle_request_error(url, e)
-            return False
+            return None
         except Exception as e:
             self.logger.exception(f"Sayfa taranırken beklenmeyen hata: {e}")
-            return False
+            return None
+    
+    def _filter_seen(self, product_list):
+        """Daha önce kuyruğa alınmış ürünleri (aynı id ya da URL) listeden çıkarır"""
+        return [
+            (product_url, product_data) for product_url, product_data in product_list
+            if self.seen.add(product_url, product_data.get('id'))
+        ]
+    
+    def parse_product_list(self, html):
+        """Liste sayfası HTML'inden (ürün URL'si, ürün verisi) çiftlerini çıkarır"""
+        product_list = []
+        for product_url, gtm_json in self.extractor.parse_listing(html):
+            product_data = self.extract_product_data(product_url, gtm_json)
+            if product_data:
+                product_list.append((product_data.url, product_data))
+            else:
+                self.metrics.inc("validation_failures", stage="listing")
+        return product_list
     
-    def extract_product_data(self, product_element):
-        """Ürün elementinden temel bilgileri çıkarır"""
+    def _complete_products(self, product_list):
+        """Ürün detaylarını iş parçacığı havuzuyla paralel tamamlar, sonuçları girdi sırasıyla döndürür"""
+        if self.max_workers <= 1 or len(product_list) <= 1:
+            return [self._complete_product(product_url, product_data) for product_url, product_data in product_list]
+        return list(self._get_executor().map(lambda item: self._complete_product(*item), product_list))
+    
+    def _complete_product(self, product_url, product_data):
+        """Ürün detaylarını ekler ve doğrular; geçersiz ürün için None döndürür
+        
+        product_data None ise (sitemap'ten bulunan ürün) tüm alanlar detay sayfasından alınır.
+        """
         try:
-            # Kart içeriğini bul
-            more_info = product_element.find('div', class_='card-body pb-0 pt-2 pl-3 pr-3')
-            if not more_info or not more_info.a:
+            if product_data is None:
+                product_data = self.get_product_from_page(product_url)
+                if product_data is None:
+                    return None
+                if self.validate_product(product_data):
+                    return product_data
+                self.metrics.inc("validation_failures", stage="product_page")
+                self.logger.warning(f"Ürün doğrulanamadı: {product_url}")
                 return None
             
-            # URL'i al
-            product_url = more_info.a['href']
+            # Artımlı taramada değişmeyen ürünlerin önceki detaylarını kullan
+            detailed_data = self.previous_index.lookup(product_data) if self.previous_index else None
+            if detailed_data is None:
+                # Ürün detaylarını al
+                detailed_data = self.get_product_details(product_url)
+            if detailed_data is None:
+                # Detaysız ürün yazılmaz; checkpoint'te tamamlanmış sayılmadığından --resume yeniden dener
+                return None
+            product_data.update(detailed_data)
+            
+            # Temiz veriyi doğrula
+            if self.validate_product(product_data):
+                return product_data
+            self.metrics.inc("validation_failures", stage="detail")
+            self.logger.warning(f"Ürün doğrulanamadı: {product_data.get('name', 'bilinmiyor')}")
+        except Exception as e:
+            self.logger.error(f"Ürün işlenirken hata: {e}")
+        return None
+    
+    def extract_product_data(self, product_url, gtm_json):
+        """Ürün kartının bağlantısından temel bilgileri çıkarır
+        
+        Args:
+            product_url: Kart bağlantısının href değeri
+            gtm_json: Bağlantının data-gtm-product özniteliği (JSON metni)
+        """
+        try:
+            if product_url is None or gtm_json is None:
+                self.logger.error(f"Ürün kartında bağlantı ya da GTM verisi eksik: {product_url}")
+                return None
             
             # GTM ürün verisini ayrıştır
             try:
-                product_dictionary = json.loads(more_info.a['data-gtm-product'])
+                product_dictionary = json.loads(gtm_json)
             except json.JSONDecodeError:
-                self.logger.error(f"GTM ürün verisi ayrıştırılamadı: {more_info.a['data-gtm-product']}")
+                self.logger.error(f"GTM ürün verisi ayrıştırılamadı: {gtm_json}")
                 return None
             
-            # Temel ürün bilgilerini oluştur
-            product_data = {
-                "url": product_url,
-                "name": product_dictionary.get("name", "İsimsiz Ürün"),
-                "price": product_dictionary.get("price", 0.0),
-                "stock": product_dictionary.get("dimension2", "Bilinmiyor"),
-                "category": product_dictionary.get("category", "").split('>')[-1].strip(),
-                "id": product_dictionary.get("id", ""),
-                "brand": product_dictionary.get("brand", ""),
-                "sku": ""  # Varsayılan boş değer
-            }
-            
-            return product_data
+            # Temel ürün bilgilerini oluştur (fiyat float'a çevrilir, geçersizse NaN)
+            return Product(
+                url=product_url,
+                name=product_dictionary.get("name", "İsimsiz Ürün"),
+                price=product_dictionary.get("price"),
+                stock=product_dictionary.get("dimension2", "Bilinmiyor"),
+                category=product_dictionary.get("category", "").split('>')[-1].strip(),
+                id=product_dictionary.get("id", ""),
+                brand=product_dictionary.get("brand", ""),
+                sku=""  # Varsayılan boş değer
+            )
             
         except Exception as e:
             self.logger.error(f"Ürün verisi çıkarma hatası: {e}")
             return None
     
     def get_product_details(self, product_url):
-        """Ürün detay sayfasından ek bilgiler çıkarır"""
-        product_details = {
-            "barcode": "",
-            "description": "",
-            "image": ""
-        }
+        """Ürün detay sayfasından ek bilgiler çıkarır
         
+        Önbellek açıksa koşullu istek gönderilir; sunucu 304 döndürürse daha önce
+        çıkarılmış detaylar sayfa ayrıştırılmadan kullanılır. Sayfa yeniden
+        denemelerden sonra da alınamazsa None döndürür.
+        """
         try:
-            # Detay sayfasını indir
-            response = self.session.get(product_url, timeout=(10, 30))
+            # Detay sayfasını indir (önbellekte varsa koşullu olarak)
+            headers = self.http_cache.conditional_headers(product_url) if self.http_cache else None
+            with self.metrics.timer("fetch_seconds", stage="detail"):
+                response = self._get(product_url, headers=headers)
             
-            if response.status_code != 200:
-                error_type = self.error_handler.handle_request_error(product_url, response)
-                return product_details
+            if response.status_code == 304:
+                cached_details = self.http_cache.get_details(product_url)
+                if cached_details is not None:
+                    return cached_details
+                # Kayıt bu arada silindiyse sayfayı koşulsuz yeniden indir
+                with self.metrics.timer("fetch_seconds", stage="detail"):
+                    response = self._get(product_url)
             
-            soup = BeautifulSoup(response.text, 'lxml')
+            if response.status_code != 200:
+                self.error_handler.handle_request_error(product_url, response)
+                self.failed_detail_urls.append(product_url)
+                return None
             
-            # Barkod ve açıklama
-            info = soup.find_all('div', class_='tab-pane active show read-more-box', id="hakkinda")
-            for div in info:
-                # Barkod bilgisi
-                barcode_divs = div.find_all('div', class_='row mb-2')
-                for barcode_div in barcode_divs:
-                    barcode_label = barcode_div.find('div', class_='col-2 pd-d-t')
-                    if barcode_label and barcode_label.string == "BARKOD":
-                        barcode_value = barcode_div.find('div', class_='col-10 pd-d-v')
-                        if barcode_value:
-                            product_details["barcode"] = barcode_value.text.strip()
-                
-                # Ürün açıklaması
-                spans = div.find('span', id='productDescription')
-                if spans:
-                    for i, span in enumerate(spans):
-                        if i == 1:  # İkinci öğe açıklama olarak belirtilmiş
-                            product_details["description"] = span.text.strip().replace('\n', ' ')
+            with self.metrics.timer("parse_seconds", stage="detail"):
+                product_details = self.parse_product_details(response.text)
             
-            # Resim URL'si
-            info2 = soup.find('div', class_='col-md-6 col-sm-5')
-            if info2 and info2.a and 'href' in info2.a.attrs:
-                product_details["image"] = info2.a['href']
+            if self.http_cache:
+                self.http_cache.store(product_url, response.headers, response.content, product_details)
             
             # Ürün detayları dönüş
             return product_details
             
         except requests.exceptions.RequestException as e:
             self.error_handler.handle_request_error(product_url, e)
-            return product_details
+            self.failed_detail_urls.append(product_url)
+            return None
         except Exception as e:
             self.logger.error(f"Ürün detayları alınamadı: {product_url}, {e}")
-            return product_details
+            self.failed_detail_urls.append(product_url)
+            return None
+    
+    def get_product_from_page(self, product_url):
+        """Liste verisi olmayan ürünün tüm alanlarını detay sayfasından çıkarır
+        
+        Temel alanlar (ad, fiyat, stok, kategori, marka) sayfadaki JSON-LD
+        verisinden okunur. Sunucu 304 döndürürse önbellekteki sayfa gövdesi
+        yeniden ayrıştırılır. Sayfa alınamazsa ya da ürün verisi yoksa None döndürür.
+        """
+        try:
+            headers = self.http_cache.conditional_headers(product_url) if self.http_cache else None
+            with self.metrics.timer("fetch_seconds", stage="product_page"):
+                response = self._get(product_url, headers=headers)
+            
+            if response.status_code == 304:
+                body = self.http_cache.get_body(product_url)
+                if body is not None:
+                    with self.metrics.timer("parse_seconds", stage="product_page"):
+                        basic_data, product_details = self.extractor.parse_product_page(body)
+                    return self._product_from_page(product_url, basic_data, product_details)
+                # Kayıt bu arada silindiyse sayfayı koşulsuz yeniden indir
+                with self.metrics.timer("fetch_seconds", stage="product_page"):
+                    response = self._get(product_url)
+            
+            if response.status_code != 200:
+                self.error_handler.handle_request_error(product_url, response)
+                self.failed_detail_urls.append(product_url)
+                return None
+            
+            with self.metrics.timer("parse_seconds", stage="product_page"):
+                basic_data, product_details = self.extractor.parse_product_page(response.text)
+            if self.http_cache:
+                self.http_cache.store(product_url, response.headers, response.content, product_details)
+            return self._product_from_page(product_url, basic_data, product_details)
+            
+        except requests.exceptions.RequestException as e:
+            self.error_handler.handle_request_error(product_url, e)
+            self.failed_detail_urls.append(product_url)
+            return None
+        except Exception as e:
+            self.logger.error(f"Ürün sayfası işlenemedi: {product_url}, {e}")
+            return None
+    
+    def _product_from_page(self, product_url, basic_data, product_details):
+        """Detay sayfasından çıkarılan alanları liste kartındaki ürün biçiminde birleştirir"""
+        if basic_data is None:
+            self.metrics.inc("validation_failures", stage="product_page")
+            self.logger.warning(f"Sayfada ürün verisi (JSON-LD) bulunamadı: {product_url}")
+            return None
+        product_data = Product(url=product_url, **basic_data)
+        product_data.update(product_details)
+        return product_data
+    
+    def parse_product_details(self, html):
+        """Detay sayfası HTML'inden barkod, açıklama ve resim bilgilerini çıkarır"""
+        return self.extractor.parse_detail(html)
     
     def validate_product(self, product):
         """Ürün verisinin geçerli olup olmadığını kontrol eder"""
         # Zorunlu alanları kontrol et
-        required_fields = ['url', 'name', 'price']
-        for field in required_fields:
-            if not product.get(field):
-                return False
-        
-        # Fiyat sayısal mı kontrol et
-        try:
-            float(product['price'])
-        except (ValueError, TypeError):
+        if not product.url or not product.name or not product.price:
             return False
-            
-        return True
+        
+        # Fiyat sayısal mı kontrol et (geçersiz fiyat Product'ta NaN'dır)
+        return not math.isnan(product.price)
     
-    def save_to_json(self, filename):
-        """Ürünleri JSON dosyasına kaydeder"""
+    def save_to_json(self, filename, output_format="json", **writer_options):
+        """Biriktirilen ürünleri JSON (veya JSON Lines/msgpack dosyasına ya da Parquet veri kümesine) kaydeder
+        
+        writer_options (serializer, compression; parquet için partition_by) open_writer'a iletilir.
+        """
         try:
-            with open(filename, "w", encoding="utf-8") as json_file:
-                json.dump(self.products, json_file, ensure_ascii=False, indent=2)
+            with open_writer(filename, output_format, **writer_options) as writer:
+                for product in self.products:
+                    writer.write(product)
             
             self.logger.info(f"{len(self.products)} ürün {filename} dosyasına kaydedildi")
             return True
@@ -243,89 +748,5 @@ class PetlebiScraper:
             return False
             
     def get_statistics(self):
-        """Toplanan veri hakkında istatistikler sağlar"""
-        if not self.products:
-            return {"total": 0}
-            
-        categories = {}
-        brands = {}
-        stock_status = {"In Stock": 0, "Out of Stock": 0, "Other": 0}
-        price_ranges = {"0-50": 0, "51-100": 0, "101-200": 0, "201+": 0}
-        
-        for product in self.products:
-            # Kategori sayısı
-            category = product.get('category', 'Unknown')
-            categories[category] = categories.get(category, 0) + 1
-            
-            # Marka sayısı
-            brand = product.get('brand', 'Unknown')
-            brands[brand] = brands.get(brand, 0) + 1
-            
-            # Stok durumu
-            stock = product.get('stock', '').lower()
-            if 'in stock' in stock or 'stokta' in stock:
-                stock_status["In Stock"] += 1
-            elif 'out of stock' in stock or 'stokta yok' in stock or 'tükendi' in stock:
-                stock_status["Out of Stock"] += 1
-            else:
-                stock_status["Other"] += 1
-            
-            # Fiyat aralıkları
-            try:
-                price = float(product.get('price', 0))
-                if price <= 50:
-                    price_ranges["0-50"] += 1
-                elif price <= 100:
-                    price_ranges["51-100"] += 1
-                elif price <= 200:
-                    price_ranges["101-200"] += 1
-                else:
-                    price_ranges["201+"] += 1
-            except (ValueError, TypeError):
-                pass
-        
-        return {
-            "total": len(self.products),
-            "categories": categories,
-            "brands": brands,
-            "stock_status": stock_status,
-            "price_ranges": price_ranges,
-            "with_barcode": sum(1 for p in self.products if p.get('barcode')),
-            "with_image": sum(1 for p in self.products if p.get('image')),
-            "with_description": sum(1 for p in self.products if p.get('description'))
-        }
-
-# error_handler.py - Hata yönetim yardımcısı sınıfı
-class ErrorHandler:
-    """Uygulama çapında hata yakalama ve işleme için yardımcı sınıf"""
-    
-    def __init__(self, logger):
-        self.logger = logger
-    
-    def handle_request_error(self, url, error):
-        """HTTP isteklerinde oluşan hataları işler"""
-        if hasattr(error, 'status_code'):
-            status_code = error.status_code
-            if status_code == 404:
-                self.logger.warning(f"Sayfa bulunamadı (404): {url}")
-                return "not_found"
-            elif status_code == 403:
-                self.logger.warning(f"Erişim engellendi (403): {url}")
-                return "forbidden"
-            elif status_code == 429:
-                self.logger.warning(f"Çok fazla istek gönderildi (429): {url}")
-                return "rate_limited"
-            elif status_code >= 500:
-                self.logger.error(f"Sunucu hatası ({status_code}): {url}")
-                return "server_error"
-            else:
-                self.logger.error(f"HTTP hatası ({status_code}): {url}")
-                return "http_error"
-        else:
-            self.logger.exception(f"Bağlantı hatası: {url}, {str(error)}")
-            return "connection_error"
-    
-    def handle_parse_error(self, url, error):
-        """HTML/JSON ayrıştırma hatalarını işler"""
-        self.logger.error(f"Ayrıştırma hatası: {url}, {str(error)}")
-        return "parse_error"
\ No newline at end of file
+        """Toplanan veri hakkında istatistikler sağlar (sink'ten güncellenen özetin anlık kopyası)"""
+        return self.statistics.snapshot(include_price_summary=False)